@@ -0,0 +1,176 @@
+# benchmarks/_common.py
+"""
+벤치마크 공용 도구.
+실행 예: python -m benchmarks.bench_bulk_upsert --rows 5000
+기본 DB는 메모리 SQLite이고, --db-url로 로컬 MySQL 등을 지정할 수 있다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+# settings.Settings / routers.auth가 요구하는 값 (실제 네이버 호출은 하지 않는다)
+os.environ.setdefault("NAVER_CLIENT_ID", "benchmark")
+os.environ.setdefault("NAVER_CLIENT_SECRET", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# database.py가 import 때 MySQL 주소를 만든다 (벤치마크는 자기 엔진을 쓰고 이 주소로 접속하지 않는다)
+for _key, _value in (("DB_USER", "benchmark"), ("DB_PASS", "benchmark"), ("DB_HOST", "127.0.0.1"),
+                     ("DB_PORT", "3306"), ("DB_NAME", "benchmark")):
+    os.environ.setdefault(_key, _value)
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+
+if TYPE_CHECKING:
+    from services.naver_shopping_client import NaverProduct
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_DB_URL = "sqlite://"
+
+
+def make_engine(db_url: str = DEFAULT_DB_URL, *, reset: bool = True, **engine_kwargs: Any) -> Engine:
+    if db_url in ("sqlite://", "sqlite:///:memory:"):
+        # 메모리 SQLite는 커넥션마다 DB가 따로 생기므로 하나를 공유한다
+        engine = create_engine(
+            db_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    elif db_url.startswith("sqlite"):
+        engine = create_engine(db_url, connect_args={"check_same_thread": False}, **engine_kwargs)
+    else:
+        engine = create_engine(db_url, pool_pre_ping=True, **engine_kwargs)
+
+    if reset:
+        models.Base.metadata.drop_all(engine)
+        models.Base.metadata.create_all(engine)
+    return engine
+
+
+def make_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 수를 센다."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    def reset(self) -> int:
+        n, self.count = self.count, 0
+        return n
+
+
+def synthetic_items(
+    n: int,
+    *,
+    first_id: int = 1,
+    seed: int = 0,
+    base_price: int = 50000,
+) -> List[Dict[str, Any]]:
+    """normalize_naver_item() 결과와 같은 형태의 가짜 상품 목록."""
+    rng = random.Random(seed)
+    return [
+        {
+            "external_id": str(first_id + i),
+            "title": f"기계식 키보드 {first_id + i}",
+            "product_url": f"https://smartstore.naver.com/main/products/{first_id + i}",
+            "image_url": f"https://shopping-phinf.pstatic.net/{first_id + i}.jpg",
+            "mall_name": f"mall-{rng.randint(1, 50)}",
+            "price": base_price + rng.randint(0, 50000),
+        }
+        for i in range(n)
+    ]
+
+
+def as_products(items: List[Dict[str, Any]]) -> List[NaverProduct]:
+    """synthetic_items/drift_prices의 dict -> 저장 경로(bulk_upsert_items_from_naver, ingest_*)가 받는 NaverProduct."""
+    # fake_naver.point_app_at보다 먼저 services를 import하지 않도록 여기서 import
+    from services.naver_shopping_client import NaverProduct
+
+    return [NaverProduct(**d) for d in items]
+
+
+def drift_prices(items: List[Dict[str, Any]], *, ratio: float, seed: int = 1) -> List[Dict[str, Any]]:
+    """ratio 비율의 상품 가격을 -10% ~ +10% 바꾼 복사본."""
+    rng = random.Random(seed)
+    drifted = []
+    for data in items:
+        data = dict(data)
+        if rng.random() < ratio:
+            data["price"] = max(1, int(data["price"] * rng.uniform(0.9, 1.1)))
+        drifted.append(data)
+    return drifted
+
+
+def chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+@contextmanager
+def stopwatch() -> Iterator[List[float]]:
+    box = [0.0]
+    t0 = time.perf_counter()
+    try:
+        yield box
+    finally:
+        box[0] = time.perf_counter() - t0
+
+
+def percentiles(samples: List[float], points: Tuple[int, ...] = (50, 90, 99)) -> Dict[str, float]:
+    if not samples:
+        return {f"p{p}": 0.0 for p in points}
+    ordered = sorted(samples)
+    out = {}
+    for p in points:
+        idx = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        out[f"p{p}"] = ordered[idx]
+    return out
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_result(name: str, payload: Dict[str, Any]) -> Path:
+    """결과를 benchmarks/results/<name>-<timestamp>.json 으로 저장한다."""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    doc = {
+        "benchmark": name,
+        "created_at": now.isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **payload,
+    }
+    path = RESULTS_DIR / f"{name}-{now.strftime('%Y%m%dT%H%M%SZ')}.json"
+    path.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps(doc, ensure_ascii=False, indent=2))
+    return path
@@ -0,0 +1,119 @@
+# benchmarks/bench_alert_eval.py
+"""
+알람 판별 처리량: services/alert_service.evaluate_alerts_for_price_changes.
+상품 --items개를 사용자 --watchers명이 wishlist에 담고, wishlist마다 TARGET_PRICE / DROP_FROM_PREV / NEW_LOW 알람 3개.
+가격을 --drift-ratio 비율로 바꿔 --batch개씩 저장(ingest_page_prices, 시간에 안 넣음)한 뒤 판별 시간만 잰다.
+TARGET_PRICE는 목표가에 닿은 알람만 DB에서 읽는다.
+
+python -m benchmarks.bench_alert_eval --items 2000 --watchers 3 --rounds 3
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, select
+
+from benchmarks._common import DEFAULT_DB_URL, as_products, chunks, drift_prices, make_engine, make_session_factory, percentiles, synthetic_items, write_result
+
+import models
+import services.alert_service as alert_service
+from services.shopping_service import ingest_page_prices
+
+
+def seed(SessionLocal, items: List[Dict[str, Any]], watchers: int) -> int:
+    db = SessionLocal()
+    try:
+        users = [models.User(email=f"alert{i}@example.com", password_hash="x") for i in range(watchers)]
+        db.add_all(users)
+        db.flush()
+        ingest_page_prices(db, as_products(items))
+        item_rows = db.execute(select(models.Item.id, models.Item.last_seen_price)).all()
+        db.execute(
+            insert(models.Wishlist),
+            [{"user_id": u.id, "item_id": item_id, "is_active": 1} for u in users for item_id, _ in item_rows],
+        )
+        price = {item_id: p for item_id, p in item_rows}
+        wishlists = db.execute(select(models.Wishlist.id, models.Wishlist.item_id)).all()
+        alerts = []
+        for w_id, item_id in wishlists:
+            alerts.append({"wishlist_id": w_id, "alert_type": "TARGET_PRICE",
+                           "target_price": int(price[item_id] * 0.95), "is_enabled": 1})
+            alerts.append({"wishlist_id": w_id, "alert_type": "DROP_FROM_PREV", "is_enabled": 1})
+            alerts.append({"wishlist_id": w_id, "alert_type": "NEW_LOW", "is_enabled": 1})
+        db.execute(insert(models.Alert), alerts)
+        db.commit()
+        return len(alerts)
+    finally:
+        db.close()
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    engine = make_engine(args.db_url)
+    SessionLocal = make_session_factory(engine)
+    items = synthetic_items(args.items, seed=args.seed)
+    alerts_total = seed(SessionLocal, items, args.watchers)
+
+    db = SessionLocal()
+    try:
+        batch_ms: List[float] = []
+        changes_total = triggered = 0
+        eval_seconds = 0.0
+        for rnd in range(args.rounds):
+            items = drift_prices(items, ratio=args.drift_ratio, seed=args.seed + rnd + 1)
+            for batch in chunks(items, args.batch):
+                _, changes = ingest_page_prices(db, as_products(batch))
+                t0 = time.perf_counter()
+                triggered += alert_service.evaluate_alerts_for_price_changes(db, changes)
+                elapsed = time.perf_counter() - t0
+                db.commit()
+                eval_seconds += elapsed
+                batch_ms.append(elapsed * 1000)
+                changes_total += len(changes)
+    finally:
+        db.close()
+        engine.dispose()
+
+    alerts_per_item = alerts_total / args.items
+    return {
+        "alerts": alerts_total,
+        "price_changes": changes_total,
+        "triggered": triggered,
+        "eval_seconds": round(eval_seconds, 3),
+        "changes_per_sec": round(changes_total / eval_seconds, 1),
+        "alerts_checked_per_sec": round(changes_total * alerts_per_item / eval_seconds, 1),
+        "batch_ms": {k: round(v, 2) for k, v in percentiles(batch_ms).items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=DEFAULT_DB_URL)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--watchers", type=int, default=3, help="상품당 wishlist 수 (사용자 수)")
+    parser.add_argument("--batch", type=int, default=100, help="수집 페이지 크기 (판별 1번에 넘기는 상품 수)")
+    parser.add_argument("--drift-ratio", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = run(args)
+    write_result(
+        "alert_eval",
+        {
+            "db": args.db_url.split(":", 1)[0],
+            "params": {
+                "items": args.items,
+                "watchers": args.watchers,
+                "batch": args.batch,
+                "drift_ratio": args.drift_ratio,
+                "rounds": args.rounds,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
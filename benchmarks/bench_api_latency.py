@@ -0,0 +1,188 @@
+# benchmarks/bench_api_latency.py
+"""
+API 지연 시간 p50/p99: GET /wishlist, GET /alerts, POST /auth/login (실제 라우터, 동시 요청 --concurrency개).
+사용자 --users명, 사용자마다 wishlist --wishlist-rows개와 첫 wishlist에 알람 3개.
+로그인은 비밀번호 해싱 프로세스 풀(services/password_hasher)을 그대로 쓴다.
+
+요청은 httpx ASGITransport로 보낸다 (네트워크 없음). 기본 DB는 임시 파일 SQLite, --db-url로 로컬 MySQL.
+
+python -m benchmarks.bench_api_latency --requests 500 --concurrency 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert, select
+
+from benchmarks._common import as_products, make_engine, make_session_factory, percentiles, synthetic_items, write_result
+
+import database
+import models
+from crud import bulk_upsert_items_from_naver
+from routers.alerts import router as alerts_router
+from routers.auth import create_access_token, router as auth_router
+from routers.wishlist_ref import router as wishlist_router
+from services.password_hasher import hash_password_sync, password_hasher
+from services.user_cache import user_cache
+from services.wishlist_listing import wishlist_count_cache
+
+PASSWORD = "correct horse battery staple"
+
+
+def seed(SessionLocal, users: int, wishlist_rows: int) -> List[Tuple[int, int]]:
+    """return: [(user_id, 첫 wishlist_id)]"""
+    password_hash = hash_password_sync(PASSWORD)
+    db = SessionLocal()
+    try:
+        user_rows = [models.User(email=f"api{i}@example.com", password_hash=password_hash) for i in range(users)]
+        db.add_all(user_rows)
+        db.flush()
+        item_ids = [u.item_id for u in bulk_upsert_items_from_naver(db, as_products(synthetic_items(wishlist_rows)))]
+        db.execute(
+            insert(models.Wishlist),
+            [{"user_id": u.id, "item_id": i, "is_active": 1} for u in user_rows for i in item_ids],
+        )
+        out = []
+        for u in user_rows:
+            w_id = db.execute(
+                select(models.Wishlist.id).where(models.Wishlist.user_id == u.id).order_by(models.Wishlist.id).limit(1)
+            ).scalar_one()
+            out.append((u.id, w_id))
+        db.execute(
+            insert(models.Alert),
+            [
+                {"wishlist_id": w_id, "alert_type": t, "target_price": 40000 if t == "TARGET_PRICE" else None, "is_enabled": 1}
+                for _, w_id in out
+                for t in ("TARGET_PRICE", "DROP_FROM_PREV", "NEW_LOW")
+            ],
+        )
+        db.commit()
+        return out
+    finally:
+        db.close()
+
+
+def build_app(SessionLocal) -> FastAPI:
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(auth_router)
+    app.include_router(wishlist_router)
+    app.include_router(alerts_router)
+    app.dependency_overrides[database.get_db] = get_db
+    return app
+
+
+async def load(app: FastAPI, make_request, *, requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    counter = iter(range(requests))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+
+        async def worker() -> None:
+            for i in counter:
+                t0 = time.perf_counter()
+                resp = await make_request(client, i)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                statuses[resp.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "requests_per_sec": round(requests / elapsed, 1),
+        "latency_ms": {k: round(v, 2) for k, v in percentiles(latencies).items()},
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+
+async def run(args: argparse.Namespace, SessionLocal) -> Dict[str, Any]:
+    users = seed(SessionLocal, args.users, args.wishlist_rows)
+    tokens = [{"Authorization": f"Bearer {create_access_token(user_id)}"} for user_id, _ in users]
+    app = build_app(SessionLocal)
+    user_cache.clear()
+    wishlist_count_cache.clear()
+    password_hasher.warm_up()
+
+    async def wishlist(client, i):
+        return await client.get("/wishlist", params={"display": 20}, headers=tokens[i % len(users)])
+
+    async def alerts(client, i):
+        return await client.get("/alerts", params={"wishlist_id": users[i % len(users)][1]})
+
+    async def login(client, i):
+        return await client.post("/auth/login", data={"username": f"api{i % len(users)}@example.com", "password": PASSWORD})
+
+    result: Dict[str, Any] = {}
+    for name, make_request, n in (
+        ("GET /wishlist", wishlist, args.requests),
+        ("GET /alerts", alerts, args.requests),
+        ("POST /auth/login", login, args.login_requests),
+    ):
+        await load(app, make_request, requests=min(n, 50), concurrency=args.concurrency)  # 워밍업
+        result[name] = await load(app, make_request, requests=n, concurrency=args.concurrency)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="기본: 임시 파일 SQLite")
+    parser.add_argument("--requests", type=int, default=500, help="/wishlist, /alerts 요청 수")
+    parser.add_argument("--login-requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--wishlist-rows", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = None
+    db_url = args.db_url
+    if db_url is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        tmp.close()
+        db_url = f"sqlite:///{tmp.name}"
+
+    engine = make_engine(db_url, pool_size=args.pool_size, max_overflow=0)
+    try:
+        result = asyncio.run(run(args, make_session_factory(engine)))
+    finally:
+        password_hasher.shutdown()
+        engine.dispose()
+        if tmp is not None:
+            os.unlink(tmp.name)
+
+    write_result(
+        "api_latency",
+        {
+            "db": db_url.split(":", 1)[0],
+            "cpus": os.cpu_count(),
+            "params": {
+                "concurrency": args.concurrency,
+                "users": args.users,
+                "wishlist_rows": args.wishlist_rows,
+                "pool_size": args.pool_size,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/bench_auth_queries.py
+"""
+인증된 요청 1건당 SQL 수 / 지연 비교.
+- legacy: 요청마다 JWT 디코드 + SELECT users (변경 전 get_current_user)
+- cached: get_current_user(유저 캐시) + wishlist 라우트는 get_current_principal(DB 조회 없음)
+
+python -m benchmarks.bench_auth_queries --requests 500
+"""
+from __future__ import annotations
+
+import argparse
+from typing import Any, Dict, List
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from benchmarks._common import (
+    DEFAULT_DB_URL,
+    QueryCounter,
+    as_products,
+    make_engine,
+    make_session_factory,
+    percentiles,
+    stopwatch,
+    synthetic_items,
+    write_result,
+)
+
+import database
+import models
+from crud import bulk_upsert_items_from_naver
+from routers.auth import (
+    create_access_token,
+    decode_token,
+    get_current_principal,
+    get_current_user,
+    oauth2_scheme,
+    router as auth_router,
+)
+from routers.wishlist_ref import router as wishlist_router
+from services.user_cache import user_cache
+from services.wishlist_listing import wishlist_count_cache
+
+ROUTES = ("/auth/me", "/wishlist?display=20")
+
+
+def seed(SessionLocal, wishlist_rows: int) -> int:
+    db = SessionLocal()
+    try:
+        user = models.User(email="bench@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        upserted = bulk_upsert_items_from_naver(db, as_products(synthetic_items(wishlist_rows)))
+        db.execute(
+            insert(models.Wishlist),
+            [{"user_id": user.id, "item_id": u.item_id, "is_active": 1} for u in upserted],
+        )
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def build_app(SessionLocal, *, legacy: bool) -> FastAPI:
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def legacy_get_current_user(db=Depends(database.get_db), token: str = Depends(oauth2_scheme)):
+        # 변경 전 routers/auth.get_current_user 본문
+        payload = decode_token(token)
+        user = db.query(models.User).filter(models.User.id == int(payload["sub"])).first()
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        return user
+
+    app = FastAPI()
+    app.include_router(auth_router)
+    app.include_router(wishlist_router)
+    app.dependency_overrides[database.get_db] = get_db
+    if legacy:
+        app.dependency_overrides[get_current_user] = legacy_get_current_user
+        app.dependency_overrides[get_current_principal] = legacy_get_current_user
+    return app
+
+
+def measure(client: TestClient, counter: QueryCounter, path: str, requests: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    queries: List[int] = []
+    for _ in range(requests):
+        counter.reset()
+        with stopwatch() as elapsed:
+            resp = client.get(path)
+        resp.raise_for_status()
+        samples.append(elapsed[0] * 1000)
+        queries.append(counter.reset())
+    return {
+        "requests": requests,
+        "latency_ms": {k: round(v, 3) for k, v in percentiles(samples).items()},
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=DEFAULT_DB_URL)
+    parser.add_argument("--requests", type=int, default=500, help="경로/모드별 요청 수")
+    parser.add_argument("--wishlist-rows", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = make_engine(args.db_url)
+    counter = QueryCounter(engine)
+    SessionLocal = make_session_factory(engine)
+    user_id = seed(SessionLocal, args.wishlist_rows)
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    result: Dict[str, Any] = {}
+    for mode in ("legacy", "cached"):
+        user_cache.clear()
+        wishlist_count_cache.clear()
+        client = TestClient(build_app(SessionLocal, legacy=mode == "legacy"), headers=headers)
+        client.get(ROUTES[0])  # 워밍업 (캐시 채우기 포함)
+        result[mode] = {path: measure(client, counter, path, args.requests) for path in ROUTES}
+    engine.dispose()
+
+    write_result(
+        "auth_queries",
+        {
+            "db": args.db_url.split(":", 1)[0],
+            "params": {"requests": args.requests, "wishlist_rows": args.wishlist_rows},
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
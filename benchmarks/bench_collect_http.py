@@ -0,0 +1,119 @@
+# benchmarks/bench_collect_http.py
+"""
+수집 처리량 (items/sec): 실제 AsyncNaverShoppingClient + CollectPipeline이 로컬 가짜 네이버 서버(benchmarks/fake_naver.py)를 HTTP로 호출한다.
+- insert: 빈 DB에 검색어 --queries개 x --total개 수집
+- update: 같은 범위를 가격이 바뀐 뒤(drift) 다시 수집
+429 주입 비율(--rate-429)마다 따로 돈다. 재시도 수는 services/metrics의 naver_retries_total.
+
+네이버 호출 한도(NAVER_RATE_PER_SECOND)는 기본 1000/s로 푼다. 실제 한도로 재려면 --naver-rate 10.
+
+python -m benchmarks.bench_collect_http --queries 3 --total 1000 --rate-429 0 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.fake_naver import FakeNaverConfig, FakeNaverServer, free_port, point_app_at
+
+PORT = free_port()
+_rate = sys.argv[sys.argv.index("--naver-rate") + 1] if "--naver-rate" in sys.argv else "1000"
+point_app_at(PORT, rate_per_second=float(_rate))  # services import 전에
+
+from benchmarks._common import make_engine, make_session_factory, write_result
+
+from services import metrics
+from services.collect_pipeline import CollectPipeline, CollectRequest
+from services.naver_shopping_client import AsyncNaverShoppingClient
+
+QUERIES = ("기계식 키보드", "무선 키보드", "게이밍 키보드", "저소음 키보드", "키보드 키캡")
+
+
+def collect_pass(client, SessionLocal, requests: List[CollectRequest]) -> Dict[str, Any]:
+    retries_before = metrics.naver_retries.value("async")
+    pipeline = CollectPipeline(client, SessionLocal)
+    t0 = time.perf_counter()
+    result = client.run(pipeline.run_many(requests, raise_fetch_errors=False))
+    elapsed = time.perf_counter() - t0
+    return {
+        "seconds": round(elapsed, 3),
+        "saved": result.saved,
+        "pages": result.pages,
+        "items_per_sec": round(result.saved / elapsed, 1),
+        "retries": int(metrics.naver_retries.value("async") - retries_before),
+        "failed_requests": sum(1 for r in result.requests.values() if r.error),
+    }
+
+
+def run(args: argparse.Namespace, rate_429: float) -> Dict[str, Any]:
+    config = FakeNaverConfig(
+        catalog_size=args.total,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.latency_ms / 3,
+        rate_429=rate_429,
+        drift_seconds=args.drift_seconds,
+        drift_ratio=args.drift_ratio,
+    )
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    db_url = args.db_url or f"sqlite:///{tmp.name}"
+    try:
+        with FakeNaverServer(config, port=PORT) as server:
+            engine = make_engine(db_url)
+            SessionLocal = make_session_factory(engine)
+            client = AsyncNaverShoppingClient(max_in_flight=args.max_in_flight)
+            requests = [
+                CollectRequest(key=q, query=q, total=args.total, page_size=args.page_size)
+                for q in QUERIES[:args.queries]
+            ]
+            try:
+                insert = collect_pass(client, SessionLocal, requests)
+                time.sleep(max(0.0, args.drift_seconds - insert["seconds"]) + 0.1)  # 가격이 바뀐 뒤
+                update = collect_pass(client, SessionLocal, requests)
+            finally:
+                client.close()
+                engine.dispose()
+            return {"insert": insert, "update": update, "server": server.stats()}
+    finally:
+        os.unlink(tmp.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="기본: 임시 파일 SQLite")
+    parser.add_argument("--queries", type=int, default=3, choices=range(1, len(QUERIES) + 1))
+    parser.add_argument("--total", type=int, default=1000, help="검색어별 수집 개수 (최대 1000)")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--rate-429", type=float, nargs="+", default=[0.0, 0.05])
+    parser.add_argument("--drift-seconds", type=float, default=2.0)
+    parser.add_argument("--drift-ratio", type=float, default=0.2)
+    parser.add_argument("--naver-rate", type=float, default=1000)
+    args = parser.parse_args()
+
+    result = {f"rate_429={r}": run(args, r) for r in args.rate_429}
+    write_result(
+        "collect_http",
+        {
+            "db": (args.db_url or "sqlite").split(":", 1)[0],
+            "params": {
+                "queries": args.queries,
+                "total": args.total,
+                "page_size": args.page_size,
+                "max_in_flight": args.max_in_flight,
+                "latency_ms": args.latency_ms,
+                "drift_ratio": args.drift_ratio,
+                "naver_rate_per_second": args.naver_rate,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
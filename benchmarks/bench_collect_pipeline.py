@@ -0,0 +1,172 @@
+# benchmarks/bench_collect_pipeline.py
+"""
+수집 1회(collect_items_pages)에 걸리는 시간.
+- sequential:      페이지 하나 받고 -> 저장/commit -> 다음 페이지 (동기 경로)
+- fetch_then_save: 페이지를 모두 동시에 받은 뒤 순서대로 저장 (이전 client 경로)
+- pipeline:        fetch / normalize / write / alert 단계를 큐로 이어서 겹쳐 실행 (services/collect_pipeline.py)
+
+네이버 호출은 --fetch-latency-ms 만큼 걸리는 가짜이고, DB는 임시 파일 SQLite에
+SQL 문마다 --db-latency-ms 만큼 지연을 넣어 원격 DB 왕복을 흉내 낸다.
+같은 DB에 두 번 수집한다: initial(신규 상품), update(--drift 비율만큼 가격 변동).
+
+python -m benchmarks.bench_collect_pipeline --total 1000 --page-size 50 --fetch-latency-ms 150 --db-latency-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from benchmarks._common import drift_prices, make_engine, make_session_factory, synthetic_items, write_result
+
+from services.collect_pipeline import CollectPipeline
+from services.naver_shopping_client import normalize_naver_item, plan_pages
+from services.shopping_service import _save_page
+
+MODES = ("sequential", "fetch_then_save", "pipeline")
+
+
+def _raw(data: Dict[str, Any]) -> Dict[str, Any]:
+    # normalize_naver_item의 입력(네이버 응답 items 한 개) 형태
+    return {
+        "title": f"<b>{data['title']}</b>",
+        "link": data["product_url"],
+        "image": data["image_url"],
+        "mallName": data["mall_name"],
+        "lprice": str(data["price"]),
+    }
+
+
+class FakeClient:
+    """AsyncNaverShoppingClient 중 수집 경로가 쓰는 부분만 (지연 + 동시 요청 제한)."""
+
+    def __init__(self, *, latency: float, max_in_flight: int) -> None:
+        self.latency = latency
+        self.max_in_flight = max_in_flight
+        self.raw: List[Dict[str, Any]] = []
+        self.calls = 0
+
+    def run(self, coro):
+        async def main():
+            self._sem = asyncio.Semaphore(self.max_in_flight)  # 실행(이벤트 루프)마다 새로
+            return await coro
+
+        return asyncio.run(main())
+
+    async def search_products(self, query, *, display=10, start=1, normalize=True, delay=0.0, **kwargs):
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with self._sem:
+            self.calls += 1
+            await asyncio.sleep(self.latency)
+            page = self.raw[start - 1:start - 1 + display]
+        return [normalize_naver_item(it) for it in page] if normalize else page
+
+
+def collect(mode: str, client: FakeClient, SessionLocal, *, total: int, page_size: int) -> Tuple[int, Optional[Dict]]:
+    """return: (저장한 상품 수, pipeline 단계별 지표)"""
+    pages = plan_pages(total, page_size)
+
+    if mode == "sequential":
+        db = SessionLocal()
+        try:
+            saved = 0
+            for start, display in pages:
+                items = client.run(client.search_products("키보드", display=display, start=start))
+                if not items:
+                    break
+                _save_page(db, items)
+                saved += len(items)
+            return saved, None
+        finally:
+            db.close()
+
+    if mode == "fetch_then_save":
+        async def fetch_all():
+            return await asyncio.gather(
+                *(client.search_products("키보드", display=display, start=start) for start, display in pages)
+            )
+
+        db = SessionLocal()
+        try:
+            saved = 0
+            for items in client.run(fetch_all()):
+                if not items:
+                    break
+                _save_page(db, items)
+                saved += len(items)
+            return saved, None
+        finally:
+            db.close()
+
+    pipeline = CollectPipeline(client, SessionLocal, fetch_concurrency=client.max_in_flight)
+    result = client.run(pipeline.run("키보드", total=total, page_size=page_size))
+    return result.saved, result.stages
+
+
+def run(args: argparse.Namespace, mode: str) -> Dict[str, Any]:
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    try:
+        engine = make_engine(f"sqlite:///{tmp.name}")
+        if args.db_latency_ms > 0:
+            delay = args.db_latency_ms / 1000
+
+            @event.listens_for(engine, "before_cursor_execute")
+            def _latency(*_: Any) -> None:
+                time.sleep(delay)
+
+        SessionLocal = make_session_factory(engine)
+        client = FakeClient(latency=args.fetch_latency_ms / 1000, max_in_flight=args.fetch_concurrency)
+
+        items = synthetic_items(args.total, seed=args.seed)
+        out: Dict[str, Any] = {}
+        for phase, data in (("initial", items), ("update", drift_prices(items, ratio=args.drift, seed=args.seed + 1))):
+            client.raw = [_raw(d) for d in data]
+            t0 = time.perf_counter()
+            saved, stages = collect(mode, client, SessionLocal, total=args.total, page_size=args.page_size)
+            out[phase] = {"seconds": round(time.perf_counter() - t0, 3), "saved": saved}
+            if stages is not None:
+                out[phase]["stages"] = stages
+        engine.dispose()
+        return out
+    finally:
+        os.unlink(tmp.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--fetch-latency-ms", type=float, default=150)
+    parser.add_argument("--fetch-concurrency", type=int, default=4)
+    parser.add_argument("--db-latency-ms", type=float, default=2)
+    parser.add_argument("--drift", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = {mode: run(args, mode) for mode in MODES}
+    write_result(
+        "collect_pipeline",
+        {
+            "db": "sqlite",
+            "params": {
+                "total": args.total,
+                "page_size": args.page_size,
+                "fetch_latency_ms": args.fetch_latency_ms,
+                "fetch_concurrency": args.fetch_concurrency,
+                "db_latency_ms": args.db_latency_ms,
+                "drift": args.drift,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# benchmarks/bench_login.py
+"""
+로그인 처리량 vs 동시성.
+- inline: 변경 전 login (sync 핸들러 안에서 pbkdf2 검증, 세션을 잡은 채로)
+- pool:   현재 login (해싱 전용 프로세스 풀, 검증 중 세션 반환, 가득 차면 503)
+로그인 부하와 함께 가벼운 DB 라우트(/ping)를 계속 호출해서 다른 라우트가 얼마나 밀리는지도 잰다.
+
+python -m benchmarks.bench_login --concurrency 1 8 32 --seconds 5 --workers 2 --queue-limit 16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import text
+
+from benchmarks._common import make_engine, make_session_factory, percentiles, write_result
+
+import database
+import models
+import routers.auth as auth
+from services.password_hasher import PasswordHasher, hash_password_sync, verify_password_sync
+
+PASSWORD = "correct horse battery staple"
+USERS = 50
+
+
+def seed(SessionLocal) -> None:
+    password_hash = hash_password_sync(PASSWORD)
+    db = SessionLocal()
+    try:
+        db.add_all(models.User(email=f"user{i}@example.com", password_hash=password_hash) for i in range(USERS))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_app(SessionLocal, *, inline: bool) -> FastAPI:
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    if inline:
+        @app.post("/auth/login")
+        def legacy_login(form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(database.get_db)):
+            # 변경 전 routers/auth.login 본문
+            user = db.query(models.User).filter(models.User.email == form_data.username).first()
+            if user is None or not verify_password_sync(form_data.password, user.password_hash):
+                raise HTTPException(status_code=400, detail="Incorrect username or password")
+            return {"access_token": auth.create_access_token(user.id)}
+    else:
+        app.include_router(auth.router)
+
+    @app.get("/ping")
+    def ping(db=Depends(database.get_db)):
+        db.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    app.dependency_overrides[database.get_db] = get_db
+    return app
+
+
+async def load(app: FastAPI, *, concurrency: int, seconds: float) -> Dict[str, Any]:
+    statuses: Counter = Counter()
+    login_ok: List[float] = []
+    ping_ms: List[float] = []
+    deadline = time.perf_counter() + seconds
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+
+        async def login_worker(n: int) -> None:
+            i = n
+            while time.perf_counter() < deadline:
+                form = {"username": f"user{i % USERS}@example.com", "password": PASSWORD}
+                i += 1
+                t0 = time.perf_counter()
+                resp = await client.post("/auth/login", data=form)
+                statuses[resp.status_code] += 1
+                if resp.status_code == 200:
+                    login_ok.append((time.perf_counter() - t0) * 1000)
+                elif resp.status_code == 503:
+                    await asyncio.sleep(0.05)
+
+        async def ping_worker() -> None:
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                await client.get("/ping")
+                ping_ms.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(0.01)
+
+        started = time.perf_counter()
+        await asyncio.gather(ping_worker(), *(login_worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "logins_per_sec": round(len(login_ok) / elapsed, 1),
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "login_latency_ms": {k: round(v, 2) for k, v in percentiles(login_ok).items()},
+        "ping_latency_ms": {k: round(v, 2) for k, v in percentiles(ping_ms).items()},
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    engine = make_engine(args.db_url, pool_size=args.pool_size, max_overflow=0)
+    SessionLocal = make_session_factory(engine)
+    seed(SessionLocal)
+
+    hasher = PasswordHasher(workers=args.workers, queue_limit=args.queue_limit)
+    auth.password_hasher = hasher
+    hasher.warm_up()
+
+    apps = {"inline": build_app(SessionLocal, inline=True), "pool": build_app(SessionLocal, inline=False)}
+    result: Dict[str, Any] = {}
+    try:
+        for concurrency in args.concurrency:
+            result[f"c{concurrency}"] = {
+                name: await load(app, concurrency=concurrency, seconds=args.seconds)
+                for name, app in apps.items()
+            }
+    finally:
+        hasher.shutdown()
+        engine.dispose()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="기본값: 임시 파일 SQLite")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--queue-limit", type=int, default=None, help="기본값: workers * 8")
+    parser.add_argument("--pool-size", type=int, default=40)
+    args = parser.parse_args()
+    if args.queue_limit is None:
+        args.queue_limit = args.workers * 8
+
+    tmp = None
+    if args.db_url is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        tmp.close()
+        args.db_url = f"sqlite:///{tmp.name}"
+
+    try:
+        result = asyncio.run(run(args))
+    finally:
+        if tmp is not None:
+            os.unlink(tmp.name)
+
+    write_result(
+        "login",
+        {
+            "db": args.db_url.split(":", 1)[0],
+            "cpus": os.cpu_count(),
+            "params": {
+                "seconds": args.seconds,
+                "workers": args.workers,
+                "queue_limit": args.queue_limit,
+                "pool_size": args.pool_size,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# benchmarks/bench_lowest_price.py
+"""
+GET /products/{item_id}/lowest-price의 네이버 호출 수와 응답 시간.
+- live:     요청마다 search_products(display=100) (검색 캐시 NAVER_CACHE_TTL_SECONDS만 있음, 이전 동작)
+- snapshot: lowest_price_snapshot (LOWEST_PRICE_MAX_AGE_SECONDS 안이면 DB에서, 만료 전에 job이 갱신)
+
+스레드 --threads개가 인기 편중(Zipf) 분포로 상품 --items개를 --duration초 동안 요청한다.
+시간은 --time-scale배로 줄인다: 기본 15면 캐시 TTL 30초 -> 2초, 스냅샷 10분 -> 40초, job 5분 -> 20초.
+결과의 "분당 호출 수"는 원래 시간 기준으로 되돌린 값.
+네이버 검색은 --naver-latency-ms 만큼 걸리는 가짜, DB는 임시 파일 SQLite.
+
+python -m benchmarks.bench_lowest_price --threads 8 --items 200 --duration 30
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+TIME_SCALE = 15.0
+if "--time-scale" in sys.argv:
+    TIME_SCALE = float(sys.argv[sys.argv.index("--time-scale") + 1])
+# 모듈 import 전에 (settings / services.lowest_price가 읽는다)
+os.environ.setdefault("NAVER_CACHE_TTL_SECONDS", str(30 / TIME_SCALE))
+os.environ.setdefault("LOWEST_PRICE_MAX_AGE_SECONDS", str(600 / TIME_SCALE))
+
+from benchmarks._common import as_products, make_engine, make_session_factory, percentiles, synthetic_items, write_result
+
+import services.lowest_price as lowest_price
+import services.naver_shopping_client as naver
+from crud import bulk_upsert_items_from_naver
+from models import Item
+from services.naver_rate_limiter import Priority
+from services.naver_shopping_client import search_products
+
+
+class FakeNaver:
+    """_request_search(sync) / AsyncNaverShoppingClient.search_many 대신."""
+
+    def __init__(self, items: List[Dict[str, Any]], latency: float) -> None:
+        self.by_title = {d["title"]: d for d in items}
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _result(self, query: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        d = self.by_title[query]
+        return [{**d, "price": d["price"] + random.randint(-1000, 1000)}]
+
+    def request_search(self, params, *, timeout, strict, priority):
+        return self._result(params["query"])
+
+    # refresh_due가 쓰는 client 부분
+    def run(self, fn):
+        return fn()
+
+    def search_many(self, calls, *, spread_over=None):
+        def go():
+            return [self._result(kw["query"]) for kw in calls]
+        return go
+
+
+def legacy_lowest_price(db, item_id: int) -> Dict[str, Any]:
+    # 이전 routers/products.get_lowest_price 본문
+    item = db.query(Item).filter(Item.id == item_id).first()
+    results = search_products(
+        query=item.title, category=naver.KEYBOARD_CATEGORY_ID, sort="asc", display=100, priority=Priority.INTERACTIVE
+    )
+    same = [r for r in results if r.get("external_id") == item.external_id]
+    best = same[0] if same else results[0]
+    return {"current_lowest_price": best["price"]}
+
+
+def run(args: argparse.Namespace, mode: str) -> Dict[str, Any]:
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    engine = make_engine(f"sqlite:///{tmp.name}")
+    SessionLocal = make_session_factory(engine)
+
+    items = synthetic_items(args.items, seed=args.seed)
+    db = SessionLocal()
+    ids = [u.item_id for u in bulk_upsert_items_from_naver(db, as_products(items))]
+    db.commit()
+    db.close()
+
+    fake = FakeNaver(items, args.naver_latency_ms / 1000)
+    original = naver._request_search
+    naver._request_search = fake.request_search
+    naver.search_cache.clear()
+    service = lowest_price.LowestPriceService()
+
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(len(ids))]
+    latencies: List[float] = []
+    sources: Dict[str, int] = {}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        while not stop.is_set():
+            item_id = rng.choices(ids, weights)[0]
+            s = SessionLocal()
+            t0 = time.perf_counter()
+            try:
+                if mode == "live":
+                    legacy_lowest_price(s, item_id)
+                    source = "live"
+                else:
+                    row = s.query(Item.id, Item.title, Item.external_id).filter(Item.id == item_id).first()
+                    source = service.get(s, row).source
+            finally:
+                s.close()
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+                sources[source] = sources.get(source, 0) + 1
+
+    def job() -> None:
+        # 스케줄러 job (LOWEST_PRICE_REFRESH_MINUTES / time-scale 마다)
+        while not stop.wait(lowest_price.LOWEST_PRICE_REFRESH_MINUTES * 60 / TIME_SCALE):
+            s = SessionLocal()
+            try:
+                service.refresh_due(s, client=fake, limit=args.job_batch)
+            finally:
+                s.close()
+
+    threads = [threading.Thread(target=worker, args=(args.seed + i,)) for i in range(args.threads)]
+    if mode == "snapshot":
+        threads.append(threading.Thread(target=job))
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    naver._request_search = original
+    engine.dispose()
+    os.unlink(tmp.name)
+
+    real_minutes = elapsed * TIME_SCALE / 60
+    return {
+        "requests": len(latencies),
+        "naver_calls": fake.calls,
+        "naver_calls_per_minute": round(fake.calls / real_minutes, 1),
+        "latency_ms": {k: round(v * 1000, 2) for k, v in percentiles(latencies).items()},
+        "sources": sources,
+        "service_stats": service.stats() if mode == "snapshot" else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--naver-latency-ms", type=float, default=150)
+    parser.add_argument("--job-batch", type=int, default=30)
+    parser.add_argument("--time-scale", type=float, default=TIME_SCALE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = {mode: run(args, mode) for mode in ("live", "snapshot")}
+    write_result(
+        "lowest_price",
+        {
+            "db": "sqlite",
+            "params": {
+                "threads": args.threads,
+                "items": args.items,
+                "zipf": args.zipf,
+                "duration_s": args.duration,
+                "time_scale": TIME_SCALE,
+                "naver_latency_ms": args.naver_latency_ms,
+                "cache_ttl_s": 30,
+                "snapshot_max_age_s": 600,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# benchmarks/bench_metrics.py
+"""
+GET /metrics 지표 기록 비용 (services/metrics.py).
+- hooks:    Counter.inc / Histogram.observe / record_db_query / job_run 1회에 드는 시간 (ns)
+- requests: 쿼리 --queries개를 하는 동기 핸들러를 --requests번 호출할 때 요청당 시간
+            off = 미들웨어/커서 이벤트 없음, on = MetricsMiddleware + install_query_metrics
+            요청당 DB 쿼리 수가 db_queries_per_request에 제대로 잡히는지도 확인한다.
+
+요청은 httpx ASGITransport로 보낸다 (네트워크 없음). DB는 메모리 SQLite.
+
+python -m benchmarks.bench_metrics --requests 2000 --queries 3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+
+from benchmarks._common import as_products, make_engine, make_session_factory, percentiles, synthetic_items, write_result
+
+from crud import bulk_upsert_items_from_naver
+from database import install_query_metrics
+from models import Item
+from services import metrics
+
+
+def per_call_ns(fn: Callable[[], Any], n: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter_ns()
+        for _ in range(n):
+            fn()
+        best = min(best, (time.perf_counter_ns() - t0) / n)
+    return round(best, 1)
+
+
+def bench_hooks(n: int) -> Dict[str, float]:
+    counter = metrics.Counter("bench_total", "bench", ("route",))
+    histogram = metrics.Histogram("bench_seconds", "bench", ("route",))
+
+    def in_job():
+        with metrics.job_run("bench"):
+            pass
+
+    def in_request():
+        token = metrics._request_db.set(metrics._DbUsage())
+        metrics.record_db_query("bench_hooks", 0.0003)
+        metrics._request_db.reset(token)
+
+    return {
+        "empty_call": per_call_ns(lambda: None, n),
+        "counter_inc": per_call_ns(lambda: counter.inc("/items/{item_id}"), n),
+        "histogram_observe": per_call_ns(lambda: histogram.observe(0.012, "/items/{item_id}"), n),
+        "record_db_query_outside_request": per_call_ns(lambda: metrics.record_db_query("bench_hooks", 0.0003), n),
+        "record_db_query_inside_request": per_call_ns(in_request, n),
+        "job_run": per_call_ns(in_job, n),
+    }
+
+
+def build_app(SessionLocal, queries: int, *, instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(metrics.MetricsMiddleware)
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int, db=Depends(get_db)):
+        row = None
+        for i in range(queries):
+            row = db.execute(select(Item.id, Item.title, Item.last_seen_price).where(Item.id == item_id + i)).first()
+        return {"id": row.id, "title": row.title, "price": row.last_seen_price}
+
+    return app
+
+
+async def drive(app: FastAPI, n: int, item_ids: List[int]) -> List[float]:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(n):
+            t0 = time.perf_counter()
+            r = await client.get(f"/items/{item_ids[i % len(item_ids)]}")
+            latencies.append(time.perf_counter() - t0)
+            assert r.status_code == 200, r.text
+    return latencies
+
+
+def bench_requests(args: argparse.Namespace) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    # off/on을 라운드마다 순서를 바꿔 번갈아 돌리고 요청당 평균의 중앙값을 쓴다
+    means: Dict[str, List[float]] = {"off": [], "on": []}
+    last: Dict[str, List[float]] = {}
+    for rnd in range(args.rounds):
+        for mode in (("off", "on") if rnd % 2 == 0 else ("on", "off")):
+            engine = make_engine()
+            if mode == "on":
+                install_query_metrics(engine, "bench")
+            SessionLocal = make_session_factory(engine)
+            db = SessionLocal()
+            ids = [u.item_id for u in bulk_upsert_items_from_naver(db, as_products(synthetic_items(200)))]
+            db.commit()
+            db.close()
+            app = build_app(SessionLocal, args.queries, instrumented=mode == "on")
+            latencies = asyncio.run(drive(app, args.requests, ids[: len(ids) - args.queries]))
+            means[mode].append(statistics.fmean(latencies))
+            last[mode] = latencies
+            engine.dispose()
+
+    for mode in ("off", "on"):
+        result[mode] = {
+            "mean_ms_by_round": [round(m * 1000, 4) for m in means[mode]],
+            "latency_ms_last_round": {k: round(v * 1000, 3) for k, v in percentiles(last[mode]).items()},
+        }
+    off, on = statistics.median(means["off"]), statistics.median(means["on"])
+    result["overhead_us_per_request"] = round((on - off) * 1e6, 1)
+    result["overhead_pct"] = round((on - off) / off * 100, 2)
+
+    route = "/items/{item_id}"
+    observed = metrics.db_queries_per_request.count(route)
+    per_request = metrics.db_queries.value("bench") / observed if observed else None
+    result["recorded"] = {
+        "http_requests": metrics.http_requests.value("GET", route, "200"),
+        "db_queries_per_request": per_request,
+    }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hook-calls", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=6)
+    args = parser.parse_args()
+
+    write_result(
+        "metrics",
+        {
+            "db": "sqlite",
+            "params": {
+                "hook_calls": args.hook_calls,
+                "requests": args.requests,
+                "queries_per_request": args.queries,
+                "rounds": args.rounds,
+            },
+            "hooks_ns_per_call": bench_hooks(args.hook_calls),
+            "requests": bench_requests(args),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# benchmarks/bench_normalize.py
+"""
+네이버 검색 응답 파싱 + 정제 비용 (services/naver_shopping_client.py).
+--items개 상품을 --page-size개씩 네이버 응답 JSON(bytes)으로 만들어 두고, 페이지마다 파싱 -> 정제한다.
+- legacy:        resp.json() (bytes -> str -> json) + 매 제목 unescape/태그 정규식 + 상품마다 dict (이전 구현)
+- json+dict:     표준 json으로 bytes 바로 파싱 + normalize_naver_item (제목 fast path)
+- orjson+dict:   orjson + normalize_naver_item
+- json+record:   표준 json + normalize_naver_product (NaverProduct)
+- orjson+record: orjson + normalize_naver_product (수집 파이프라인 경로)
+
+시간은 --repeat번 중 최솟값. 메모리는 tracemalloc으로 따로 잰다 (시간 측정과 섞지 않음):
+peak = 처리 중 최대, retained = 끝난 뒤 남은 정제 결과 크기.
+clean_title_ns: 제목 종류(태그 없음 / <b> 강조 / 엔티티)별 clean_title 1회 시간, 이전 구현과 비교.
+
+제목은 --plain-ratio 비율만 태그/엔티티가 없고, --entity-ratio 비율은 &amp; 등이 들어간다 (나머지는 <b> 강조만).
+
+python -m benchmarks.bench_normalize --items 10000 --page-size 100
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+import tracemalloc
+from html import unescape
+from typing import Any, Callable, Dict, List
+
+from benchmarks._common import chunks, write_result
+
+from services.naver_shopping_client import (
+    DataCleaningError,
+    clean_title,
+    extract_external_id,
+    normalize_naver_item,
+    normalize_naver_product,
+    orjson,
+    select_json_decoder,
+)
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+
+# ---- 이전 구현 그대로 (비교 기준) ----
+def legacy_clean_title(raw_title: Any) -> str:
+    if raw_title is None:
+        raise DataCleaningError("title is None")
+    if not isinstance(raw_title, str):
+        raise DataCleaningError(f"title is not a string: type={type(raw_title)} value={raw_title!r}")
+
+    s = unescape(raw_title)
+    s = _HTML_TAG_RE.sub("", s).strip()
+    if not s:
+        raise DataCleaningError(f"title is empty after cleaning: raw={raw_title!r}")
+    return s
+
+
+def legacy_parse_price(raw_price: Any, *, field_name: str = "lprice") -> int:
+    if raw_price is None:
+        raise DataCleaningError(f"{field_name} is None")
+    if isinstance(raw_price, int):
+        if raw_price < 0:
+            raise DataCleaningError(f"{field_name} is negative: {raw_price}")
+        return raw_price
+    if isinstance(raw_price, str):
+        s = raw_price.strip().replace(",", "")
+        if not s:
+            raise DataCleaningError(f"{field_name} is empty string")
+        if not s.isdigit():
+            raise DataCleaningError(f"{field_name} is not numeric: raw={raw_price!r}")
+        price = int(s)
+        if price < 0:
+            raise DataCleaningError(f"{field_name} parsed negative: raw={raw_price!r} -> {price}")
+        return price
+    raise DataCleaningError(f"{field_name} has unsupported type: type={type(raw_price)} value={raw_price!r}")
+
+
+def legacy_normalize(naver_item: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(naver_item, dict):
+        raise DataCleaningError(f"naver_item is not dict: type={type(naver_item)} value={naver_item!r}")
+
+    raw_title = naver_item.get("title")
+    raw_link = naver_item.get("link")
+    raw_image = naver_item.get("image")
+    raw_mall = naver_item.get("mallName")
+    raw_price = naver_item.get("lprice")
+
+    title = legacy_clean_title(raw_title)
+
+    if raw_link is None or not isinstance(raw_link, str) or not raw_link.strip():
+        raise DataCleaningError(f"link is missing/invalid: raw={raw_link!r}")
+    product_url = raw_link.strip()
+
+    external_id = extract_external_id(product_url)
+    image_url = raw_image.strip() if isinstance(raw_image, str) else ""
+    mall_name = raw_mall.strip() if isinstance(raw_mall, str) else ""
+    price = legacy_parse_price(raw_price, field_name="lprice")
+
+    return {
+        "external_id": external_id,
+        "title": title,
+        "product_url": product_url,
+        "image_url": image_url,
+        "mall_name": mall_name,
+        "price": price,
+    }
+
+
+def make_pages(n: int, page_size: int, *, plain_ratio: float, entity_ratio: float, seed: int) -> List[bytes]:
+    """네이버 /v1/search/shop.json 응답 본문 목록 (페이지마다 bytes)."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(1, n + 1):
+        r = rng.random()
+        if r < plain_ratio:
+            title = f"로지텍 기계식 키보드 G{i} 텐키리스 청축"
+        elif r < plain_ratio + entity_ratio:
+            title = f"<b>기계식</b> 키보드 &amp; 마우스 세트 {i} &quot;한정판&quot;"
+        else:
+            title = f"로지텍 <b>기계식</b> <b>키보드</b> G{i} 텐키리스 청축"
+        items.append({
+            "title": title,
+            "link": f"https://search.shopping.naver.com/catalog/{10_000_000 + i}",
+            "image": f"https://shopping-phinf.pstatic.net/main_{10_000_000 + i}/{10_000_000 + i}.jpg",
+            "lprice": str(rng.randint(20_000, 200_000)),
+            "hprice": "",
+            "mallName": f"mall-{rng.randint(1, 50)}",
+            "productId": str(10_000_000 + i),
+            "productType": "1",
+            "brand": "로지텍",
+            "maker": "로지텍",
+            "category1": "디지털/가전",
+            "category2": "주변기기",
+            "category3": "키보드",
+            "category4": "기계식키보드",
+        })
+    return [
+        json.dumps(
+            {"lastBuildDate": "Sat, 17 Oct 2026 10:00:00 +0900", "total": n, "start": 1, "display": len(page), "items": page},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        for page in chunks(items, page_size)
+    ]
+
+
+def make_variants() -> Dict[str, Callable[[bytes], List[Any]]]:
+    std = select_json_decoder("json")
+
+    def legacy(body: bytes) -> List[Any]:
+        return [legacy_normalize(it) for it in json.loads(body.decode("utf-8"))["items"]]
+
+    def build(decode: Callable[[bytes], Any], normalize: Callable[[Dict[str, Any]], Any]) -> Callable[[bytes], List[Any]]:
+        return lambda body: [normalize(it) for it in decode(body)["items"]]
+
+    variants = {
+        "legacy": legacy,
+        "json+dict": build(std, normalize_naver_item),
+        "json+record": build(std, normalize_naver_product),
+    }
+    if orjson is not None:
+        fast = select_json_decoder("orjson")
+        variants["orjson+dict"] = build(fast, normalize_naver_item)
+        variants["orjson+record"] = build(fast, normalize_naver_product)
+    return variants
+
+
+def run_pages(fn: Callable[[bytes], List[Any]], pages: List[bytes]) -> List[Any]:
+    out: List[Any] = []
+    for body in pages:
+        out.extend(fn(body))
+    return out
+
+
+def best_seconds(variants: Dict[str, Callable[[bytes], List[Any]]], pages: List[bytes], repeat: int) -> Dict[str, float]:
+    # 방식마다 번갈아 돌린다 (순서를 매 라운드 돌려서 기계 상태 변화가 한쪽에만 몰리지 않게)
+    names = list(variants)
+    best = {name: float("inf") for name in names}
+    for rnd in range(repeat):
+        for name in names[rnd % len(names):] + names[:rnd % len(names)]:
+            t0 = time.perf_counter()
+            run_pages(variants[name], pages)
+            best[name] = min(best[name], time.perf_counter() - t0)
+    return best
+
+
+def memory(fn: Callable[[bytes], List[Any]], pages: List[bytes]) -> Dict[str, Any]:
+    tracemalloc.start()
+    result = run_pages(fn, pages)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "peak_kb": round(peak / 1024),
+        "retained_kb": round(retained / 1024),
+        "retained_bytes_per_item": round(retained / len(result)),
+    }
+
+
+def clean_title_ns(n: int = 20_000) -> Dict[str, Dict[str, float]]:
+    """제목 종류별 clean_title 1회 시간 (ns): 이전 구현 vs fast path."""
+    titles = {
+        "plain": "로지텍 기계식 키보드 G913 텐키리스 청축",
+        "bold": "로지텍 <b>기계식</b> <b>키보드</b> G913 텐키리스 청축",
+        "entity": "<b>기계식</b> 키보드 &amp; 마우스 세트 &quot;한정판&quot;",
+    }
+    fns = [("legacy", legacy_clean_title), ("current", clean_title)]
+    out = {}
+    for kind, title in titles.items():
+        best = {name: float("inf") for name, _ in fns}
+        for rnd in range(10):
+            for name, fn in fns if rnd % 2 else fns[::-1]:
+                t0 = time.perf_counter_ns()
+                for _ in range(n):
+                    fn(title)
+                best[name] = min(best[name], (time.perf_counter_ns() - t0) / n)
+        out[kind] = {name: round(v, 1) for name, v in best.items()}
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--plain-ratio", type=float, default=0.3)
+    parser.add_argument("--entity-ratio", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = make_pages(args.items, args.page_size, plain_ratio=args.plain_ratio, entity_ratio=args.entity_ratio, seed=args.seed)
+    variants = make_variants()
+
+    # 모든 방식의 정제 결과가 같은지 먼저 확인
+    expected = run_pages(variants["legacy"], pages)
+    for name, fn in variants.items():
+        if [r._asdict() if isinstance(r, tuple) else r for r in run_pages(fn, pages)] != expected:
+            raise SystemExit(f"{name}: normalized output differs from legacy")
+
+    best = best_seconds(variants, pages, args.repeat)
+    result = {
+        name: {
+            "seconds": round(best[name], 4),
+            "us_per_item": round(best[name] / args.items * 1e6, 2),
+            "items_per_sec": round(args.items / best[name]),
+            "speedup_vs_legacy": round(best["legacy"] / best[name], 2),
+            **memory(fn, pages),
+        }
+        for name, fn in variants.items()
+    }
+
+    write_result(
+        "normalize",
+        {
+            "params": {
+                "items": args.items,
+                "page_size": args.page_size,
+                "plain_ratio": args.plain_ratio,
+                "entity_ratio": args.entity_ratio,
+                "response_kb": round(sum(map(len, pages)) / 1024),
+            },
+            "orjson": orjson.__version__ if orjson is not None else None,
+            "clean_title_ns": clean_title_ns(),
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
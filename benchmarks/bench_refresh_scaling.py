@@ -0,0 +1,133 @@
+# benchmarks/bench_refresh_scaling.py
+"""
+wishlist 크기별 가격 갱신 시간: refresh_scheduler.run_tick 한 번으로 wishlist 상품 전부를 갱신한다
+(예산 = 상품 수, 모든 상품이 확인할 때가 된 상태). 네이버는 로컬 가짜 서버(benchmarks/fake_naver.py)를 HTTP로 호출.
+
+상품은 가짜 서버에서 먼저 수집해 두고(시간에 안 넣음), 상품 제목 = 검색어라서 상품마다 검색 1번.
+가격은 --drift-ratio 비율의 상품만 바뀐다 (바뀐 상품만 price_history + 알람 판별).
+
+python -m benchmarks.bench_refresh_scaling --sizes 100 500 2000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.fake_naver import FakeNaverConfig, FakeNaverServer, free_port, point_app_at
+
+PORT = free_port()
+_rate = sys.argv[sys.argv.index("--naver-rate") + 1] if "--naver-rate" in sys.argv else "1000"
+point_app_at(PORT, rate_per_second=float(_rate))  # services import 전에
+
+from sqlalchemy import insert, update
+
+from benchmarks._common import make_engine, make_session_factory, write_result
+
+import models
+from services.collect_pipeline import CollectPipeline, CollectRequest
+from services.naver_shopping_client import AsyncNaverShoppingClient, search_cache
+from services.refresh_scheduler import RefreshScheduler
+
+QUERIES = ("기계식 키보드", "무선 키보드", "게이밍 키보드", "저소음 키보드", "키보드 키캡")
+CATALOG_SIZE = 1000
+
+
+def seed(client, SessionLocal, size: int) -> None:
+    # 필요한 만큼 검색어별 1000개씩 수집 + 유저 1명의 wishlist에 size개
+    queries = QUERIES[: (size + CATALOG_SIZE - 1) // CATALOG_SIZE]
+    requests = [CollectRequest(key=q, query=q, total=CATALOG_SIZE, page_size=100) for q in queries]
+    client.run(CollectPipeline(client, SessionLocal).run_many(requests))
+
+    db = SessionLocal()
+    try:
+        user = models.User(email="refresh@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        ids = [i for (i,) in db.query(models.Item.id).order_by(models.Item.id).limit(size).all()]
+        db.execute(insert(models.Wishlist), [{"user_id": user.id, "item_id": i, "is_active": 1} for i in ids])
+        db.execute(update(models.Item).values(last_checked_at=None))  # 전부 확인할 때가 된 상태
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(args: argparse.Namespace, size: int) -> Dict[str, Any]:
+    config = FakeNaverConfig(
+        catalog_size=CATALOG_SIZE,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.latency_ms / 3,
+        drift_seconds=1.0,
+        drift_ratio=args.drift_ratio,
+    )
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    try:
+        with FakeNaverServer(config, port=PORT) as server:
+            engine = make_engine(args.db_url or f"sqlite:///{tmp.name}")
+            SessionLocal = make_session_factory(engine)
+            client = AsyncNaverShoppingClient(max_in_flight=args.max_in_flight)
+            try:
+                seed(client, SessionLocal, size)
+                time.sleep(1.1)  # 가격 변동 구간(drift_seconds)이 바뀐 뒤 갱신
+                search_cache.clear()
+                seeded_calls = server.stats().get("200", 0)
+
+                db = SessionLocal()
+                try:
+                    t0 = time.perf_counter()
+                    tick = RefreshScheduler().run_tick(db, client=client, budget_calls=size)
+                    elapsed = time.perf_counter() - t0
+                    price_rows = db.query(models.PriceHistory).count()
+                finally:
+                    db.close()
+            finally:
+                client.close()
+                engine.dispose()
+            calls = server.stats().get("200", 0) - seeded_calls
+        return {
+            "wishlist_size": size,
+            "seconds": round(elapsed, 3),
+            "items_per_sec": round(tick.updated / elapsed, 1),
+            "selected": tick.selected,
+            "updated": tick.updated,
+            "naver_calls": calls,
+            "price_history_rows": price_rows,
+        }
+    finally:
+        os.unlink(tmp.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=None, help="기본: 임시 파일 SQLite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--drift-ratio", type=float, default=0.2)
+    parser.add_argument("--naver-rate", type=float, default=1000)
+    args = parser.parse_args()
+    if max(args.sizes) > CATALOG_SIZE * len(QUERIES):
+        parser.error(f"--sizes must be <= {CATALOG_SIZE * len(QUERIES)}")
+
+    runs: List[Dict[str, Any]] = [run(args, size) for size in args.sizes]
+    write_result(
+        "refresh_scaling",
+        {
+            "db": (args.db_url or "sqlite").split(":", 1)[0],
+            "params": {
+                "max_in_flight": args.max_in_flight,
+                "latency_ms": args.latency_ms,
+                "drift_ratio": args.drift_ratio,
+                "naver_rate_per_second": args.naver_rate,
+            },
+            "runs": runs,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
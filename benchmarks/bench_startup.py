@@ -0,0 +1,166 @@
+# benchmarks/bench_startup.py
+"""
+서버 시작 후 첫 요청까지 걸리는 시간 (time-to-first-request).
+- blocking:   시작 작업(리더 임대, 수집, 갱신, 해싱 워커)을 다 끝낸 뒤 요청을 받는다 (이전 동작)
+- background: lifespan은 바로 끝나고 시작 작업은 뒤에서 돈다
+
+실제 main.app을 uvicorn으로 띄우고 /health/live가 처음 200을 줄 때까지 잰다.
+네이버 호출은 하지 않고, 수집/갱신 배치 본문을 --collect-seconds / --refresh-seconds 만큼 걸리는 가짜로 바꾼다.
+DB는 임시 파일 SQLite.
+
+python -m benchmarks.bench_startup --collect-seconds 8 --refresh-seconds 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict
+
+from benchmarks._common import write_result
+
+MODES = ("blocking", "background")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(client, path: str, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(path).status_code == 200:
+                return time.perf_counter()
+        except Exception:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(path)
+
+
+def child(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    import uvicorn
+
+    from benchmarks._common import make_engine, make_session_factory
+
+    import main
+    from services.collect_targets import CollectTick
+    from services.refresh_scheduler import RefreshTick
+
+    engine = make_engine(args.db_url)
+    SessionLocal = make_session_factory(engine)
+    main.JobSessionLocal = SessionLocal
+    main.coordinator.session_factory = SessionLocal
+    main.STARTUP_WARMUP = args.mode
+
+    class FakeTargetCollector:
+        def run_tick(self, db, **kwargs):
+            time.sleep(args.collect_seconds)
+            return CollectTick(targets=0, calls=0, saved=0, duplicates=0, completed=0, errors=0)
+
+    class FakeRefreshScheduler:
+        def run_tick(self, db, **kwargs):
+            time.sleep(args.refresh_seconds)
+            return RefreshTick(due=0, selected=0, calls=0, updated=0)
+
+    main.target_collector = FakeTargetCollector()
+    main.refresh_scheduler = FakeRefreshScheduler()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+
+    t0 = time.perf_counter()
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    deadline = t0 + 120
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=5) as client:
+        first_request = _wait_for(client, "/health/live", deadline)
+        ready = _wait_for(client, "/health/ready", deadline)
+        main.startup_warmup.join(timeout=deadline - time.perf_counter())
+        warm = time.perf_counter()
+        steps = client.get("/health/ready").json()["steps"]
+
+    server.should_exit = True
+    thread.join(timeout=30)
+    engine.dispose()
+
+    return {
+        "time_to_first_request_s": round(first_request - t0, 3),
+        "time_to_ready_s": round(ready - t0, 3),
+        "time_to_warm_s": round(warm - t0, 3),
+        "steps": {s["name"]: {"status": s["status"], "seconds": s["seconds"]} for s in steps},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collect-seconds", type=float, default=8.0, help="시작 수집 1회에 걸리는 시간(가짜)")
+    parser.add_argument("--refresh-seconds", type=float, default=4.0, help="시작 갱신 1회에 걸리는 시간(가짜)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--db-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # 자식 프로세스: 한 번 띄우고 결과를 stdout 마지막 줄에 JSON으로
+        print(json.dumps(child(args)))
+        return
+
+    result: Dict[str, Any] = {}
+    for mode in MODES:
+        runs = []
+        for _ in range(args.repeat):
+            tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+            tmp.close()
+            try:
+                out = subprocess.run(
+                    [
+                        sys.executable, "-m", "benchmarks.bench_startup",
+                        "--mode", mode,
+                        "--db-url", f"sqlite:///{tmp.name}",
+                        "--collect-seconds", str(args.collect_seconds),
+                        "--refresh-seconds", str(args.refresh_seconds),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+            finally:
+                os.unlink(tmp.name)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+        def median(key: str) -> float:
+            values = sorted(r[key] for r in runs)
+            return values[len(values) // 2]
+
+        result[mode] = {
+            "time_to_first_request_s": median("time_to_first_request_s"),
+            "time_to_ready_s": median("time_to_ready_s"),
+            "time_to_warm_s": median("time_to_warm_s"),
+            "runs": runs,
+        }
+
+    write_result(
+        "startup",
+        {
+            "params": {
+                "collect_seconds": args.collect_seconds,
+                "refresh_seconds": args.refresh_seconds,
+                "repeat": args.repeat,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
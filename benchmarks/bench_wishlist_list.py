@@ -0,0 +1,149 @@
+# benchmarks/bench_wishlist_list.py
+"""
+GET /wishlist 목록 조회 비교: 기존 경로(행마다 item lazy load + 매번 COUNT + OFFSET) vs
+새 경로(JOIN 로딩 + 개수 캐시 + keyset 커서).
+
+python -m benchmarks.bench_wishlist_list --rows 10000 --display 100
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from benchmarks._common import (
+    DEFAULT_DB_URL,
+    QueryCounter,
+    as_products,
+    make_engine,
+    make_session_factory,
+    percentiles,
+    stopwatch,
+    synthetic_items,
+    write_result,
+)
+
+import models
+import schemas
+from crud import bulk_upsert_items_from_naver
+from routers.wishlist_ref import get_wishlist
+from services.wishlist_listing import wishlist_count_cache
+
+
+def seed(db, rows: int) -> models.User:
+    user = models.User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    upserted = bulk_upsert_items_from_naver(db, as_products(synthetic_items(rows)))
+    # 추가 시각을 1분씩 다르게 넣는다 (SQLite는 server_default 시각과 바인딩된 시각의 문자열 형식이 달라 비교가 어긋난다)
+    base = datetime(2026, 1, 1)
+    db.execute(
+        insert(models.Wishlist),
+        [
+            {"user_id": user.id, "item_id": u.item_id, "is_active": 1, "created_at": base + timedelta(minutes=i)}
+            for i, u in enumerate(upserted)
+        ],
+    )
+    db.commit()
+    return user
+
+
+def legacy_get_wishlist(db, user: models.User, *, display: int, start: int, sort: str) -> Dict[str, Any]:
+    # 변경 전 routers/wishlist_ref.get_wishlist 본문
+    query = db.query(models.Wishlist).filter(models.Wishlist.user_id == user.id)
+    if sort == "date":
+        query = query.order_by(models.Wishlist.created_at.desc())
+    total_count = query.count()
+    items = query.offset(start - 1).limit(display).all()
+    return schemas.WishlistListResponse(
+        result_code="SUCCESS",
+        total_count=total_count,
+        user_id=user.id,
+        wishlist_items=items,
+    ).model_dump()
+
+
+def measure(SessionLocal, counter: QueryCounter, calls: List[Any]) -> Dict[str, Any]:
+    samples: List[float] = []
+    queries: List[int] = []
+    for call in calls:
+        db = SessionLocal()
+        counter.reset()
+        try:
+            with stopwatch() as elapsed:
+                call(db)
+        finally:
+            db.close()
+        samples.append(elapsed[0] * 1000)
+        queries.append(counter.reset())
+    return {
+        "requests": len(calls),
+        "latency_ms": {k: round(v, 3) for k, v in percentiles(samples).items()},
+        "queries_per_request": round(sum(queries) / len(queries), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=DEFAULT_DB_URL)
+    parser.add_argument("--rows", type=int, default=10000, help="유저 1명의 wishlist 행 수")
+    parser.add_argument("--display", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=50, help="경로별 측정 요청 수")
+    args = parser.parse_args()
+
+    engine = make_engine(args.db_url)
+    counter = QueryCounter(engine)
+    SessionLocal = make_session_factory(engine)
+
+    db = SessionLocal()
+    user = seed(db, args.rows)
+    db.refresh(user)
+    db.expunge(user)
+    db.close()
+
+    display, n = args.display, args.requests
+    # 기존 API는 start <= 1000까지만 허용
+    offsets = [1 + (i * display) % 1000 for i in range(n)]
+
+    def new_call(**kwargs):
+        return lambda db: get_wishlist(db=db, current_user=user, sort="date", display=display, **kwargs).model_dump()
+
+    # 커서 경로: 처음부터 끝까지 이어 읽는다 (한도 없이 모든 행에 도달)
+    cursor_pages: List[Any] = []
+    cursor = None
+    db = SessionLocal()
+    while True:
+        page = get_wishlist(db=db, current_user=user, sort="date", display=display, start=1, cursor=cursor)
+        cursor_pages.append(cursor)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    db.close()
+
+    wishlist_count_cache.clear()
+    result = {
+        "legacy_offset": measure(
+            SessionLocal, counter,
+            [lambda db, s=s: legacy_get_wishlist(db, user, display=display, start=s, sort="date") for s in offsets],
+        ),
+        "joined_offset": measure(SessionLocal, counter, [new_call(start=s, cursor=None) for s in offsets]),
+        "joined_cursor_full_walk": measure(
+            SessionLocal, counter, [new_call(start=1, cursor=c) for c in cursor_pages],
+        ),
+    }
+    engine.dispose()
+
+    write_result(
+        "wishlist_list",
+        {
+            "db": args.db_url.split(":", 1)[0],
+            "params": {"rows": args.rows, "display": display, "requests": n},
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
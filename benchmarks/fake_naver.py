@@ -0,0 +1,277 @@
+# benchmarks/fake_naver.py
+"""
+로컬 가짜 네이버 쇼핑 검색 API (GET /v1/search/shop.json).
+
+- 검색어마다 --catalog-size개짜리 상품 목록을 만든다 (같은 검색어면 항상 같은 상품, productId 고정).
+  상품 제목은 "<b>검색어</b> 번호"라서 수집한 상품 제목으로 다시 검색하면(가격 갱신) 그 상품이 맨 앞에 나온다.
+- start/display/sort(sim, date, asc, dsc) 페이지네이션, start > 1000 / display > 100이면 400 (실제 API와 같은 제한).
+- 가격 변동: 상품 중 --drift-ratio 비율이 --drift-seconds마다 기준가 ±10% 안에서 바뀐다.
+- 응답 지연 --latency-ms (± --jitter-ms), --rate-429 / --rate-500 확률로 오류 응답 (429에는 Retry-After: --retry-after).
+- 인증 헤더(X-Naver-Client-Id / Secret)가 없으면 401. GET /_stats는 상태 코드별 응답 수.
+
+서버로 띄우기:
+    python -m benchmarks.fake_naver --port 8089 --latency-ms 30 --rate-429 0.02
+    NAVER_API_BASE_URL=http://127.0.0.1:8089 uvicorn main:app
+벤치마크 안에서:
+    PORT = free_port()
+    point_app_at(PORT)                 # services를 import하기 전에
+    ...
+    with FakeNaverServer(FakeNaverConfig(latency_ms=20), port=PORT) as server:
+        ...
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+MAX_START = 1000
+MAX_DISPLAY = 100
+
+
+class FakeNaverConfig(NamedTuple):
+    catalog_size: int = 1000
+    latency_ms: float = 30.0
+    jitter_ms: float = 10.0
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    retry_after: Optional[int] = None
+    drift_seconds: float = 60.0
+    drift_ratio: float = 0.2
+    seed: int = 0
+
+
+def _unit(*parts: Any) -> float:
+    # 입력마다 고정된 0~1 값 (프로세스/실행이 달라도 같음)
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64
+
+
+class Catalog:
+    def __init__(self, config: FakeNaverConfig) -> None:
+        self.config = config
+        self.started = time.monotonic()
+        self._items: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, query: str) -> List[Dict[str, Any]]:
+        seed = self.config.seed
+        items = []
+        for i in range(self.config.catalog_size):
+            product_id = 10_000_000_000 + int(_unit(seed, query, i, "id") * 8_999_999_999)
+            items.append({
+                "index": i,
+                "title": f"<b>{query}</b> {i}",
+                "product_id": str(product_id),
+                "base_price": 10_000 + int(_unit(seed, query, i, "price") * 190_000),
+                "volatile": _unit(seed, query, i, "volatile") < self.config.drift_ratio,
+                "mall": f"mall-{int(_unit(seed, query, i, 'mall') * 50) + 1}",
+                "date_rank": _unit(seed, query, i, "date"),
+            })
+        return items
+
+    def catalog(self, query: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = self._items.get(query)
+            if items is None:
+                items = self._items[query] = self._build(query)
+            return items
+
+    def price(self, item: Dict[str, Any], epoch: int) -> int:
+        if not item["volatile"] or epoch == 0:
+            return item["base_price"]
+        factor = 0.9 + 0.2 * _unit(self.config.seed, item["product_id"], epoch)
+        return max(100, int(item["base_price"] * factor) // 10 * 10)
+
+    def search(self, query: str, *, start: int, display: int, sort: str) -> Dict[str, Any]:
+        epoch = int((time.monotonic() - self.started) / self.config.drift_seconds) if self.config.drift_seconds > 0 else 0
+
+        # "검색어 번호" = 수집된 상품 제목으로 다시 검색 -> 그 상품을 맨 앞에
+        base, _, tail = query.rpartition(" ")
+        if base and tail.isdigit() and int(tail) < self.config.catalog_size:
+            items = self.catalog(base)[int(tail):int(tail) + 20]
+        else:
+            items = self.catalog(query)
+
+        priced = [(it, self.price(it, epoch)) for it in items]
+        if sort == "asc":
+            priced.sort(key=lambda p: p[1])
+        elif sort == "dsc":
+            priced.sort(key=lambda p: -p[1])
+        elif sort == "date":
+            priced.sort(key=lambda p: p[0]["date_rank"])
+
+        page = priced[start - 1:start - 1 + display]
+        return {
+            "lastBuildDate": formatdate(localtime=True),
+            "total": len(priced),
+            "start": start,
+            "display": len(page),
+            "items": [
+                {
+                    "title": it["title"],
+                    "link": f"https://smartstore.naver.com/main/products/{it['product_id']}",
+                    "image": f"https://shopping-phinf.pstatic.net/main_{it['product_id']}/{it['product_id']}.jpg",
+                    "lprice": str(price),
+                    "hprice": "",
+                    "mallName": it["mall"],
+                    "productId": it["product_id"],
+                    "productType": "2",
+                    "brand": "",
+                    "maker": "",
+                    "category1": "디지털/가전",
+                    "category2": "PC주변기기",
+                    "category3": "키보드",
+                    "category4": "",
+                }
+                for it, price in page
+            ],
+        }
+
+
+def create_app(config: FakeNaverConfig) -> Starlette:
+    catalog = Catalog(config)
+    stats: Counter = Counter()
+    rng = random.Random(config.seed)
+
+    def _error(status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+        stats[str(status)] += 1
+        return JSONResponse({"errorMessage": message, "errorCode": code}, status_code=status, headers=headers)
+
+    async def search(request: Request) -> JSONResponse:
+        delay = max(0.0, config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+        if not request.headers.get("x-naver-client-id") or not request.headers.get("x-naver-client-secret"):
+            return _error(401, "024", "Not Exist Client ID : Authentication failed.")
+
+        roll = rng.random()
+        if roll < config.rate_429:
+            headers = {"Retry-After": str(config.retry_after)} if config.retry_after is not None else None
+            return _error(429, "012", "Rate limit exceeded.", headers)
+        if roll < config.rate_429 + config.rate_500:
+            return _error(500, "SE99", "System Error")
+
+        params = request.query_params
+        query = (params.get("query") or "").strip()
+        try:
+            start = int(params.get("start", "1"))
+            display = int(params.get("display", "10"))
+        except ValueError:
+            return _error(400, "SE02", "Invalid display/start value")
+        if not query:
+            return _error(400, "SE01", "Incorrect query request")
+        if not (1 <= display <= MAX_DISPLAY):
+            return _error(400, "SE02", "Invalid display value")
+        if not (1 <= start <= MAX_START):
+            return _error(400, "SE03", "Invalid start value")
+
+        body = catalog.search(query, start=start, display=display, sort=params.get("sort", "sim"))
+        stats["200"] += 1
+        stats["items"] += body["display"]
+        return JSONResponse(body)
+
+    async def get_stats(request: Request) -> JSONResponse:
+        return JSONResponse(dict(stats))
+
+    return Starlette(routes=[
+        Route("/v1/search/shop.json", search),
+        Route("/_stats", get_stats),
+    ])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def point_app_at(port: int, *, rate_per_second: float = 1000.0) -> str:
+    """
+    services를 import하기 전에 부른다: 네이버 주소를 가짜 서버로, 호출 한도는 벤치마크에 맞게 넉넉히
+    (이미 환경 변수로 준 값은 그대로 둔다).
+    """
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ["NAVER_API_BASE_URL"] = base_url
+    os.environ.setdefault("NAVER_RATE_PER_SECOND", str(rate_per_second))
+    os.environ.setdefault("NAVER_DAILY_QUOTA", "100000000")
+    return base_url
+
+
+class FakeNaverServer:
+    """가짜 서버를 현재 프로세스의 스레드에서 띄운다 (with 블록 동안)."""
+
+    def __init__(self, config: FakeNaverConfig = FakeNaverConfig(), *, port: Optional[int] = None) -> None:
+        self.config = config
+        self.port = port or free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(create_app(config), host="127.0.0.1", port=self.port, log_level="warning", lifespan="off")
+        )
+        self._thread = threading.Thread(target=self._server.run, name="fake-naver", daemon=True)
+
+    def __enter__(self) -> "FakeNaverServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("fake naver server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+    def stats(self) -> Dict[str, int]:
+        import httpx
+
+        return httpx.get(f"{self.base_url}/_stats").json()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--catalog-size", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--drift-seconds", type=float, default=60)
+    parser.add_argument("--drift-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeNaverConfig(
+        catalog_size=args.catalog_size,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        retry_after=args.retry_after,
+        drift_seconds=args.drift_seconds,
+        drift_ratio=args.drift_ratio,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# benchmarks/profile_queries.py
+"""
+경로/작업별 SQL 수를 services/sql_profiler로 재고 예산(BUDGETS)과 비교한다.
+예산을 넘은 항목이 있으면 종료 코드 1 (CI에서 N+1 회귀 확인용).
+
+- 요청: TestClient로 라우터를 부르고 query_budget으로 센다.
+  X-SQL-Profile 헤더를 붙여서 응답 헤더 요약(SqlProfileMiddleware, SQL_PROFILE=header)도 같이 남긴다.
+- 수집: 검색 결과 한 페이지 저장
+    per_item: crud.upsert_item_from_naver를 상품마다 (이전 방식, N+1 탐지 예시)
+    bulk:     services/shopping_service.ingest_search_results
+
+DB는 메모리 SQLite.
+python -m benchmarks.profile_queries --wishlist-rows 50 --page-size 50
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Any, Dict
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+from benchmarks._common import as_products, make_engine, make_session_factory, synthetic_items, write_result
+
+import database
+import models
+from crud import bulk_upsert_items_from_naver, upsert_item_from_naver
+from routers.alerts import router as alerts_router
+from routers.auth import create_access_token, router as auth_router
+from routers.wishlist_ref import router as wishlist_router
+from services.shopping_service import ingest_search_results
+from services.sql_profiler import QueryBudgetExceeded, SqlProfileMiddleware, query_budget
+from services.user_cache import user_cache
+from services.wishlist_listing import wishlist_count_cache
+
+# 이름 -> 최대 SQL 수
+BUDGETS = {
+    "GET /auth/me": 1,
+    "GET /wishlist": 3,
+    "GET /alerts": 1,
+    "ingest page (bulk)": 6,
+}
+
+
+def seed(SessionLocal, wishlist_rows: int) -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        user = models.User(email="profile@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        upserted = bulk_upsert_items_from_naver(db, as_products(synthetic_items(wishlist_rows)))
+        db.execute(
+            insert(models.Wishlist),
+            [{"user_id": user.id, "item_id": u.item_id, "is_active": 1} for u in upserted],
+        )
+        wishlist_id = db.execute(select(models.Wishlist.id).limit(1)).scalar_one()
+        db.execute(
+            insert(models.Alert),
+            [{"wishlist_id": wishlist_id, "alert_type": "TARGET_PRICE", "target_price": 40000 + i, "is_enabled": 1}
+             for i in range(5)],
+        )
+        db.commit()
+        return {"user_id": user.id, "wishlist_id": wishlist_id}
+    finally:
+        db.close()
+
+
+def build_app(SessionLocal) -> FastAPI:
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.add_middleware(SqlProfileMiddleware, mode="header")
+    app.include_router(auth_router)
+    app.include_router(wishlist_router)
+    app.include_router(alerts_router)
+    app.dependency_overrides[database.get_db] = get_db
+    return app
+
+
+def check(name: str, fn) -> Dict[str, Any]:
+    budget = BUDGETS.get(name)
+    try:
+        with query_budget(budget if budget is not None else 10**9, label=name) as profile:
+            extra = fn()
+        ok = True
+    except QueryBudgetExceeded:
+        ok = False
+    return {
+        "queries": profile.queries,
+        "budget": budget,
+        "within_budget": ok,
+        "repeated": [s._asdict() for s in profile.repeated()],
+        **(extra or {}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wishlist-rows", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    database.install_query_metrics(engine, "profile")
+    SessionLocal = make_session_factory(engine)
+    ids = seed(SessionLocal, args.wishlist_rows)
+
+    user_cache.clear()
+    wishlist_count_cache.clear()
+    headers = {"Authorization": f"Bearer {create_access_token(ids['user_id'])}", "X-SQL-Profile": "1"}
+    client = TestClient(build_app(SessionLocal), headers=headers)
+    client.get("/auth/me")  # 유저 캐시 / wishlist 개수 캐시를 채운 뒤의 정상 상태를 잰다
+    client.get("/wishlist?display=20")
+
+    def call(path: str):
+        def go():
+            resp = client.get(path)
+            resp.raise_for_status()
+            return {"x_sql_profile": resp.headers.get("x-sql-profile")}
+        return go
+
+    result: Dict[str, Any] = {
+        "GET /auth/me": check("GET /auth/me", call("/auth/me")),
+        "GET /wishlist": check("GET /wishlist", call("/wishlist?display=20")),
+        "GET /alerts": check("GET /alerts", call(f"/alerts?wishlist_id={ids['wishlist_id']}")),
+    }
+
+    page = synthetic_items(args.page_size, first_id=100_000, seed=1)
+
+    def per_item():
+        db = SessionLocal()
+        try:
+            for data in page:
+                upsert_item_from_naver(db, data)
+            db.commit()
+        finally:
+            db.close()
+
+    def bulk():
+        db = SessionLocal()
+        try:
+            ingest_search_results(db, as_products(synthetic_items(args.page_size, first_id=200_000, seed=2)))
+            db.commit()
+        finally:
+            db.close()
+
+    result["ingest page (per_item)"] = check("ingest page (per_item)", per_item)
+    result["ingest page (bulk)"] = check("ingest page (bulk)", bulk)
+    engine.dispose()
+
+    write_result(
+        "profile_queries",
+        {
+            "db": "sqlite",
+            "params": {"wishlist_rows": args.wishlist_rows, "page_size": args.page_size},
+            **result,
+        },
+    )
+    if not all(r["within_budget"] for r in result.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
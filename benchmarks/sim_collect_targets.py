@@ -0,0 +1,182 @@
+# benchmarks/sim_collect_targets.py
+"""
+여러 수집 대상(COLLECT_TARGETS)을 tick마다 같은 호출 예산으로 수집할 때의 상품 커버리지 (가상 시계, 가짜 네이버 검색).
+- restart: 대상마다 매 tick start=1부터 (예산 / 대상 수)만큼 (대상별로 배포를 따로 돌리던 방식)
+- resume:  services/collect_targets.TargetCollector (진행 위치를 남겨서 다음 tick에 이어 받음, 중복 제거)
+
+검색어별 결과 목록은 서로 일부 겹친다 (같은 상품이 여러 검색에 나옴).
+중간 tick 하나에서 대상 하나의 fetch를 실패시켜 진행 위치가 유지되는지도 본다.
+
+python -m benchmarks.sim_collect_targets --ticks 30 --calls-per-tick 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import func
+
+from benchmarks._common import make_engine, make_session_factory, synthetic_items, write_result
+
+import models
+from services.collect_pipeline import CollectPipeline, CollectRequest
+from services.collect_targets import CollectTarget, TargetCollector
+from services.naver_shopping_client import normalize_naver_item
+
+# (검색어, 결과 수, 수집 total)
+CATALOGS = (("키보드", 900, 1000), ("기계식 키보드", 600, 1000), ("무선 키보드", 300, 300))
+OVERLAP = 0.4  # 각 검색 결과 중 다른 검색과 공유하는 상품 비율
+
+
+def _raw(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": data["title"],
+        "link": data["product_url"],
+        "image": data["image_url"],
+        "mallName": data["mall_name"],
+        "lprice": str(data["price"]),
+    }
+
+
+def build_catalogs(seed: int) -> Dict[str, List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    pool = synthetic_items(sum(n for _, n, _ in CATALOGS), seed=seed)
+    shared = pool[: len(pool) // 3]
+    own = iter(pool[len(pool) // 3:])
+    catalogs = {}
+    for query, n, _ in CATALOGS:
+        k = int(n * OVERLAP)
+        items = rng.sample(shared, k) + [next(own) for _ in range(n - k)]
+        rng.shuffle(items)
+        catalogs[query] = [_raw(d) for d in items]
+    return catalogs
+
+
+class FakeClient:
+    """AsyncNaverShoppingClient 중 수집 파이프라인이 쓰는 부분만."""
+
+    def __init__(self, catalogs: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.catalogs = catalogs
+        self.calls = 0
+        self.fail_query: Optional[str] = None
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+    async def search_products(self, query, *, display=10, start=1, normalize=True, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if query == self.fail_query:
+            raise RuntimeError(f"simulated failure: {query}")
+        page = self.catalogs[query][start - 1:start - 1 + display]
+        return [normalize_naver_item(it) for it in page] if normalize else page
+
+
+def _distinct_items(SessionLocal) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(func.count(models.Item.id)).scalar()
+    finally:
+        db.close()
+
+
+def run(args: argparse.Namespace, mode: str, catalogs) -> Dict[str, Any]:
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    try:
+        engine = make_engine(f"sqlite:///{tmp.name}")
+        SessionLocal = make_session_factory(engine)
+        client = FakeClient(catalogs)
+        targets = [
+            CollectTarget(name=q, query=q, total=total, interval_minutes=args.interval_minutes, page_size=args.page_size)
+            for q, _, total in CATALOGS
+        ]
+        collector = TargetCollector(targets, calls_per_tick=args.calls_per_tick)
+        universe: Set[str] = {it["link"] for items in catalogs.values() for it in items}
+
+        now = datetime(2026, 1, 1)
+        coverage: List[int] = []
+        duplicates = 0
+        sweeps_completed = 0
+        progress_after_failure = None
+        for tick in range(args.ticks):
+            failing = tick == args.fail_tick
+            client.fail_query = CATALOGS[0][0] if failing else None
+            db = SessionLocal()
+            try:
+                if mode == "resume":
+                    before = {r.name: r.next_start for r in db.query(models.CollectProgress).all()}
+                    result = collector.run_tick(db, client=client, now=now)
+                    duplicates += result.duplicates
+                    sweeps_completed += result.completed
+                    if failing:
+                        after = {r.name: r.next_start for r in db.query(models.CollectProgress).all()}
+                        progress_after_failure = {
+                            "target": client.fail_query,
+                            "next_start_before": before.get(client.fail_query, 1),
+                            "next_start_after": after.get(client.fail_query, 1),
+                        }
+                else:
+                    per_target = max(1, args.calls_per_tick // len(targets)) * args.page_size
+                    requests = [
+                        CollectRequest(key=t.name, query=t.query, total=min(per_target, t.total), page_size=t.page_size)
+                        for t in targets
+                    ]
+                    pipeline = CollectPipeline(client, SessionLocal)
+                    result = client.run(pipeline.run_many(requests, raise_fetch_errors=False))
+                    duplicates += result.duplicates
+            finally:
+                db.close()
+            coverage.append(_distinct_items(SessionLocal))
+            now += timedelta(minutes=1)
+
+        engine.dispose()
+        return {
+            "calls": client.calls,
+            "distinct_items_in_catalogs": len(universe),
+            "coverage_by_tick": coverage,
+            "final_coverage": round(coverage[-1] / len(universe), 3),
+            "first_full_coverage_tick": next((i + 1 for i, c in enumerate(coverage) if c == len(universe)), None),
+            "duplicates_skipped": duplicates,
+            "sweeps_completed": sweeps_completed if mode == "resume" else None,
+            "progress_after_failure": progress_after_failure,
+        }
+    finally:
+        os.unlink(tmp.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--calls-per-tick", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--interval-minutes", type=float, default=60)
+    parser.add_argument("--fail-tick", type=int, default=3, help="이 tick에 첫 대상의 fetch를 실패시킨다")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    catalogs = build_catalogs(args.seed)
+    result = {mode: run(args, mode, catalogs) for mode in ("restart", "resume")}
+    write_result(
+        "collect_targets",
+        {
+            "params": {
+                "ticks": args.ticks,
+                "calls_per_tick": args.calls_per_tick,
+                "page_size": args.page_size,
+                "interval_minutes": args.interval_minutes,
+                "catalogs": [{"query": q, "results": n, "total": t} for q, n, t in CATALOGS],
+                "overlap": OVERLAP,
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
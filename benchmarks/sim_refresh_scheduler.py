@@ -0,0 +1,197 @@
+# benchmarks/sim_refresh_scheduler.py
+"""
+가격 갱신 방식 비교 (가상 시계, 가짜 네이버 검색).
+- legacy:   10분마다 wishlist 상품 전체 갱신 (refresh_wishlist_prices)
+- priority: 2분 tick마다 확인 시각이 지난 상품만 예산(시간당 호출 수) 안에서 갱신 (refresh_scheduler)
+
+상품 가격은 미리 정한 변동성대로 바뀐다 (volatile: 평균 30분, moderate: 평균 6시간, stable: 안 바뀜).
+지표: 시간당 검색 호출 수, 가격 변동이 DB에 반영되기까지 걸린 시간(wishlist 상품 기준).
+
+python -m benchmarks.sim_refresh_scheduler --items 1000 --hours 12 --calls-per-hour 600
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from benchmarks._common import (
+    as_products,
+    make_engine,
+    make_session_factory,
+    percentiles,
+    synthetic_items,
+    write_result,
+)
+
+import models
+import services.shopping_service as shopping_service
+from crud import bulk_upsert_items_from_naver
+from services.refresh_scheduler import RefreshScheduler, tick_budget
+
+PROFILES = (("volatile", 0.1, 30), ("moderate", 0.3, 360), ("stable", 0.6, None))  # (이름, 비율, 평균 변동 간격(분))
+
+
+class Market:
+    """상품별 실제 가격과 아직 DB에 반영되지 않은 변동 시각."""
+
+    def __init__(self, items: List[Dict[str, Any]], *, start: datetime, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.price = {d["external_id"]: d["price"] for d in items}
+        self.profile: Dict[str, Optional[float]] = {}
+        ids = list(self.price)
+        self.rng.shuffle(ids)
+        offset = 0
+        for name, ratio, mean_minutes in PROFILES:
+            n = round(len(ids) * ratio)
+            for external_id in ids[offset:offset + n]:
+                self.profile[external_id] = mean_minutes
+            offset += n
+        for external_id in ids[offset:]:
+            self.profile[external_id] = None
+        self.next_change = {k: self._next(start, k) for k in ids}
+        self.pending: Dict[str, datetime] = {}   # 반영 안 된 첫 변동 시각
+        self.delays: Dict[str, List[float]] = {}
+
+    def _next(self, now: datetime, external_id: str) -> Optional[datetime]:
+        mean = self.profile[external_id]
+        if mean is None:
+            return None
+        return now + timedelta(minutes=self.rng.expovariate(1 / mean))
+
+    def advance(self, now: datetime) -> None:
+        for external_id, at in self.next_change.items():
+            while at is not None and at <= now:
+                self.price[external_id] = max(1000, int(self.price[external_id] * self.rng.uniform(0.9, 1.1)))
+                self.pending.setdefault(external_id, at)
+                at = self._next(at, external_id)
+            self.next_change[external_id] = at
+
+    def observe(self, external_id: str, now: datetime) -> None:
+        changed_at = self.pending.pop(external_id, None)
+        if changed_at is not None:
+            self.delays.setdefault(external_id, []).append((now - changed_at).total_seconds() / 60)
+
+
+class FakeClient:
+    """AsyncNaverShoppingClient 중 refresh_items가 쓰는 부분만."""
+
+    def __init__(self, market: Market, clock) -> None:
+        self.market = market
+        self.clock = clock
+        self.by_title: Dict[str, Dict[str, Any]] = {}
+        self.calls = 0
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+    async def search_many(self, calls: List[Dict[str, Any]], *, spread_over=None, return_exceptions=True):
+        results = []
+        for kwargs in calls:
+            self.calls += 1
+            d = self.by_title[kwargs["query"]]
+            self.market.observe(d["external_id"], self.clock())
+            results.append([{**d, "price": self.market.price[d["external_id"]]}])
+        return results
+
+
+def run(args: argparse.Namespace, mode: str) -> Dict[str, Any]:
+    engine = make_engine(args.db_url)
+    SessionLocal = make_session_factory(engine)
+
+    start = datetime.now(timezone.utc).replace(tzinfo=None).replace(microsecond=0)
+    now = [start]
+    clock = lambda: now[0]  # noqa: E731
+    # 확인 시각(last_checked_at)을 가상 시계로 찍는다
+    shopping_service._now_naive_utc = clock
+
+    items = synthetic_items(args.items, seed=args.seed)
+    market = Market(items, start=start, seed=args.seed)
+    client = FakeClient(market, clock)
+    client.by_title = {d["title"]: d for d in items}
+
+    db = SessionLocal()
+    upserted = bulk_upsert_items_from_naver(db, as_products(items))
+    user = models.User(email="sim@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    rng = random.Random(args.seed + 1)
+    watched_ids = {u.item_id for u in upserted if rng.random() < args.watched_ratio}
+    db.execute(insert(models.Wishlist), [{"user_id": user.id, "item_id": i, "is_active": 1} for i in watched_ids])
+    db.commit()
+    external_by_id = {u.item_id: d["external_id"] for u, d in zip(upserted, items)}
+    watched_external = {external_by_id[i] for i in watched_ids}
+
+    scheduler = RefreshScheduler()
+    tick = timedelta(minutes=args.tick_minutes)
+    budget = tick_budget(args.calls_per_hour, args.tick_minutes)
+    elapsed = timedelta()
+    total = timedelta(hours=args.hours)
+    n = 0
+    while elapsed < total:
+        market.advance(now[0])
+        if mode == "legacy":
+            if n % round(10 / args.tick_minutes) == 0:
+                shopping_service.refresh_wishlist_prices(db, client=client)
+        else:
+            if n % round(60 / args.tick_minutes) == 0:
+                scheduler.invalidate()  # 변동 횟수 캐시는 한 시간마다 다시 읽는다 (가상 시계 기준)
+            scheduler.run_tick(db, client=client, budget_calls=budget, now=now[0])
+        n += 1
+        elapsed += tick
+        now[0] = start + elapsed
+
+    db.close()
+    engine.dispose()
+
+    watched_delays = [d for k, ds in market.delays.items() if k in watched_external for d in ds]
+    unobserved_watched = sum(1 for k in market.pending if k in watched_external)
+    return {
+        "calls": client.calls,
+        "calls_per_hour": round(client.calls / args.hours, 1),
+        "watched_detected_changes": len(watched_delays),
+        "watched_undetected_at_end": unobserved_watched,
+        "watched_detection_delay_min": {k: round(v, 1) for k, v in percentiles(watched_delays).items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default="sqlite://")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--watched-ratio", type=float, default=0.5)
+    parser.add_argument("--hours", type=float, default=12)
+    parser.add_argument("--tick-minutes", type=float, default=2)
+    parser.add_argument("--calls-per-hour", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    original_now = shopping_service._now_naive_utc
+    try:
+        result = {mode: run(args, mode) for mode in ("legacy", "priority")}
+    finally:
+        shopping_service._now_naive_utc = original_now
+
+    write_result(
+        "refresh_scheduler",
+        {
+            "db": args.db_url.split(":", 1)[0],
+            "params": {
+                "items": args.items,
+                "watched_ratio": args.watched_ratio,
+                "hours": args.hours,
+                "tick_minutes": args.tick_minutes,
+                "calls_per_hour": args.calls_per_hour,
+                "profiles": [{"name": n, "ratio": r, "mean_change_minutes": m} for n, r, m in PROFILES],
+            },
+            **result,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
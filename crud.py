@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Protocol, Sequence, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 import models
-from models import Item, PriceHistory
+from models import Item, PriceDailyMin, PriceHistory
+from services.wishlist_listing import invalidate_wishlist_count
 
 def remove_from_wishlist(db: Session, *, user_id: int, item_id: int) -> models.Wishlist:
     w = (
@@ -38,6 +40,8 @@ def hard_remove_from_wishlist(db: Session, *, user_id: int, item_id: int):
     db.delete(w)
     db.commit()
 
+    invalidate_wishlist_count(user_id)
+
 
 # crud.py
 
@@ -84,31 +88,388 @@ def upsert_item_from_naver(db: Session, data: Dict[str, Any]) -> Tuple[Item, boo
 
 
 def insert_price_history(db: Session, item_id: int, price: int) -> PriceHistory:
+    # checked_at은 항상 파이썬 UTC로 넣는다 (server_default CURRENT_TIMESTAMP는 DB 세션 시간대라 일괄 저장 경로와 섞이면 안 됨)
+    checked_at = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
     ph = PriceHistory(
         item_id=item_id,
         price=price,
+        checked_at=checked_at,
     )
     db.add(ph)
     db.flush()
+    record_daily_min(db, [(item_id, price)], checked_at=checked_at)
     return ph
 
 
+# ---------------------------------------------------------
+# 최근 7일 최저가 (price_daily_min 롤업 기반)
+# - 가격이 들어올 때 (item_id, 날짜) 행을 LEAST로 갱신: O(1)
+# - 7일 최저가 = 윈도우 안의 하루 최저가 최대 8행의 MIN (price_history 범위 스캔 없음)
+# - 윈도우는 날짜(UTC) 단위: 7일 전 날짜의 0시부터 포함한다.
+# ---------------------------------------------------------
+MIN_PRICE_WINDOW_DAYS = 7
+
+
+def _window_start_day(now: Optional[datetime] = None) -> date:
+    if now is None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (now - timedelta(days=MIN_PRICE_WINDOW_DAYS)).date()
+
+
+def _daily_min_upsert_statement(db: Session, rows: List[Dict[str, Any]]):
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql.insert(PriceDailyMin).values(rows)
+        return stmt.on_duplicate_key_update(
+            min_price=func.least(PriceDailyMin.min_price, stmt.inserted.min_price)
+        )
+
+    if dialect in ("sqlite", "postgresql"):
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        # SQLite는 인자 2개짜리 min()이 LEAST 역할
+        least = func.min if dialect == "sqlite" else func.least
+        stmt = insert_fn(PriceDailyMin).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[PriceDailyMin.item_id, PriceDailyMin.day],
+            set_={"min_price": least(PriceDailyMin.min_price, stmt.excluded.min_price)},
+        )
+
+    raise NotImplementedError(f"daily min upsert is not supported for dialect {dialect!r}")
+
+
+def record_daily_min(
+    db: Session,
+    prices: Iterable[Tuple[int, int]],
+    *,
+    checked_at: Optional[datetime] = None,
+) -> None:
+    """(item_id, price) 목록을 price_daily_min에 반영한다 (같은 날은 더 낮은 가격만 남김)."""
+    if checked_at is None:
+        checked_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    day = checked_at.date()
+
+    lowest: Dict[int, int] = {}
+    for item_id, price in prices:
+        price = int(price)
+        if item_id not in lowest or price < lowest[item_id]:
+            lowest[item_id] = price
+    if not lowest:
+        return
+
+    rows = [{"item_id": item_id, "day": day, "min_price": price} for item_id, price in lowest.items()]
+    db.execute(_daily_min_upsert_statement(db, rows))
+
+
 def update_min_price_last_7d(db: Session, item: Item) -> None:
     """
-    price_history 기준 최근 7일 최저가를 items.min_price로 갱신
+    price_daily_min 기준 최근 7일 최저가를 items.min_price로 갱신
+    """
+    min_price = min_prices_last_7d(db, [item.id]).get(item.id)
+    if min_price is not None:
+        item.min_price = int(min_price)
+
+
+def min_prices_last_7d(db: Session, item_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    여러 상품의 최근 7일 최저가를 GROUP BY 쿼리 1번으로 계산한다 (상품당 최대 8행).
+    """
+    ids = list(item_ids)
+    if not ids:
+        return {}
+
+    rows = db.execute(
+        select(PriceDailyMin.item_id, func.min(PriceDailyMin.min_price))
+        .where(PriceDailyMin.item_id.in_(ids))
+        .where(PriceDailyMin.day >= _window_start_day())
+        .group_by(PriceDailyMin.item_id)
+    )
+    return {int(item_id): int(min_price) for item_id, min_price in rows}
+
+
+def prune_daily_min(db: Session, *, keep_days: int = MIN_PRICE_WINDOW_DAYS + 1) -> int:
+    """윈도우를 벗어난 price_daily_min 행 삭제. return: 삭제된 행 수"""
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None).date() - timedelta(days=keep_days)
+    result = db.execute(delete(PriceDailyMin).where(PriceDailyMin.day < cutoff))
+    return result.rowcount or 0
+
+
+def backfill_daily_min(db: Session, *, days: int = MIN_PRICE_WINDOW_DAYS + 1) -> int:
+    """
+    기존 price_history로 최근 days일의 price_daily_min을 다시 만든다.
+    return: 만들어진 (item_id, day) 행 수
     """
     now = datetime.now(timezone.utc).replace(tzinfo=None)
-    since = now - timedelta(days=7)
+    since_day = now.date() - timedelta(days=days)
+    since = datetime.combine(since_day, datetime.min.time())
+
+    db.execute(delete(PriceDailyMin).where(PriceDailyMin.day >= since_day))
+
+    day_expr = func.date(PriceHistory.checked_at)
+    rows = db.execute(
+        select(PriceHistory.item_id, day_expr, func.min(PriceHistory.price))
+        .where(PriceHistory.checked_at >= since)
+        .group_by(PriceHistory.item_id, day_expr)
+    ).all()
 
-    min_price = (
-        db.query(func.min(PriceHistory.price))
-        .filter(PriceHistory.item_id == item.id)
-        .filter(PriceHistory.checked_at >= since)
-        .scalar()
+    batch: List[Dict[str, Any]] = []
+    for item_id, day, min_price in rows:
+        if isinstance(day, str):  # SQLite date()는 문자열을 돌려준다
+            day = date.fromisoformat(day)
+        batch.append({"item_id": int(item_id), "day": day, "min_price": int(min_price)})
+        if len(batch) >= 1000:
+            db.execute(insert(PriceDailyMin), batch)
+            batch = []
+    if batch:
+        db.execute(insert(PriceDailyMin), batch)
+
+    return len(rows)
+
+
+# ---------------------------------------------------------
+# 페이지 단위 bulk 적재
+# - 행마다 SELECT/flush 하지 않고 페이지 전체를 몇 개의 집합 쿼리로 처리한다.
+# ---------------------------------------------------------
+class NaverItemRecord(Protocol):
+    """bulk 적재가 읽는 정제된 상품 필드 (services.naver_shopping_client.NaverProduct)."""
+
+    @property
+    def external_id(self) -> str: ...
+    @property
+    def title(self) -> str: ...
+    @property
+    def product_url(self) -> str: ...
+    @property
+    def image_url(self) -> str: ...
+    @property
+    def mall_name(self) -> str: ...
+    @property
+    def price(self) -> int: ...
+
+
+class UpsertedItem(NamedTuple):
+    item_id: int
+    external_id: str
+    price: int
+    is_created: bool
+    old_last_seen_price: Optional[int]
+    old_min_price: Optional[int]
+
+
+def upsert_rows_statement(
+    db: Session,
+    model: Any,
+    rows: Optional[List[Dict[str, Any]]],
+    *,
+    key_columns: Sequence[str],
+    update_columns: Sequence[str],
+):
+    """
+    다중 행 INSERT + 키 중복 시 update_columns를 새 값으로 덮어쓰는 문장.
+    MySQL은 ON DUPLICATE KEY UPDATE, SQLite/PostgreSQL은 ON CONFLICT DO UPDATE.
+    rows=None이면 VALUES 없이 만들어 executemany(파라미터 목록)로 실행할 수 있게 한다.
+    (행이 수천 개면 다중 VALUES 문장은 컴파일 비용이 커서 executemany가 빠르다)
+    """
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql.insert(model)
+        if rows is not None:
+            stmt = stmt.values(rows)
+        return stmt.on_duplicate_key_update(
+            {c: stmt.inserted[c] for c in update_columns}
+        )
+
+    if dialect in ("sqlite", "postgresql"):
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert_fn(model)
+        if rows is not None:
+            stmt = stmt.values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={c: stmt.excluded[c] for c in update_columns},
+        )
+
+    raise NotImplementedError(f"bulk upsert is not supported for dialect {dialect!r}")
+
+
+def _item_upsert_statement(db: Session, rows: List[Dict[str, Any]]):
+    """
+    items 다중 행 INSERT + 중복 시 메타데이터만 UPDATE.
+    기존 상품의 가격/확인시간(last_seen_price, min_price, last_checked_at)은 건드리지 않는다.
+    """
+    return upsert_rows_statement(
+        db,
+        Item,
+        rows,
+        key_columns=["external_id"],
+        update_columns=["title", "image_url", "product_url", "mall_name"],
     )
 
-    if min_price is not None:
-        item.min_price = int(min_price)
+
+def bulk_upsert_items_from_naver(
+    db: Session,
+    items: Sequence[NaverItemRecord],
+) -> List[UpsertedItem]:
+    """
+    정제된 네이버 상품(NaverProduct) 목록을 items 테이블에 한 번에 upsert.
+    - external_id IN (...) 조회 1번으로 기존 상품과 이전 가격을 가져온다.
+    - 다중 행 INSERT ... ON DUPLICATE KEY UPDATE 1번으로 저장한다.
+    - 새로 생긴 상품이 있으면 id 조회 1번을 더 한다.
+    같은 external_id가 여러 번 나오면 마지막 값을 쓴다.
+    Return: 입력 순서(중복 제거 후)대로의 UpsertedItem 목록
+    """
+    if not items:
+        return []
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    by_external_id: Dict[str, NaverItemRecord] = {}
+    for data in items:
+        by_external_id.pop(data.external_id, None)
+        by_external_id[data.external_id] = data
+
+    external_ids = list(by_external_id)
+    existing = {
+        row.external_id: row
+        for row in db.execute(
+            select(Item.id, Item.external_id, Item.last_seen_price, Item.min_price)
+            .where(Item.external_id.in_(external_ids))
+        )
+    }
+
+    rows = []
+    for external_id, data in by_external_id.items():
+        price = int(data.price)
+        rows.append(
+            {
+                "external_id": external_id,
+                "title": data.title,
+                "image_url": data.image_url or None,
+                "product_url": data.product_url,
+                "mall_name": data.mall_name or None,
+                "initial_price": price,
+                "last_seen_price": price,  # 신규 생성일 때만 반영됨
+                "min_price": price,
+                "last_checked_at": now,
+                "is_active": 1,
+            }
+        )
+    db.execute(_item_upsert_statement(db, rows))
+
+    created_ids: Dict[str, int] = {}
+    new_external_ids = [e for e in external_ids if e not in existing]
+    if new_external_ids:
+        created_ids = {
+            row.external_id: row.id
+            for row in db.execute(
+                select(Item.id, Item.external_id).where(Item.external_id.in_(new_external_ids))
+            )
+        }
+
+    result: List[UpsertedItem] = []
+    for external_id, data in by_external_id.items():
+        price = int(data.price)
+        prev = existing.get(external_id)
+        if prev is None:
+            result.append(UpsertedItem(created_ids[external_id], external_id, price, True, None, None))
+        else:
+            result.append(
+                UpsertedItem(
+                    int(prev.id),
+                    external_id,
+                    price,
+                    False,
+                    prev.last_seen_price,
+                    prev.min_price,
+                )
+            )
+    return result
+
+
+def bulk_insert_price_history(
+    db: Session,
+    prices: Iterable[Tuple[int, int]],
+    *,
+    checked_at: Optional[datetime] = None,
+    fetch_item_ids: Iterable[int] = (),
+) -> Dict[int, PriceHistory]:
+    """
+    (item_id, price) 목록을 price_history에 다중 행 INSERT 1번으로 저장한다.
+    fetch_item_ids에 준 상품들은 방금 저장한 PriceHistory 객체를 다시 읽어서 돌려준다
+    (알림 판별에 ph.id가 필요할 때만; MySQL은 다중 INSERT의 id를 돌려주지 않으므로).
+    다시 읽을 때는 INSERT 전 MAX(id)보다 큰 id 중 상품별 가장 큰 것을 쓴다.
+    checked_at으로 찾으면 안 된다: MySQL DATETIME(0)은 초 미만을 반올림해서 저장하므로 같은 값이 안 나온다.
+    Return: {item_id: PriceHistory}
+    """
+    if checked_at is None:
+        checked_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    rows = [{"item_id": item_id, "price": price, "checked_at": checked_at} for item_id, price in prices]
+    if not rows:
+        return {}
+
+    fetch_ids = list(fetch_item_ids)
+    max_id_before = 0
+    if fetch_ids:
+        max_id_before = db.execute(select(func.max(PriceHistory.id))).scalar() or 0
+
+    db.execute(insert(PriceHistory), rows)
+    record_daily_min(db, ((r["item_id"], r["price"]) for r in rows), checked_at=checked_at)
+
+    if not fetch_ids:
+        return {}
+
+    latest_ids = (
+        select(func.max(PriceHistory.id))
+        .where(PriceHistory.item_id.in_(fetch_ids), PriceHistory.id > max_id_before)
+        .group_by(PriceHistory.item_id)
+    )
+    return {
+        ph.item_id: ph
+        for ph in db.execute(select(PriceHistory).where(PriceHistory.id.in_(latest_ids))).scalars()
+    }
+
+
+def bulk_update_item_prices(
+    db: Session,
+    updates: Dict[int, Dict[str, Any]],
+    *,
+    touched_ids: Iterable[int] = (),
+    checked_at: Optional[datetime] = None,
+) -> None:
+    """
+    - updates: {item_id: {"last_seen_price": .., "min_price": ..}} -> 가격 변동 상품 (UPDATE ... CASE 1번)
+    - touched_ids: 가격 변동 없이 last_checked_at만 갱신할 상품 (UPDATE 1번)
+    """
+    if checked_at is None:
+        checked_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    if updates:
+        ids = list(updates)
+        db.execute(
+            update(Item)
+            .where(Item.id.in_(ids))
+            .values(
+                last_seen_price=case(
+                    {i: updates[i]["last_seen_price"] for i in ids}, value=Item.id
+                ),
+                min_price=case(
+                    {i: updates[i]["min_price"] for i in ids}, value=Item.id
+                ),
+                last_checked_at=checked_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    touched = list(touched_ids)
+    if touched:
+        db.execute(
+            update(Item)
+            .where(Item.id.in_(touched))
+            .values(last_checked_at=checked_at)
+            .execution_options(synchronize_session=False)
+        )
 # crud.py
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
@@ -131,7 +492,11 @@ def add_to_wishlist(db, *, user_id: int, item_id: int) -> Wishlist:
             .filter(Wishlist.user_id == user_id, Wishlist.item_id == item_id)
             .first()
         )
+        if existing is None:
+            # 중복이 아니면 FK 위반: 토큰만 확인하는 라우트라 삭제된 유저(또는 방금 지워진 상품)일 수 있다
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User or item no longer exists")
         return existing
 
     db.refresh(w)
+    invalidate_wishlist_count(user_id)
     return w
\ No newline at end of file
@@ -0,0 +1,124 @@
+# crud_async.py
+"""
+crud.py의 AsyncSession 버전 (settings.DB_ASYNC_ENABLED일 때 요청 핸들러가 쓴다).
+SQL 문장은 services 모듈(wishlist_listing 등)의 것을 그대로 재사용하고, 실행만 await로 한다.
+가격 기록/수집 쓰기는 스케줄러 job(동기 Session)만 하므로 여기에는 없다.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from models import Item, User, Wishlist
+from services.wishlist_listing import (
+    cached_count,
+    count_statement,
+    invalidate_wishlist_count,
+    page_statement,
+    split_page,
+    store_count,
+)
+
+
+# users
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.get(User, user_id)
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+
+async def create_user(db: AsyncSession, *, email: str, password_hash: str) -> User:
+    user = User(email=email, password_hash=password_hash)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+# wishlist
+async def add_to_wishlist(db: AsyncSession, *, user_id: int, item_id: int) -> Wishlist:
+    if await db.get(Item, item_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
+
+    w = Wishlist(user_id=user_id, item_id=item_id, is_active=1)
+    db.add(w)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        existing = (
+            await db.execute(
+                select(Wishlist).where(Wishlist.user_id == user_id, Wishlist.item_id == item_id)
+            )
+        ).scalars().first()
+        if existing is None:
+            # 중복이 아니면 FK 위반: 토큰만 확인하는 라우트라 삭제된 유저(또는 방금 지워진 상품)일 수 있다
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User or item no longer exists")
+        return existing
+
+    await db.refresh(w)
+    invalidate_wishlist_count(user_id)
+    return w
+
+
+async def remove_from_wishlist(db: AsyncSession, *, user_id: int, item_id: int) -> models.Wishlist:
+    w = (
+        await db.execute(
+            select(Wishlist).where(
+                Wishlist.user_id == user_id,
+                Wishlist.item_id == item_id,
+                Wishlist.is_active == 1,
+            )
+        )
+    ).scalars().first()
+    if not w:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Wishlist item not found")
+
+    w.is_active = 0
+    await db.commit()
+    await db.refresh(w)
+    return w
+
+
+async def hard_remove_from_wishlist(db: AsyncSession, *, user_id: int, item_id: int) -> None:
+    w = (
+        await db.execute(
+            select(Wishlist).where(Wishlist.user_id == user_id, Wishlist.item_id == item_id)
+        )
+    ).scalars().first()
+    if not w:
+        raise HTTPException(status_code=404, detail="Wishlist item not found")
+
+    await db.delete(w)
+    await db.commit()
+
+    invalidate_wishlist_count(user_id)
+
+
+async def list_wishlist_page(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    sort: str,
+    display: int,
+    start: int = 1,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Wishlist], Optional[str]]:
+    stmt = page_statement(user_id=user_id, sort=sort, display=display, start=start, cursor=cursor)
+    rows = (await db.execute(stmt)).scalars().all()
+    return split_page(rows, sort=sort, display=display)
+
+
+async def count_wishlist(db: AsyncSession, user_id: int) -> int:
+    total = cached_count(user_id)
+    if total is None:
+        total = int(await db.scalar(count_statement(user_id)) or 0)
+        store_count(user_id, total)
+    return total
@@ -1,7 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 import os
+import threading
+import time
+
+from settings import settings
+from services.metrics import record_db_query, registry
+from services.sql_profiler import record_query
 
 DB_USER = os.getenv("DB_USER")
 DB_PASS = os.getenv("DB_PASS")
@@ -11,18 +18,316 @@ DB_NAME = os.getenv("DB_NAME")
 
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
 
-engine = create_engine(
+
+# ---------------------------------------------------------
+# 커넥션 풀 지표
+# - checkouts/checkins/connects/invalidations: 풀 이벤트 횟수
+# - waits: 커넥션을 바로 못 받고 기다린 횟수(1ms 초과)와 누적/최대 대기 시간
+# - timeouts: pool_timeout 안에 커넥션을 못 받은 횟수
+# - pings/ping_failures: idle pre-ping 전략에서 보낸 ping과 끊긴 커넥션 수
+# ---------------------------------------------------------
+WAIT_THRESHOLD_SECONDS = 0.001
+
+
+class PoolMetrics:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def incr(self, field: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def record_wait(self, seconds: float) -> None:
+        if seconds <= WAIT_THRESHOLD_SECONDS:
+            return
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "waits": self.waits,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "timeouts": self.timeouts,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """커넥션을 얻기까지 기다린 시간과 타임아웃을 재는 QueuePool."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - t0)
+
+    def recreate(self):
+        # engine.dispose() 등으로 풀을 새로 만들어도 지표는 이어서 센다
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+def _install_pool_events(engine, metrics: PoolMetrics, *, pre_ping: str, ping_idle_seconds: float) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        metrics.incr("connects")
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        metrics.incr("checkouts")
+        if pre_ping != "idle":
+            return
+
+        idle = time.monotonic() - record.info.get("checked_in_at", 0.0)
+        if idle < ping_idle_seconds:
+            return
+
+        # 오래 쉰 커넥션만 ping. 끊겼으면 DisconnectionError로 풀이 새 커넥션을 다시 받게 한다.
+        metrics.incr("pings")
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            metrics.incr("ping_failures")
+            raise exc.DisconnectionError() from e
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        metrics.incr("checkins")
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception):
+        metrics.incr("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_conn, record, exception):
+        metrics.incr("invalidations")
+
+
+def install_query_metrics(engine, name: str) -> None:
+    """
+    쿼리 수/시간을 services/metrics(GET /metrics의 db_*)와 services/sql_profiler에 기록한다.
+    AsyncEngine이면 .sync_engine을 넘긴다.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            elapsed = time.perf_counter() - started
+            record_db_query(name, elapsed)
+            record_query(statement, elapsed)
+
+
+def _check_pre_ping(pre_ping: str) -> None:
+    if pre_ping not in ("always", "idle", "never"):
+        raise ValueError(f"DB_POOL_PRE_PING must be always, idle or never (got {pre_ping!r})")
+
+
+def build_engine(
+    url: str,
+    *,
+    name: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: float,
+    pool_recycle: int = settings.DB_POOL_RECYCLE,
+    pre_ping: str = settings.DB_POOL_PRE_PING,
+    ping_idle_seconds: float = settings.DB_POOL_PING_IDLE_SECONDS,
+):
+    _check_pre_ping(pre_ping)
+
+    new_engine = create_engine(
+        url,
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pre_ping == "always",
+    )
+    metrics = PoolMetrics(name)
+    new_engine.pool.metrics = metrics
+    _install_pool_events(new_engine, metrics, pre_ping=pre_ping, ping_idle_seconds=ping_idle_seconds)
+    install_query_metrics(new_engine, name)
+    return new_engine
+
+
+# API 요청용
+engine = build_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=1800,
+    name="api",
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
+
+# 스케줄러 job용 (작고 고정된 풀: 배치가 몰려도 API 풀은 그대로)
+job_engine = build_engine(
+    DATABASE_URL,
+    name="jobs",
+    pool_size=settings.DB_JOB_POOL_SIZE,
+    max_overflow=settings.DB_JOB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_JOB_POOL_TIMEOUT,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+JobSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=job_engine)
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        print("Closing database connection")
         db.close()
+
+
+def pool_stats() -> dict:
+    """엔진별 현재 풀 상태 + 누적 지표."""
+    stats = {}
+    for e in (engine, job_engine):
+        pool = e.pool
+        stats[pool.metrics.name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+            **pool.metrics.snapshot(),
+        }
+    return stats
+
+
+def _pool_metric_families():
+    # GET /metrics용: pool_stats()를 gauge/counter로
+    stats = pool_stats()
+    gauges = ("size", "checked_out", "overflow")
+    counters = ("checkouts", "connects", "invalidations", "waits", "wait_seconds_total", "timeouts")
+    for key in gauges:
+        yield (f"db_pool_{key}", f"Connection pool {key.replace('_', ' ')}.", "gauge",
+               [({"pool": name}, s[key]) for name, s in stats.items()])
+    for key in counters:
+        metric = key if key.endswith("_total") else f"{key}_total"
+        yield (f"db_pool_{metric}", f"Connection pool {key.replace('_', ' ')}.", "counter",
+               [({"pool": name}, s[key]) for name, s in stats.items()])
+
+
+registry.add_collector(_pool_metric_families)
+
+
+# ---------------------------------------------------------
+# 비동기 엔진 (선택)
+# - settings.DB_ASYNC_ENABLED일 때만 라우터에서 쓴다. 처음 쓸 때 만든다.
+# - 드라이버(aiomysql / asyncmy / aiosqlite)는 설치되어 있어야 한다.
+# ---------------------------------------------------------
+_async_engine = None
+_AsyncSessionLocal = None
+_async_engine_lock = threading.Lock()
+
+
+def async_database_url() -> str:
+    if settings.DB_ASYNC_URL:
+        return settings.DB_ASYNC_URL
+    return (
+        f"mysql+{settings.DB_ASYNC_DRIVER}://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+        "?charset=utf8mb4"
+    )
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        return _async_engine
+
+    # 첫 요청 여러 개가 동시에 들어와도 엔진(커넥션 풀)은 하나만 만든다
+    with _async_engine_lock:
+        if _async_engine is None:
+            _async_engine, _AsyncSessionLocal = _build_async_engine()
+    return _async_engine
+
+
+def _build_async_engine(
+    *,
+    pre_ping: str = settings.DB_POOL_PRE_PING,
+    ping_idle_seconds: float = settings.DB_POOL_PING_IDLE_SECONDS,
+):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    # 동기 엔진과 같은 DB_POOL_PRE_PING 전략을 쓴다.
+    # idle ping은 풀 이벤트에서 SELECT 1을 보내며, async 드라이버의 어댑터 커넥션도 동기 cursor API를 준다.
+    _check_pre_ping(pre_ping)
+    url = async_database_url()
+    if url.startswith("sqlite"):
+        # SQLite(aiosqlite)는 QueuePool 옵션을 받지 않는다 (로컬 테스트용)
+        new_engine = create_async_engine(url, pool_pre_ping=pre_ping == "always")
+    else:
+        new_engine = create_async_engine(
+            url,
+            pool_size=settings.DB_ASYNC_POOL_SIZE,
+            max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+            pool_timeout=settings.DB_ASYNC_POOL_TIMEOUT,
+            pool_recycle=settings.DB_ASYNC_POOL_RECYCLE,
+            pool_pre_ping=pre_ping == "always",
+        )
+    metrics = PoolMetrics("async")
+    _install_pool_events(new_engine.sync_engine, metrics, pre_ping=pre_ping, ping_idle_seconds=ping_idle_seconds)
+    install_query_metrics(new_engine.sync_engine, "async")
+    session_factory = async_sessionmaker(new_engine, autoflush=False, expire_on_commit=False)
+    return new_engine, session_factory
+
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal
+    with _async_engine_lock:
+        old, _async_engine, _AsyncSessionLocal = _async_engine, None, None
+    if old is not None:
+        await old.dispose()
@@ -7,97 +7,331 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from database import SessionLocal
-from services.shopping_service import (
-     refresh_wishlist_prices,
-     collect_items_pages)
-from services.naver_shopping_client import KEYBOARD_CATEGORY_ID
+from database import JobSessionLocal
+from services.collect_pipeline import format_stages, last_run as last_collect_run
+from services.collect_targets import CollectTarget, TargetCollector, parse_targets
+from services.refresh_scheduler import REFRESH_TICK_MINUTES, refresh_scheduler
+from services.lowest_price import LOWEST_PRICE_REFRESH_MINUTES, lowest_price_service
+from services.naver_shopping_client import (
+    AsyncNaverShoppingClient,
+    KEYBOARD_CATEGORY_ID,
+    close_sync_client,
+)
+
+from crud import prune_daily_min
+from services.price_rollup import (
+    PRICE_HISTORY_RETENTION_DAYS,
+    compact_price_history,
+    rollup_price_history,
+)
+
+from database import dispose_async_engine
+from settings import settings
+from services.password_hasher import password_hasher
+from services.job_lease import JobCoordinator
+from services.metrics import MetricsMiddleware, job_run
+from services.sql_profiler import SqlProfileMiddleware
+from services.warmup import startup_warmup
 
-from routers.auth import router as auth_router
 from routers.shopping_alert import router as shopping_alert_router
-from routers.wishlist_ref import router as wishlist_ref_router
 from routers.products import router as products_router
-from routers.alerts import router as alerts_router
 from routers.demo import router as demo_router
+from routers.items import router as items_router
+from routers.health import router as health_router
+from routers.metrics import router as metrics_router
+
+# DB_ASYNC_ENABLED면 auth/wishlist/alerts는 AsyncSession 버전 라우터를 쓴다
+if settings.DB_ASYNC_ENABLED:
+    from routers.auth_async import router as auth_router
+    from routers.wishlist_async import router as wishlist_ref_router
+    from routers.alerts_async import router as alerts_router
+else:
+    from routers.auth import router as auth_router
+    from routers.wishlist_ref import router as wishlist_ref_router
+    from routers.alerts import router as alerts_router
 
-scheduler = BackgroundScheduler(timezone="Asia/Seoul")
+# 같은 job이 밀려서 여러 번 쌓이면 한 번만, 이전 실행이 안 끝났으면 이번 tick은 건너뜀
+scheduler = BackgroundScheduler(
+    timezone="Asia/Seoul",
+    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 60},
+)
+
+# 워커가 여러 개여도 DB/네이버를 쓰는 job은 리더 워커 한 곳에서만 실행 (services/job_lease.py)
+coordinator = JobCoordinator(JobSessionLocal)
 
 # 수집(아이템 채우기) 설정
+# - COLLECT_TARGETS(JSON 목록)가 있으면 그 대상들을 수집 (services/collect_targets.py)
+# - 없으면 COLLECT_QUERY 하나를 매분 COLLECT_TOTAL_PER_RUN개
 COLLECT_QUERY = os.getenv("COLLECT_QUERY", "기계식 키보드")
-COLLECT_TOTAL_PER_RUN = int(os.getenv("COLLECT_TOTAL_PER_RUN", "100"))  # 10분마다 목표 수집 개수
+COLLECT_TOTAL_PER_RUN = int(os.getenv("COLLECT_TOTAL_PER_RUN", "100"))  # 1회(매분) 목표 수집 개수
 COLLECT_PAGE_SIZE = int(os.getenv("COLLECT_PAGE_SIZE", "50"))          # 호출 1회당 display(1~100)
+COLLECT_TARGETS = os.getenv("COLLECT_TARGETS", "").strip()
 
-
-def job_collect_items():
-    db = SessionLocal()
-    try:
-        saved = collect_items_pages(
-            db,
+if COLLECT_TARGETS:
+    collect_targets = parse_targets(COLLECT_TARGETS, page_size=COLLECT_PAGE_SIZE)
+else:
+    collect_targets = [
+        CollectTarget(
+            name="default",
             query=COLLECT_QUERY,
             category=KEYBOARD_CATEGORY_ID,
             total=COLLECT_TOTAL_PER_RUN,
-            page_size=COLLECT_PAGE_SIZE,
             sort="sim",
-            strict=False,
+            interval_minutes=1,
+            page_size=COLLECT_PAGE_SIZE,
         )
-        print(f"[collector] collected {saved} items (query={COLLECT_QUERY!r})")
+    ]
+target_collector = TargetCollector(collect_targets)
+
+# 네이버 API 동시 요청 수 (수집/갱신 배치가 공유하는 커넥션 풀)
+NAVER_MAX_IN_FLIGHT = int(os.getenv("NAVER_MAX_IN_FLIGHT", "4"))
+
+naver_client = AsyncNaverShoppingClient(max_in_flight=NAVER_MAX_IN_FLIGHT)
+
+# 배치 호출을 job 시작 시점에 몰아서 보내지 않고 이 시간(초) 동안 나눠서 보낸다
+COLLECT_SPREAD_SECONDS = float(os.getenv("COLLECT_SPREAD_SECONDS", "30"))   # 수집 주기 1분
+REFRESH_SPREAD_SECONDS = float(os.getenv("REFRESH_SPREAD_SECONDS", "60"))   # 갱신 tick 2분
+
+
+# collect_items/refresh_prices는 실패를 예외로 올린다 (warm-up 단계에서 그대로 씀).
+# 스케줄러에 거는 job_* 함수는 예외를 로그로만 남긴다.
+def collect_items(spread: bool = True):
+    db = JobSessionLocal()
+    try:
+        with job_run("item_collect") as job:
+            tick = target_collector.run_tick(
+                db,
+                client=naver_client,
+                spread_over=COLLECT_SPREAD_SECONDS if spread else None,
+            )
+            job.items = tick.saved
+    finally:
+        db.close()
+    if tick.targets == 0:
+        return
+    run = last_collect_run()
+    stages = f" stages(busy/idle/blocked s): {format_stages(run['stages'])}" if run is not None else ""
+    print(f"[collector] collected {tick.saved} items from {tick.targets} targets with {tick.calls} calls "
+          f"({tick.duplicates} duplicates, {tick.completed} sweeps done, {tick.errors} failed){stages}")
+
+
+def job_collect_items(spread: bool = True):
+    try:
+        collect_items(spread)
     except Exception as e:
         print("[collector] error:", repr(e))
+
+
+def refresh_prices(spread: bool = True):
+    """
+    우선순위 가격 갱신 1 tick (services/refresh_scheduler.py)
+    - 확인 시각이 지난 상품만, 시간당 호출 예산(REFRESH_CALLS_PER_HOUR) 안에서 갱신
+    """
+    db = JobSessionLocal()
+    try:
+        with job_run("price_refresh") as job:
+            tick = refresh_scheduler.run_tick(
+                db,
+                client=naver_client,
+                spread_over=REFRESH_SPREAD_SECONDS if spread else None,
+            )
+            job.items = tick.updated
     finally:
         db.close()
+    print(f"[scheduler] refreshed {tick.updated}/{tick.selected} items "
+          f"with {tick.calls} calls ({tick.due} due)")
 
 
-def job_refresh_prices():
+def job_refresh_prices(spread: bool = True):
+    try:
+        refresh_prices(spread)
+    except Exception as e:
+        print("[scheduler] error:", repr(e))
+
+
+def job_refresh_lowest_prices(spread: bool = True):
     """
-    (선택) wishlist 기반 가격 갱신 배치
-    - wishlist 미구현이면 updated=0이어도 정상
+    최근 요청된 상품의 최저가 스냅샷을 만료 전에 갱신 (services/lowest_price.py)
+    - GET /products/{item_id}/lowest-price가 요청 경로에서 네이버를 검색하지 않게
     """
-    db = SessionLocal()
+    db = JobSessionLocal()
     try:
-        updated = refresh_wishlist_prices(db)
-        print(f"[scheduler] refreshed {updated} items")
+        with job_run("lowest_price_refresh") as job:
+            refreshed = lowest_price_service.refresh_due(
+                db,
+                client=naver_client,
+                spread_over=REFRESH_SPREAD_SECONDS if spread else None,
+            )
+            job.items = refreshed
+        if refreshed:
+            print(f"[lowest-price] refreshed {refreshed} snapshots")
     except Exception as e:
-        print("[scheduler] error:", repr(e))
+        print("[lowest-price] error:", repr(e))
+    finally:
+        db.close()
+
+
+def job_prune_daily_min():
+    # 7일 최저가 윈도우를 벗어난 하루 최저가 행 정리
+    db = JobSessionLocal()
+    try:
+        with job_run("daily_min_prune") as job:
+            deleted = job.items = prune_daily_min(db)
+            db.commit()
+        print(f"[daily-min] pruned {deleted} rows")
+    except Exception as e:
+        print("[daily-min] error:", repr(e))
+    finally:
+        db.close()
+
+
+# price_history 롤업/보관 정책
+ROLLUP_INTERVAL_MINUTES = int(os.getenv("ROLLUP_INTERVAL_MINUTES", "10"))
+
+
+def job_rollup_prices():
+    db = JobSessionLocal()
+    try:
+        with job_run("price_rollup") as job:
+            rolled = job.items = rollup_price_history(db)
+        print(f"[rollup] rolled up {rolled} price_history rows")
+    except Exception as e:
+        print("[rollup] error:", repr(e))
     finally:
         db.close()
 
 
+def job_compact_prices():
+    db = JobSessionLocal()
+    try:
+        with job_run("price_compaction") as job:
+            deleted = job.items = compact_price_history(db, retain_days=PRICE_HISTORY_RETENTION_DAYS)
+        print(f"[compaction] deleted {deleted} raw price_history rows "
+              f"older than {PRICE_HISTORY_RETENTION_DAYS} days")
+    except Exception as e:
+        print("[compaction] error:", repr(e))
+    finally:
+        db.close()
+
+
+# 서버 시작 직후 작업
+# - background(기본): lifespan은 바로 끝나고 요청을 받으면서 뒤에서 실행. 진행 상황은 GET /health/ready
+# - blocking: 전부 끝난 뒤에 요청을 받기 시작 (이전 동작)
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background")
+
+
+def _warmup_lease():
+    return "leader" if coordinator.heartbeat() else "follower"
+
+
+def _warmup_leader_job(name, fn):
+    def run():
+        if not coordinator.is_leader():
+            return "skipped: not the scheduler leader"
+        coordinator.run_exclusive(name, fn, spread=False)
+    return run
+
+
+# ✅ 리더 임대를 먼저 시도 (먼저 뜬 워커가 리더)
+startup_warmup.add("scheduler_lease", _warmup_lease)
+# ✅ 서버 시작 시 1회 수집 / 갱신 (리더만, 실패하면 단계 상태가 failed)
+startup_warmup.add("item_collect", _warmup_leader_job("item_collect", collect_items))
+startup_warmup.add("price_refresh", _warmup_leader_job("price_refresh", refresh_prices))
+# 비밀번호 해싱 워커 프로세스를 미리 띄움
+startup_warmup.add("password_hasher", password_hasher.warm_up)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # ✅ 서버 시작 시 1회 수집
-    job_collect_items()
-
-    # ✅ 서버 시작 시 1회 갱신(원하면 유지)
-    job_refresh_prices()
+    scheduler.add_job(
+        coordinator.heartbeat,
+        "interval",
+        seconds=coordinator.heartbeat_seconds,
+        id="lease_heartbeat",
+        replace_existing=True,
+    )
 
-    # ✅ 이후 10분마다 수집
+    # ✅ 이후 매분 수집 tick (대상별 interval_minutes가 된 것만 수집, services/collect_targets.py)
     scheduler.add_job(
-        job_collect_items,
+        coordinator.job("item_collect", job_collect_items),
         "interval",
         minutes=1,
         id="item_collect",
         replace_existing=True,
     )
 
-    # ✅ 이후 10분마다 wishlist 갱신(원하면 유지)
+    # ✅ 이후 REFRESH_TICK_MINUTES(기본 2분)마다 갱신 예산만큼씩
     scheduler.add_job(
-        job_refresh_prices,
+        coordinator.job("price_refresh", job_refresh_prices),
         "interval",
-        minutes=10,
+        minutes=REFRESH_TICK_MINUTES,
         id="price_refresh",
         replace_existing=True,
     )
 
+    scheduler.add_job(
+        coordinator.job("lowest_price_refresh", job_refresh_lowest_prices),
+        "interval",
+        minutes=LOWEST_PRICE_REFRESH_MINUTES,
+        id="lowest_price_refresh",
+        replace_existing=True,
+    )
+
+    scheduler.add_job(
+        coordinator.job("daily_min_prune", job_prune_daily_min),
+        "cron",
+        hour=0,
+        minute=30,
+        id="daily_min_prune",
+        replace_existing=True,
+    )
+
+    scheduler.add_job(
+        coordinator.job("price_rollup", job_rollup_prices),
+        "interval",
+        minutes=ROLLUP_INTERVAL_MINUTES,
+        id="price_rollup",
+        replace_existing=True,
+    )
+
+    scheduler.add_job(
+        coordinator.job("price_compaction", job_compact_prices),
+        "cron",
+        hour=3,
+        minute=0,
+        id="price_compaction",
+        replace_existing=True,
+    )
+
     scheduler.start()
-    print("[scheduler] started (every 10 minutes)")
+    print(
+        f"[scheduler] started (collect tick every 1 min, refresh every {REFRESH_TICK_MINUTES} min, "
+        f"rollup every {ROLLUP_INTERVAL_MINUTES} min)"
+    )
+
+    if STARTUP_WARMUP == "blocking":
+        startup_warmup.run()
+    else:
+        startup_warmup.start_background()
 
     yield
 
+    startup_warmup.stop()
     scheduler.shutdown()
+    coordinator.resign()
     print("[scheduler] stopped")
 
+    naver_client.close()
+    close_sync_client()
+    password_hasher.shutdown()
+    await dispose_async_engine()
+
 
 app = FastAPI(lifespan=lifespan)
+# 라우트별 지연 시간 / 요청당 DB 쿼리 수 (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+# SQL_PROFILE=header|all이면 요청별 쿼리 수/반복 문장 (N+1) 프로파일
+app.add_middleware(SqlProfileMiddleware)
 
 app.include_router(auth_router)
 app.include_router(shopping_alert_router)
@@ -105,3 +339,6 @@ app.include_router(wishlist_ref_router)
 app.include_router(alerts_router)
 app.include_router(products_router)
 app.include_router(demo_router)
+app.include_router(items_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
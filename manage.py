@@ -0,0 +1,81 @@
+# manage.py
+"""
+운영용 명령 모음.
+
+python manage.py backfill-daily-min [--days 8]
+python manage.py rollup-prices
+python manage.py compact-prices --retain-days 90
+"""
+from __future__ import annotations
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import argparse
+import sys
+from typing import List, Optional
+
+from database import SessionLocal
+
+
+def cmd_backfill_daily_min(args: argparse.Namespace) -> int:
+    from crud import backfill_daily_min
+
+    db = SessionLocal()
+    try:
+        rows = backfill_daily_min(db, days=args.days)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"[backfill] price_daily_min rebuilt: {rows} rows (last {args.days} days)")
+    return 0
+
+
+def cmd_rollup_prices(args: argparse.Namespace) -> int:
+    from services.price_rollup import rollup_price_history
+
+    db = SessionLocal()
+    try:
+        rows = rollup_price_history(db)
+    finally:
+        db.close()
+
+    print(f"[rollup] rolled up {rows} price_history rows")
+    return 0
+
+
+def cmd_compact_prices(args: argparse.Namespace) -> int:
+    from services.price_rollup import compact_price_history
+
+    db = SessionLocal()
+    try:
+        deleted = compact_price_history(db, retain_days=args.retain_days)
+    finally:
+        db.close()
+
+    print(f"[compaction] deleted {deleted} raw price_history rows older than {args.retain_days} days")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="low-price-tracker management commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("backfill-daily-min", help="price_history로 price_daily_min(하루 최저가) 재구성")
+    p.add_argument("--days", type=int, default=8, help="재구성할 최근 일수 (기본 8 = 7일 윈도우 + 경계일)")
+    p.set_defaults(func=cmd_backfill_daily_min)
+
+    p = sub.add_parser("rollup-prices", help="price_history를 시간/일 롤업 테이블에 반영")
+    p.set_defaults(func=cmd_rollup_prices)
+
+    p = sub.add_parser("compact-prices", help="보관 기간이 지난 원본 price_history를 롤업만 남기고 삭제")
+    p.add_argument("--retain-days", type=int, required=True)
+    p.set_defaults(func=cmd_compact_prices)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 
 from sqlalchemy import (
+    Date,
     DateTime,
     String,
     ForeignKey,
@@ -15,11 +16,20 @@ from sqlalchemy import (
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.mysql import BIGINT, INTEGER, TINYINT
+from sqlalchemy.ext.compiler import compiles
 
 
 class Base(DeclarativeBase):
     pass
 
+
+# 로컬 테스트/벤치마크용 SQLite에서도 같은 모델로 테이블을 만들 수 있게
+# MySQL 전용 정수 타입을 INTEGER로 렌더링한다 (INTEGER PRIMARY KEY -> autoincrement)
+@compiles(BIGINT, "sqlite")
+@compiles(TINYINT, "sqlite")
+def _compile_mysql_int_for_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
 # users
 class User(Base):
     __tablename__ = "users"
@@ -116,6 +126,7 @@ class Wishlist(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "item_id", name="uq_wishlist_user_item"),
         Index("ix_wishlist_user", "user_id"),
+        Index("ix_wishlist_user_created", "user_id", "created_at"),  # GET /wishlist 기본 정렬(date) keyset
         Index("ix_wishlist_item", "item_id"),
     )
 
@@ -143,6 +154,114 @@ class PriceHistory(Base):
     )
 
 
+# price_daily_min (상품별 하루 최저가)
+# - items.min_price(최근 7일 최저가)를 price_history 범위 스캔 없이 계산하기 위한 롤업
+# - price_history INSERT 때 같이 갱신되고, 윈도우(8일)를 벗어난 행은 정리 job이 지운다
+class PriceDailyMin(Base):
+    __tablename__ = "price_daily_min"
+
+    item_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("items.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    min_price: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_pdm_day", "day"),
+    )
+
+
+# price_rollup_hourly / price_rollup_daily (상품별 시간/일 단위 가격 요약)
+# - price_history를 다운샘플링한 OHLC(+최저/최고/건수). 분석/차트는 원본 대신 이 테이블을 읽는다.
+# - 스케줄러 job이 price_history.id 워터마크 이후 행만 읽어서 점진적으로 갱신한다.
+class PriceRollupMixin:
+    item_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("items.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+    open_price: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+    high_price: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+    low_price: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+    close_price: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+    sample_count: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+
+    first_ph_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+    last_ph_id: Mapped[int] = mapped_column(BIGINT(unsigned=True), nullable=False)
+
+
+class PriceRollupHourly(PriceRollupMixin, Base):
+    __tablename__ = "price_rollup_hourly"
+
+
+class PriceRollupDaily(PriceRollupMixin, Base):
+    __tablename__ = "price_rollup_daily"
+
+
+# lowest_price_snapshot (GET /products/{item_id}/lowest-price 응답을 상품별로 저장해 두고 재사용)
+class LowestPriceSnapshot(Base):
+    __tablename__ = "lowest_price_snapshot"
+
+    item_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey("items.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    price: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+    mall_name: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    product_url: Mapped[Optional[str]] = mapped_column(String(1000), nullable=True)
+    checked_count: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+    matched_count: Mapped[int] = mapped_column(INTEGER(unsigned=True), nullable=False)
+    checked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    requested_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_lps_requested_checked", "requested_at", "checked_at"),  # 갱신 job 대상 찾기
+    )
+
+
+# rollup_state (배치 job 진행 위치)
+class RollupState(Base):
+    __tablename__ = "rollup_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_ph_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True), nullable=False, server_default=text("0")
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+# scheduler_lease (여러 워커 중 한 곳에서만 배치 job을 돌리기 위한 임대)
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_lease"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(128), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    acquired_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+# collect_progress (수집 대상별 진행 위치; 큰 수집 범위를 여러 tick에 나눠서 이어 간다)
+class CollectProgress(Base):
+    __tablename__ = "collect_progress"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    next_start: Mapped[int] = mapped_column(
+        INTEGER(unsigned=True), nullable=False, server_default=text("1")
+    )
+    sweep_started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    sweep_items: Mapped[int] = mapped_column(
+        INTEGER(unsigned=True), nullable=False, server_default=text("0")
+    )
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_swept_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+
 # alerts
 AlertTypeEnum = Enum("TARGET_PRICE", "DROP_FROM_PREV", "NEW_LOW", name="alert_type")
 
@@ -0,0 +1,60 @@
+# routers/alerts_async.py
+# routers/alerts.py와 같은 엔드포인트의 AsyncSession 버전 (settings.DB_ASYNC_ENABLED일 때 main.py가 등록)
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db
+import models
+import schemas
+
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+
+@router.post("", response_model=schemas.AlertOut, status_code=status.HTTP_201_CREATED)
+async def create_alert(payload: schemas.AlertCreate, db: AsyncSession = Depends(get_async_db)):
+    w = await db.get(models.Wishlist, payload.wishlist_id)
+    if not w:
+        raise HTTPException(status_code=404, detail="Wishlist not found")
+
+    if payload.alert_type == "TARGET_PRICE" and payload.target_price is None:
+        raise HTTPException(status_code=400, detail="target_price is required for TARGET_PRICE")
+
+    a = models.Alert(
+        wishlist_id=payload.wishlist_id,
+        alert_type=payload.alert_type,
+        target_price=payload.target_price,
+        is_enabled=1,
+    )
+    db.add(a)
+    await db.commit()
+    await db.refresh(a)
+    return a
+
+
+@router.get("", response_model=list[schemas.AlertOut])
+async def list_alerts(
+    wishlist_id: int = Query(..., description="wishlist PK"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = await db.execute(select(models.Alert).where(models.Alert.wishlist_id == wishlist_id))
+    return rows.scalars().all()
+
+
+@router.patch("/{alert_id}", response_model=schemas.AlertOut)
+async def toggle_alert(
+    alert_id: int,
+    payload: schemas.AlertToggle,
+    db: AsyncSession = Depends(get_async_db),
+):
+    a = await db.get(models.Alert, alert_id)
+    if not a:
+        raise HTTPException(status_code=404, detail="Alert not found")
+
+    if payload.is_enabled not in (0, 1):
+        raise HTTPException(status_code=400, detail="is_enabled must be 0 or 1")
+
+    a.is_enabled = payload.is_enabled
+    await db.commit()
+    await db.refresh(a)
+    return a
@@ -1,15 +1,23 @@
 import os
 from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from jose import JWTError, jwt, ExpiredSignatureError
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models import User
 from schemas import TokenOut, UserCreate, UserOut
+from services.password_hasher import (
+    PasswordHasherBusy,
+    hash_password_sync,
+    password_hasher,
+    verify_password_sync,
+)
+from services.user_cache import cached_user, store_user
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
@@ -23,15 +31,35 @@ if not ALGORITHM:
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 # password helpers
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+# 현재 프로세스에서 바로 계산 (스크립트/관리 명령용)
+hash_password = hash_password_sync
+verify_password = verify_password_sync
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many password checks in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+# 요청 처리용: 해싱 전용 프로세스 풀에서 계산하고, 풀이 가득 찼거나 제한 시간을 넘기면 503
+# (PasswordHasherTimeout은 PasswordHasherBusy의 하위 클래스)
+async def hash_password_async(password: str) -> str:
+    try:
+        return await password_hasher.hash_async(password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    try:
+        return await password_hasher.verify_async(password, hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
 
 
 # token helpers
@@ -72,50 +100,91 @@ def decode_token(token: str) -> dict:
 
 
 # current user dependency
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+class Principal(NamedTuple):
+    """토큰에서 꺼낸 로그인 유저 (DB 조회 없음)."""
+    id: int
+
+
+def access_token_user_id(token: str) -> int:
     payload = decode_token(token)
 
     user_id = payload.get("sub")
     typ = payload.get("typ")
     if not user_id or typ != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return int(user_id)
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    # current_user.id만 필요한 라우트용. 서명/만료만 확인하고 users 테이블은 보지 않는다.
+    # (삭제된 유저의 토큰도 만료 전까지는 통과한다)
+    return Principal(id=access_token_user_id(token))
+
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    user_id = access_token_user_id(token)
+
+    user = cached_user(user_id)
+    if user is not None:
+        # SELECT 없이 세션에 붙인다 (relationship lazy load 등은 그대로 동작)
+        return db.merge(user, load=False)
+
+    user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    store_user(user)
     return user
 
 
 # endpoints
-@router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def signup(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+# signup/login은 async로 두고 DB 작업만 스레드풀에서 돌린다.
+# 해싱을 기다리는 동안에는 스레드풀 슬롯도 DB 커넥션도 잡고 있지 않다.
+def _email_registered(db: Session, email: str) -> bool:
+    try:
+        return db.query(User.id).filter(User.email == email).first() is not None
+    finally:
+        db.close()  # 해싱하는 동안 커넥션을 풀에 돌려둔다
 
-    user = User(
-        email=payload.email,
-        password_hash=hash_password(payload.password)
-    )
+
+def _create_user(db: Session, email: str, password_hash: str) -> User:
+    user = User(email=email, password_hash=password_hash)
     db.add(user)
     db.commit()
     db.refresh(user)
     return user
 
 
+def _login_credentials(db: Session, email: str) -> Optional[Tuple[int, str]]:
+    try:
+        row = db.query(User.id, User.password_hash).filter(User.email == email).first()
+        return (row.id, row.password_hash) if row else None
+    finally:
+        db.close()  # 검증하는 동안 커넥션을 풀에 돌려둔다
+
+
+@router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
+async def signup(payload: UserCreate, db: Session = Depends(get_db)):
+    if await run_in_threadpool(_email_registered, db, payload.email):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+
+    password_hash = await hash_password_async(payload.password)
+    return await run_in_threadpool(_create_user, db, payload.email, password_hash)
+
+
 @router.post("/login", response_model=TokenOut)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    credentials = await run_in_threadpool(_login_credentials, db, form_data.username)
 
-    if user is None:
+    if credentials is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect username or password")
 
-    if not verify_password(form_data.password, user.password_hash):
+    user_id, password_hash = credentials
+    if not await verify_password_async(form_data.password, password_hash):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect username or password")
 
     return TokenOut(
-        access_token=create_access_token(user.id),
-        refresh_token=create_refresh_token(user.id),
+        access_token=create_access_token(user_id),
+        refresh_token=create_refresh_token(user_id),
         token_type="bearer",
         expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
     )
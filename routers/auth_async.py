@@ -0,0 +1,98 @@
+# routers/auth_async.py
+# routers/auth.py와 같은 엔드포인트의 AsyncSession 버전 (settings.DB_ASYNC_ENABLED일 때 main.py가 등록)
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud_async
+from database import get_async_db
+from models import User
+from routers.auth import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    access_token_user_id,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    hash_password_async,
+    oauth2_scheme,
+    verify_password_async,
+)
+from schemas import TokenOut, UserCreate, UserOut
+from services.user_cache import cached_user, store_user
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme),
+) -> User:
+    user_id = access_token_user_id(token)
+
+    user = cached_user(user_id)
+    if user is not None:
+        return await db.merge(user, load=False)
+
+    user = await crud_async.get_user_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    store_user(user)
+    return user
+
+
+def _token_out(user_id: int) -> TokenOut:
+    return TokenOut(
+        access_token=create_access_token(user_id),
+        refresh_token=create_refresh_token(user_id),
+        token_type="bearer",
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+@router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
+async def signup(payload: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    if await crud_async.get_user_by_email(db, payload.email):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+
+    # pbkdf2 해싱은 CPU 작업이라 해싱 전용 프로세스 풀에서 (가득 차면 503)
+    password_hash = await hash_password_async(payload.password)
+    return await crud_async.create_user(db, email=payload.email, password_hash=password_hash)
+
+
+@router.post("/login", response_model=TokenOut)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    user = await crud_async.get_user_by_email(db, form_data.username)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect username or password")
+
+    user_id, password_hash = user.id, user.password_hash
+    await db.close()  # 검증하는 동안 커넥션을 풀에 돌려둔다
+
+    if not await verify_password_async(form_data.password, password_hash):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect username or password")
+
+    return _token_out(user_id)
+
+
+@router.post("/refresh", response_model=TokenOut)
+async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_async_db)):
+    payload = decode_token(refresh_token)
+
+    user_id = payload.get("sub")
+    typ = payload.get("typ")
+    if not user_id or typ != "refresh":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    user = await crud_async.get_user_by_id(db, int(user_id))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    return _token_out(user.id)
+
+
+@router.get("/me", response_model=UserOut)
+async def me(current_user: User = Depends(get_current_user_async)):
+    return current_user
@@ -10,6 +10,7 @@ from database import get_db
 from models import Item, Wishlist, Alert
 from crud import insert_price_history, update_min_price_last_7d
 from services.alert_service import evaluate_alerts_for_price_update
+from services.wishlist_listing import invalidate_wishlist_count
 
 router = APIRouter(prefix="/demo", tags=["demo"])
 
@@ -90,6 +91,8 @@ def trigger_alert(db: Session = Depends(get_db)):
 
     db.commit()
 
+    invalidate_wishlist_count(DEMO_USER_ID)
+
     return {
         "item_id": item.id,
         "set_price": DEMO_PRICE,
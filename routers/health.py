@@ -0,0 +1,62 @@
+# routers/health.py
+from fastapi import APIRouter, Response
+
+from database import pool_stats
+from services.collect_pipeline import last_run as last_collect_run
+from services.lowest_price import lowest_price_service
+from services.naver_shopping_client import naver_rate_limiter, search_cache
+from services.password_hasher import password_hasher
+from services.warmup import startup_warmup
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/db-pool")
+def get_db_pool_stats():
+    # api: 요청 핸들러용 풀, jobs: 스케줄러 job용 풀
+    return pool_stats()
+
+
+@router.get("/password-hasher")
+def get_password_hasher_stats():
+    # 해싱 프로세스 풀: 진행 중 작업 수, 완료 수, 가득 차서 503으로 거절한 수
+    return password_hasher.stats()
+
+
+@router.get("/lowest-price")
+def get_lowest_price_stats():
+    # 최저가 스냅샷: 스냅샷/직접 검색/stale로 응답한 수, 합쳐진 동시 요청 수
+    return lowest_price_service.stats()
+
+
+@router.get("/naver-quota")
+def get_naver_quota():
+    # 네이버 API 초당/일일 한도 사용 현황
+    return naver_rate_limiter.stats()
+
+
+@router.get("/search-cache")
+def get_search_cache_stats():
+    # 네이버 검색 결과 캐시 hit/miss/eviction 현황
+    return search_cache.stats()
+
+
+@router.get("/collect-pipeline")
+def get_collect_pipeline_stats():
+    # 마지막 수집 실행의 단계별 처리/대기 시간 (아직 안 돌았으면 null)
+    return {"last_run": last_collect_run()}
+
+
+@router.get("/live")
+def get_live():
+    # 프로세스가 요청을 받고 있으면 200
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def get_ready(response: Response):
+    # 시작 직후 작업 진행 상황. required 단계가 끝나기 전에는 503
+    status = startup_warmup.status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
@@ -0,0 +1,138 @@
+# routers/items.py
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Literal, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, get_db
+from models import Item
+from services.price_history_reader import (
+    choose_resolution,
+    decode_cursor,
+    encode_cursor,
+    iter_price_points,
+    to_naive_utc,
+)
+
+router = APIRouter(prefix="/items", tags=["items"])
+
+DEFAULT_RANGE = timedelta(days=7)
+MAX_PAGE_SIZE = 5000
+FLUSH_EVERY = 200  # 점 200개마다 응답 조각을 내보낸다
+
+
+def _stream_price_history(
+    db: Session,
+    points: Iterator[Tuple[Dict[str, Any], Tuple[datetime, int]]],
+    *,
+    head: Dict[str, Any],
+    resolution: str,
+    limit: int,
+) -> Iterator[bytes]:
+    # 상태 코드는 이미 나갔으므로 도중에 실패하면 JSON을 닫고 "error"를 붙여 끝낸다 (next_cursor는 null)
+    try:
+        yield (json.dumps(head)[:-1] + ', "points": [').encode()
+
+        buf = []
+        count = 0
+        last_pos = None
+        has_more = False
+        error = None
+
+        try:
+            for point, pos in points:
+                if count == limit:
+                    has_more = True
+                    break
+
+                buf.append(("," if count else "") + json.dumps(point))
+                count += 1
+                last_pos = pos
+                if len(buf) >= FLUSH_EVERY:
+                    yield "".join(buf).encode()
+                    buf.clear()
+        except Exception as e:
+            print("[price-history] stream error:", repr(e))
+            error = "price history stream failed"
+            has_more = False
+
+        next_cursor = encode_cursor(resolution, *last_pos) if has_more else None
+        tail = f'], "count": {count}, "next_cursor": {json.dumps(next_cursor)}'
+        if error is not None:
+            tail += f', "error": {json.dumps(error)}'
+        buf.append(tail + "}")
+        yield "".join(buf).encode()
+    finally:
+        db.close()
+
+
+@router.get("/{item_id}/price-history")
+def get_price_history(
+    item_id: int,
+    from_: Optional[datetime] = Query(None, alias="from", description="시작 시각 (기본: to - 7일)"),
+    to: Optional[datetime] = Query(None, description="끝 시각, 미포함 (기본: 현재)"),
+    resolution: Literal["auto", "raw", "hourly", "daily"] = Query("auto"),
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE, description="페이지 당 최대 점 개수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    db: Session = Depends(get_db),
+):
+    """
+    상품 가격 이력 조회.
+    - resolution=auto: 구간 길이/원본 보관 기간에 따라 raw, hourly, daily 중 선택
+    - (checked_at, id) keyset 페이지네이션: 다음 페이지는 같은 from/to에 cursor=next_cursor
+    - 응답은 스트리밍되고, DB에서는 일정 크기씩 나눠 읽어서 이력 길이와 상관없이 메모리 사용량이 일정하다
+    - 스트리밍 도중 실패하면 그때까지의 점과 "error"를 담아 JSON을 닫는다 (next_cursor는 null)
+    """
+    if db.get(Item, item_id) is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    end = to_naive_utc(to) if to else datetime.now(timezone.utc).replace(tzinfo=None)
+    start = to_naive_utc(from_) if from_ else end - DEFAULT_RANGE
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'from' must be earlier than 'to'")
+
+    after = None
+    if cursor:
+        try:
+            resolution, after_ts, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        after = (after_ts, after_id)
+    elif resolution == "auto":
+        resolution = choose_resolution(start, end)
+
+    # StreamingResponse는 핸들러가 끝난 뒤에 읽히므로 get_db 세션 대신 스트림 전용 세션을 쓴다.
+    # 첫 chunk는 응답을 시작하기 전에 읽어서, 여기서 실패하면 잘린 200 대신 에러 응답이 나가게 한다.
+    # limit+1개를 읽어 다음 페이지가 있는지 판단한다
+    stream_db = SessionLocal()
+    try:
+        points = iter_price_points(
+            stream_db,
+            item_id=item_id,
+            resolution=resolution,
+            start=start,
+            end=end,
+            after=after,
+            limit=limit + 1,
+        )
+        first = next(points, None)
+    except Exception:
+        stream_db.close()
+        raise
+    if first is not None:
+        points = itertools.chain([first], points)
+
+    head = {
+        "item_id": item_id,
+        "resolution": resolution,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+    }
+    return StreamingResponse(
+        _stream_price_history(stream_db, points, head=head, resolution=resolution, limit=limit),
+        media_type="application/json",
+    )
@@ -0,0 +1,67 @@
+# routers/wishlist_async.py
+# routers/wishlist_ref.py와 같은 엔드포인트의 AsyncSession 버전 (settings.DB_ASYNC_ENABLED일 때 main.py가 등록)
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import crud_async
+import schemas
+from database import get_async_db
+from routers.auth import Principal, get_current_principal
+
+router = APIRouter(prefix="/wishlist", tags=["wishlist"])
+
+
+@router.get("", response_model=schemas.WishlistListResponse)
+async def get_wishlist(
+    display: int = Query(10, ge=1, le=100),
+    start: int = Query(1, ge=1, le=1000),
+    sort: str = Query("date", pattern="^(sim|date|asc|dsc)$"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (있으면 start 무시)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    user_id = current_user.id
+
+    try:
+        items, next_cursor = await crud_async.list_wishlist_page(
+            db,
+            user_id=user_id,
+            sort=sort,
+            display=display,
+            start=start,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return schemas.WishlistListResponse(
+        result_code="SUCCESS",
+        total_count=await crud_async.count_wishlist(db, user_id),
+        user_id=user_id,
+        wishlist_items=items,
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("", response_model=schemas.WishlistItemOut)
+async def create_wishlist(
+    payload: schemas.WishlistCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    w = await crud_async.add_to_wishlist(db, user_id=current_user.id, item_id=payload.item_id)
+    # 응답에 item을 같이 내려주므로 미리 읽어 둔다 (async에서는 lazy load 불가)
+    await db.refresh(w, attribute_names=["item"])
+    return w
+
+
+@router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_wishlist(
+    item_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    await crud_async.remove_from_wishlist(db, user_id=current_user.id, item_id=item_id)
+    return
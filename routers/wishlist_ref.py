@@ -1,50 +1,56 @@
 # routers/wishlist_ref.py
-from fastapi import APIRouter, Depends, Query, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from datetime import datetime  # datetime 에러 방지용 import
 from database import get_db
 import models
 import schemas
 from database import get_db
-from routers.auth import get_current_user
+from routers.auth import Principal, get_current_principal
 from crud import add_to_wishlist, remove_from_wishlist
+from services.wishlist_listing import count_wishlist, list_wishlist_page
 
 router = APIRouter(prefix="/wishlist", tags=["wishlist"])
 
 @router.get("", response_model=schemas.WishlistListResponse)
-async def get_wishlist(
-    display: int = Query(10, le=100),
-    start: int = Query(1, le=1000),
+def get_wishlist(
+    display: int = Query(10, ge=1, le=100),
+    start: int = Query(1, ge=1, le=1000),
     sort: str = Query("date", pattern="^(sim|date|asc|dsc)$"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (있으면 start 무시)"),
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),  # ✅ 로그인 유저
+    current_user: Principal = Depends(get_current_principal),  # ✅ 로그인 유저 (토큰만 확인, users 조회 없음)
 ):
+    # DB I/O가 블로킹이라 async가 아닌 def로 둔다 (FastAPI가 스레드풀에서 실행)
     user_id = current_user.id
-    query = db.query(models.Wishlist).filter(models.Wishlist.user_id == user_id)
-
-    if sort == "date":
-        query = query.order_by(models.Wishlist.created_at.desc())
-    elif sort == "asc":
-        query = query.order_by(models.Wishlist.item_id.asc())
-    elif sort == "dsc":
-        query = query.order_by(models.Wishlist.item_id.desc())
 
-    total_count = query.count()
-    offset = start - 1
-    items = query.offset(offset).limit(display).all()
+    try:
+        items, next_cursor = list_wishlist_page(
+            db,
+            user_id=user_id,
+            sort=sort,
+            display=display,
+            start=start,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return schemas.WishlistListResponse(
         result_code="SUCCESS",
-        total_count=total_count,
+        total_count=count_wishlist(db, user_id),
         user_id=user_id,
         wishlist_items=items,
+        next_cursor=next_cursor,
     )
 
 @router.post("", response_model=schemas.WishlistItemOut)
 def create_wishlist(
     payload: schemas.WishlistCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     w = add_to_wishlist(db, user_id=current_user.id, item_id=payload.item_id)
     # item 같이 내려주고 싶으면 relationship 로딩 필요할 수도 있음(지금은 OK일 가능성 높음)
@@ -54,7 +60,7 @@ def create_wishlist(
 def delete_wishlist(
     item_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     remove_from_wishlist(db, user_id=current_user.id, item_id=item_id)
     return
\ No newline at end of file
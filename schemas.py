@@ -117,6 +117,7 @@ class WishlistListResponse(BaseModel):
 
     # ORM Wishlist 리스트가 그대로 들어와도 파싱 가능
     wishlist_items: List[WishlistItemOut] = Field(..., description="아이템 목록")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
 class WishlistCreate(BaseModel):
     item_id: int
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import case, desc, func, or_, select, update
 
 from models import Alert, Wishlist, Item, PriceHistory
 
@@ -81,34 +81,163 @@ def evaluate_alerts_for_price_update(
         if a.last_triggered_ph_id is not None and a.last_triggered_ph_id == new_ph.id:
             continue
 
-        hit = False
-
-        if a.alert_type == "TARGET_PRICE":
-            if a.target_price is not None and current_price <= int(a.target_price):
-                hit = True
-
-        elif a.alert_type == "DROP_FROM_PREV":
-            if prev_price is not None and current_price < int(prev_price):
-                hit = True
-
-        elif a.alert_type == "NEW_LOW":
-            # "새로운 최저가"는 기존 min_price보다 낮아졌는지로 판단
-            # (update_min_price_last_7d가 호출되기 전 old_min_price를 전달받는 전제)
-            if old_min_price is not None and current_price < int(old_min_price):
-                hit = True
+        hit = _is_alert_hit(
+            a.alert_type,
+            target_price=a.target_price,
+            current_price=current_price,
+            prev_price=prev_price,
+            old_min_price=old_min_price,
+        )
 
         if hit:
             a.last_triggered_ph_id = new_ph.id
             a.last_triggered_at = _now_naive_utc()
             triggered += 1
 
-            print(
-                "[알림 왔숑]/n",
-                f"wishlist_id={a.wishlist_id}",
-                f"alert_type={a.alert_type}",
-                f"current_price={current_price}",
-                f"target_price={a.target_price}",
-                f"price_history_id={new_ph.id}",
-                f"triggered_at={a.last_triggered_at}",
-            )
+            _log_triggered(a.wishlist_id, a.alert_type, current_price, a.target_price, new_ph.id, a.last_triggered_at)
     return triggered
+
+
+def _is_alert_hit(
+    alert_type: str,
+    *,
+    target_price: Optional[int],
+    current_price: int,
+    prev_price: Optional[int],
+    old_min_price: Optional[int],
+) -> bool:
+    if alert_type == "TARGET_PRICE":
+        return target_price is not None and current_price <= int(target_price)
+
+    if alert_type == "DROP_FROM_PREV":
+        return prev_price is not None and current_price < int(prev_price)
+
+    if alert_type == "NEW_LOW":
+        # "새로운 최저가"는 기존 min_price보다 낮아졌는지로 판단
+        # (update_min_price_last_7d가 호출되기 전 old_min_price를 전달받는 전제)
+        return old_min_price is not None and current_price < int(old_min_price)
+
+    return False
+
+
+def _log_triggered(wishlist_id, alert_type, current_price, target_price, ph_id, triggered_at) -> None:
+    print(
+        "[알림 왔숑]/n",
+        f"wishlist_id={wishlist_id}",
+        f"alert_type={alert_type}",
+        f"current_price={current_price}",
+        f"target_price={target_price}",
+        f"price_history_id={ph_id}",
+        f"triggered_at={triggered_at}",
+    )
+
+
+# ---------------------------------------------------------
+# 배치 알람 판별
+# - 가격이 바뀐 상품 여러 개를 한 번에 판별한다.
+# - 알람 조회(Alert-Wishlist join) 1번 + 직전 가격 조회(window 함수) 1번
+#   + 트리거된 알람 UPDATE 1번. 판별 규칙은 evaluate_alerts_for_price_update와 같다.
+# - TARGET_PRICE 알람은 SQL 조건(target_price >= 새 가격)으로 목표가에 닿은 것만 읽는다.
+# ---------------------------------------------------------
+class PriceChange(NamedTuple):
+    item_id: int
+    new_ph: PriceHistory
+    old_last_seen_price: Optional[int]
+    old_min_price: Optional[int]
+
+
+def _get_prev_prices(db: Session, item_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    상품별 직전 가격(가장 최근 price_history 2개 중 '바로 이전' 값)을 한 번에 가져온다.
+    price_history가 2개 미만인 상품은 결과에 없다.
+    """
+    ids = list(item_ids)
+    if not ids:
+        return {}
+
+    rn = func.row_number().over(
+        partition_by=PriceHistory.item_id,
+        order_by=(desc(PriceHistory.checked_at), desc(PriceHistory.id)),
+    ).label("rn")
+    ranked = (
+        select(PriceHistory.item_id, PriceHistory.price, rn)
+        .where(PriceHistory.item_id.in_(ids))
+        .subquery()
+    )
+    rows = db.execute(select(ranked.c.item_id, ranked.c.price).where(ranked.c.rn == 2))
+    return {int(item_id): int(price) for item_id, price in rows}
+
+
+def evaluate_alerts_for_price_changes(db: Session, changes: Iterable[PriceChange]) -> int:
+    """
+    여러 상품의 가격 갱신 결과로 알람을 판별하고, 트리거된 알람은 DB에만 표시(last_triggered_*)한다.
+    실제 알림 전송은 하지 않는다. (commit은 호출자가)
+
+    return: 트리거된 알람 개수
+    """
+    by_item: Dict[int, PriceChange] = {c.item_id: c for c in changes}
+    if not by_item:
+        return 0
+
+    stmt = (
+        select(
+            Alert.id,
+            Alert.wishlist_id,
+            Alert.alert_type,
+            Alert.target_price,
+            Alert.last_triggered_ph_id,
+            Wishlist.item_id,
+        )
+        .join(Wishlist, Wishlist.id == Alert.wishlist_id)
+        .where(Wishlist.item_id.in_(list(by_item)))
+        .where(Wishlist.is_active == 1)
+        .where(Alert.is_enabled == 1)
+    )
+    # TARGET_PRICE는 목표가에 닿은 알람만 DB에서 고른다 (상품별 새 가격을 CASE로 넘긴다)
+    new_price = case({item_id: int(c.new_ph.price) for item_id, c in by_item.items()}, value=Wishlist.item_id)
+    stmt = stmt.where(or_(Alert.alert_type != "TARGET_PRICE", Alert.target_price >= new_price))
+
+    alerts = db.execute(stmt).all()
+    if not alerts:
+        return 0
+
+    # DROP_FROM_PREV 알람이 걸린 상품만 직전 가격이 필요하다
+    prev_prices = _get_prev_prices(
+        db, {a.item_id for a in alerts if a.alert_type == "DROP_FROM_PREV"}
+    )
+
+    now = _now_naive_utc()
+    triggered_ph: Dict[int, int] = {}  # alert_id -> price_history_id
+
+    for a in alerts:
+        change = by_item[a.item_id]
+        new_ph = change.new_ph
+
+        # 중복 트리거 방지(같은 price_history로 이미 트리거했으면 skip)
+        if a.last_triggered_ph_id is not None and a.last_triggered_ph_id == new_ph.id:
+            continue
+
+        current_price = int(new_ph.price)
+        if _is_alert_hit(
+            a.alert_type,
+            target_price=a.target_price,
+            current_price=current_price,
+            prev_price=prev_prices.get(a.item_id),
+            old_min_price=change.old_min_price,
+        ):
+            triggered_ph[a.id] = new_ph.id
+            _log_triggered(a.wishlist_id, a.alert_type, current_price, a.target_price, new_ph.id, now)
+
+    if triggered_ph:
+        alert_ids: List[int] = list(triggered_ph)
+        db.execute(
+            update(Alert)
+            .where(Alert.id.in_(alert_ids))
+            .values(
+                last_triggered_ph_id=case(triggered_ph, value=Alert.id),
+                last_triggered_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    return len(triggered_ph)
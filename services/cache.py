@@ -0,0 +1,248 @@
+# services/cache.py
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class CacheBackend:
+    """
+    bytes 값을 TTL과 함께 저장하는 캐시 저장소 인터페이스.
+    워커 간 공유가 필요하면 RedisCacheBackend처럼 외부 저장소를 감싸서 구현한다.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    프로세스 내부 캐시.
+    - 항목마다 TTL(만료 시각)을 가진다.
+    - max_entries(개수) / max_bytes(값 크기 합) 중 하나라도 넘으면 가장 오래 안 쓴 항목부터 버린다(LRU).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _drop(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        if len(value) > self.max_bytes:
+            # 한 항목이 전체 한도보다 크면 저장하지 않는다
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = (value, self._clock() + ttl)
+            self._bytes += len(value)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis 호환 서버(redis, valkey, 로컬 대체 서버 등)를 쓰는 공유 캐시.
+    client는 get / set(px=...) / delete / scan_iter를 지원하는 redis-py 스타일 객체면 된다.
+    용량 제한과 LRU는 서버 설정(maxmemory, maxmemory-policy=allkeys-lru)에 맡긴다.
+    """
+
+    def __init__(self, client: Any, *, prefix: str = "cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_url(cls, url: str, *, prefix: str = "cache:") -> "RedisCacheBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("redis backend requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SingleFlight:
+    """
+    같은 key로 동시에 들어온 작업을 1번만 실행하고 결과를 나눠 갖는다.
+    스레드(do)와 이벤트 루프(do_async) 호출이 섞여 있어도 같은 key면 합쳐진다.
+    모든 호출자가 같은 결과 객체를 받으므로 bytes/tuple처럼 바뀌지 않는 값을 돌려주는 fn에 쓴다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, "Future[Any]"] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def _join_or_lead(self, key: str) -> Tuple["Future[Any]", bool]:
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut, False
+            fut = Future()
+            self._inflight[key] = fut
+            self.executed += 1
+            return fut, True
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        fut, leader = self._join_or_lead(key)
+        if not leader:
+            return fut.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        fut, leader = self._join_or_lead(key)
+        if not leader:
+            return await asyncio.wrap_future(fut)
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "inflight": len(self._inflight),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,527 @@
+# services/collect_pipeline.py
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from services.alert_service import PriceChange, evaluate_alerts_for_price_changes
+from services.naver_shopping_client import (
+    AsyncNaverShoppingClient,
+    DataCleaningError,
+    NAVER_MAX_START,
+    NaverProduct,
+    normalize_naver_product,
+    plan_pages,
+)
+from services.naver_rate_limiter import Priority, spread_offsets
+from services.shopping_service import ingest_page_prices
+
+# ---------------------------------------------------------
+# 수집 파이프라인 (collect_items_pages의 client 경로)
+#   fetch -> normalize -> write(upsert + commit) -> alert
+# - 단계 사이는 크기 제한 큐(PIPELINE_QUEUE_SIZE)라서 DB가 느리면 fetch가 앞서 나가지 않고 기다린다.
+# - 단계마다 동시 실행 수를 따로 둔다. DB 단계는 작업마다 자기 세션(스레드)을 쓰므로
+#   PIPELINE_WRITE_CONCURRENCY + PIPELINE_ALERT_CONCURRENCY <= DB_JOB_POOL_SIZE 로 둔다.
+#   같은 상품이 여러 페이지에 나오면 writer끼리 잠금 경합이 생길 수 있어 writer 기본값은 1.
+# - writer/alert는 큐에 쌓여 있는 페이지를 PIPELINE_WRITE_BATCH_PAGES개까지 한 트랜잭션으로 묶는다.
+# - 알림 판별은 페이지 commit 뒤 별도 트랜잭션이다 (알림 판별이 실패해도 가격 저장은 남는다).
+# ---------------------------------------------------------
+PIPELINE_FETCH_CONCURRENCY = int(os.getenv("PIPELINE_FETCH_CONCURRENCY", "4"))
+PIPELINE_NORMALIZE_CONCURRENCY = int(os.getenv("PIPELINE_NORMALIZE_CONCURRENCY", "1"))
+PIPELINE_WRITE_CONCURRENCY = int(os.getenv("PIPELINE_WRITE_CONCURRENCY", "1"))
+PIPELINE_ALERT_CONCURRENCY = int(os.getenv("PIPELINE_ALERT_CONCURRENCY", "1"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+PIPELINE_WRITE_BATCH_PAGES = int(os.getenv("PIPELINE_WRITE_BATCH_PAGES", "4"))
+
+_DONE = object()  # 큐 종료 표시 (하류 worker 수만큼 넣는다)
+
+
+class StageMetrics:
+    """
+    단계별 시간 (모두 이벤트 루프에서만 갱신하므로 lock 없음)
+    - busy: 실제 처리 시간
+    - idle: 입력 큐가 비어서 기다린 시간 (상류가 느림)
+    - blocked: 출력 큐가 가득 차서 기다린 시간 (하류가 느림 = backpressure)
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.batches = 0
+        self.pages = 0
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_batch_seconds = 0.0
+        self.idle_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    def record(self, seconds: float, *, pages: int, items: int) -> None:
+        self.batches += 1
+        self.pages += pages
+        self.items += items
+        self.busy_seconds += seconds
+        self.max_batch_seconds = max(self.max_batch_seconds, seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "batches": self.batches,
+            "pages": self.pages,
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "avg_batch_ms": round(self.busy_seconds / self.batches * 1000, 2) if self.batches else None,
+            "max_batch_ms": round(self.max_batch_seconds * 1000, 2),
+            "idle_seconds": round(self.idle_seconds, 4),
+            "blocked_seconds": round(self.blocked_seconds, 4),
+        }
+
+
+class CollectRequest(NamedTuple):
+    """한 실행에서 수집할 검색 하나: first_start부터 total개 (page_size 단위)."""
+    key: str
+    query: str
+    category: str | None = None
+    total: int = 100
+    page_size: int = 50
+    sort: str = "sim"
+    first_start: int = 1
+
+
+class RequestResult(NamedTuple):
+    saved: int                      # 저장한 상품 수 (중복 제외 후)
+    next_start: int                 # 앞에서부터 빠짐없이 저장된 페이지 다음 start (다음 실행은 여기부터)
+    exhausted: bool                 # 검색 결과 끝(빈 페이지/덜 찬 페이지)까지 저장했다
+    error: Optional[str]            # fetch 실패 (이 요청의 남은 페이지는 건너뜀)
+
+
+class PipelineResult(NamedTuple):
+    saved: int                      # 저장한 상품 수
+    pages: int                      # 저장한 페이지 수
+    duplicates: int                 # 같은 실행의 다른 페이지/검색에서 이미 나와서 건너뛴 상품 수
+    alerts: int                     # 트리거된 알람 수
+    elapsed_seconds: float
+    stages: Dict[str, Dict[str, Any]]
+    requests: Dict[str, RequestResult]
+
+
+class CollectPipeline:
+    def __init__(
+        self,
+        client: AsyncNaverShoppingClient,
+        session_factory: Callable[[], Session],
+        *,
+        fetch_concurrency: int = PIPELINE_FETCH_CONCURRENCY,
+        normalize_concurrency: int = PIPELINE_NORMALIZE_CONCURRENCY,
+        write_concurrency: int = PIPELINE_WRITE_CONCURRENCY,
+        alert_concurrency: int = PIPELINE_ALERT_CONCURRENCY,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        write_batch_pages: int = PIPELINE_WRITE_BATCH_PAGES,
+    ) -> None:
+        self.client = client
+        self.session_factory = session_factory
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.normalize_concurrency = max(1, normalize_concurrency)
+        self.write_concurrency = max(1, write_concurrency)
+        self.alert_concurrency = max(1, alert_concurrency)
+        self.queue_size = max(1, queue_size)
+        self.write_batch_pages = max(1, write_batch_pages)
+
+    async def run(
+        self,
+        query: str,
+        *,
+        category: str | None = None,
+        total: int = 100,
+        page_size: int = 50,
+        sort: str = "sim",
+        strict: bool = False,
+        spread_over: float | None = None,
+    ) -> PipelineResult:
+        """
+        total개를 page_size 단위 페이지로 나눠 수집/저장한다.
+        spread_over(초)를 주면 페이지 요청 시작 시각을 그 구간에 고르게 나눈다.
+        빈 페이지가 나오면 그 뒤 페이지는 요청하지 않고, 이미 받은 것도 버린다.
+        처리 중 첫 예외는 나머지 단계를 비운 뒤 다시 던진다 (이미 commit한 페이지는 남는다).
+        """
+        request = CollectRequest(query, query, category, total, page_size, sort)
+        return await self.run_many([request], strict=strict, spread_over=spread_over)
+
+    async def run_many(
+        self,
+        requests: List[CollectRequest],
+        *,
+        strict: bool = False,
+        spread_over: float | None = None,
+        raise_fetch_errors: bool = True,
+    ) -> PipelineResult:
+        """
+        여러 검색을 한 파이프라인으로 같이 수집한다.
+        - 페이지 요청은 검색들을 번갈아 가며 보낸다 (fetch 동시 실행 수와 rate limiter를 같이 쓴다).
+        - 같은 상품(external_id)이 여러 검색/페이지에 나오면 처음 것만 저장한다.
+        - raise_fetch_errors=False면 한 검색의 fetch 실패는 그 검색만 멈추고 RequestResult.error에 남긴다.
+        """
+        return await _Run(self, requests, strict, spread_over, raise_fetch_errors).run()
+
+
+class _Page:
+    __slots__ = ("index", "key", "start", "display", "offset", "items")
+
+    def __init__(self, index: int, key: str, start: int, display: int, offset: float) -> None:
+        self.index = index
+        self.key = key
+        self.start = start
+        self.display = display
+        self.offset = offset
+        self.items: List[Any] = []
+
+
+class _RequestState:
+    def __init__(self, request: CollectRequest, pages: List[Tuple[int, int]]) -> None:
+        self.request = request
+        self.planned = [start for start, _ in pages]
+        self.end_after: Optional[int] = None    # 마지막 페이지(빈/덜 찬 페이지)의 start
+        self.committed: Dict[int, int] = {}     # start -> display (저장 끝난 페이지)
+        self.saved = 0
+        self.error: Optional[BaseException] = None
+
+    def dropped(self, start: int) -> bool:
+        return self.error is not None or (self.end_after is not None and start > self.end_after)
+
+    def result(self) -> RequestResult:
+        next_start = self.request.first_start
+        for start in self.planned:
+            if start not in self.committed:
+                break
+            next_start = start + self.committed[start]
+        # 마지막 페이지까지 저장했거나 네이버 start 한도(1000)를 넘었으면 끝
+        exhausted = (self.end_after is not None and next_start > self.end_after) or next_start > NAVER_MAX_START
+        return RequestResult(
+            saved=self.saved,
+            next_start=next_start,
+            exhausted=exhausted,
+            error=repr(self.error) if self.error is not None else None,
+        )
+
+
+class _Run:
+    """CollectPipeline.run_many 한 번의 상태."""
+
+    def __init__(
+        self,
+        pipeline: CollectPipeline,
+        requests: List[CollectRequest],
+        strict: bool,
+        spread_over: float | None,
+        raise_fetch_errors: bool,
+    ) -> None:
+        self.p = pipeline
+        self.strict = strict
+        self.raise_fetch_errors = raise_fetch_errors
+
+        self.requests: Dict[str, _RequestState] = {}
+        per_request: List[List[Tuple[int, int]]] = []
+        for r in requests:
+            pages = plan_pages(r.total, r.page_size, first_start=r.first_start)
+            self.requests[r.key] = _RequestState(r, pages)
+            per_request.append([(start, display) for start, display in pages])
+
+        # 검색들을 번갈아 가며: A1 B1 C1 A2 B2 ...
+        order: List[Tuple[str, int, int]] = []
+        for depth in range(max((len(p) for p in per_request), default=0)):
+            for r, pages in zip(requests, per_request):
+                if depth < len(pages):
+                    order.append((r.key, *pages[depth]))
+        offsets = spread_offsets(len(order), spread_over)
+        self.pages = iter([_Page(i, key, start, display, offset) for i, ((key, start, display), offset) in enumerate(zip(order, offsets))])
+
+        self.seen: set = set()                   # 이번 실행에서 이미 넘긴 external_id
+        self.duplicates = 0
+        self.error: Optional[BaseException] = None
+        self.saved = 0
+        self.saved_pages = 0
+        self.alerts = 0
+        self.metrics = {
+            "fetch": StageMetrics("fetch", pipeline.fetch_concurrency),
+            "normalize": StageMetrics("normalize", pipeline.normalize_concurrency),
+            "write": StageMetrics("write", pipeline.write_concurrency),
+            "alert": StageMetrics("alert", pipeline.alert_concurrency),
+        }
+
+    def _fail(self, stage: str, e: BaseException) -> None:
+        self.metrics[stage].errors += 1
+        if self.error is None:
+            self.error = e
+
+    def _dropped(self, page: _Page) -> bool:
+        return self.error is not None or self.requests[page.key].dropped(page.start)
+
+    async def run(self) -> PipelineResult:
+        t0 = time.perf_counter()
+        raw_q: asyncio.Queue = asyncio.Queue(self.p.queue_size)
+        normalized_q: asyncio.Queue = asyncio.Queue(self.p.queue_size)
+        alert_q: asyncio.Queue = asyncio.Queue(self.p.queue_size)
+
+        await asyncio.gather(
+            _group(self.p.fetch_concurrency, lambda: self._fetcher(raw_q), raw_q, self.p.normalize_concurrency),
+            _group(
+                self.p.normalize_concurrency,
+                lambda: self._worker("normalize", raw_q, normalized_q, 1, self._normalize),
+                normalized_q,
+                self.p.write_concurrency,
+            ),
+            _group(
+                self.p.write_concurrency,
+                lambda: self._worker("write", normalized_q, alert_q, self.p.write_batch_pages, self._write),
+                alert_q,
+                self.p.alert_concurrency,
+            ),
+            _group(
+                self.p.alert_concurrency,
+                lambda: self._worker("alert", alert_q, None, self.p.write_batch_pages, self._evaluate),
+                None,
+                0,
+            ),
+        )
+        if self.error is not None:
+            raise self.error
+        if self.raise_fetch_errors:
+            for state in self.requests.values():
+                if state.error is not None:
+                    raise state.error
+
+        return PipelineResult(
+            saved=self.saved,
+            pages=self.saved_pages,
+            duplicates=self.duplicates,
+            alerts=self.alerts,
+            elapsed_seconds=round(time.perf_counter() - t0, 4),
+            stages={name: m.as_dict() for name, m in self.metrics.items()},
+            requests={key: state.result() for key, state in self.requests.items()},
+        )
+
+    # ---------- fetch ----------
+    async def _fetcher(self, out: asyncio.Queue) -> None:
+        m = self.metrics["fetch"]
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        for page in self.pages:  # 여러 fetcher가 같은 iterator를 나눠 가진다
+            if self._dropped(page):
+                continue
+            wait = page.offset - (loop.time() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                if self._dropped(page):
+                    continue
+
+            state = self.requests[page.key]
+            request = state.request
+            t = time.perf_counter()
+            try:
+                raw = await self.p.client.search_products(
+                    request.query,
+                    category=request.category,
+                    display=page.display,
+                    start=page.start,
+                    sort=request.sort,
+                    strict=self.strict,
+                    priority=Priority.BACKGROUND,
+                    normalize=False,
+                )
+            except Exception as e:
+                m.errors += 1
+                if state.error is None:
+                    state.error = e
+                continue
+            finally:
+                m.record(time.perf_counter() - t, pages=1, items=0)
+            m.items += len(raw)
+
+            if len(raw) < page.display:
+                # 검색 결과 끝: 이 뒤 페이지는 비어 있다
+                if state.end_after is None or page.start < state.end_after:
+                    state.end_after = page.start
+            if not raw:
+                state.committed[page.start] = page.display
+                continue
+
+            page.items = raw
+            t = time.perf_counter()
+            await out.put(page)
+            m.blocked_seconds += time.perf_counter() - t
+
+    # ---------- normalize / write / alert ----------
+    async def _worker(
+        self,
+        stage: str,
+        inbox: asyncio.Queue,
+        out: Optional[asyncio.Queue],
+        batch_limit: int,
+        handle: Callable[[List[Any]], Awaitable[Tuple[Any, int, int]]],
+    ) -> None:
+        """
+        inbox에서 하나를 기다려 받고, 이미 쌓여 있는 것은 batch_limit개까지 더 가져와 handle에 넘긴다.
+        handle은 (다음 큐로 보낼 값 또는 None, 페이지 수, 상품 수)를 돌려준다.
+        """
+        m = self.metrics[stage]
+        done = False
+        while not done:
+            t = time.perf_counter()
+            first = await inbox.get()
+            m.idle_seconds += time.perf_counter() - t
+            if first is _DONE:
+                return
+
+            batch = [first]
+            while len(batch) < batch_limit and not inbox.empty():
+                nxt = inbox.get_nowait()
+                if nxt is _DONE:
+                    done = True
+                    break
+                batch.append(nxt)
+
+            if self.error is not None:
+                continue  # 실패한 실행: 상류가 멈추도록 큐만 비운다
+
+            t = time.perf_counter()
+            try:
+                result, pages, items = await handle(batch)
+            except Exception as e:
+                self._fail(stage, e)
+                continue
+            m.record(time.perf_counter() - t, pages=pages, items=items)
+
+            if out is not None and result is not None:
+                t = time.perf_counter()
+                await out.put(result)
+                m.blocked_seconds += time.perf_counter() - t
+
+    async def _normalize(self, batch: List[_Page]) -> Tuple[Any, int, int]:
+        page = batch[0]
+        if self._dropped(page):
+            return None, 0, 0
+        raw = page.items
+        items = await asyncio.to_thread(_normalize_page, raw, self.strict)
+
+        # 중복 제거는 이벤트 루프에서 (normalize worker가 여러 개여도 seen을 같이 쓴다)
+        unique = []
+        for data in items:
+            if data.external_id in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(data.external_id)
+            unique.append(data)
+        page.items = unique
+        return page, 1, len(raw)
+
+    async def _write(self, batch: List[_Page]) -> Tuple[Any, int, int]:
+        pages = [page for page in batch if not self._dropped(page)]
+        to_write = [page.items for page in pages if page.items]
+        changes: List[PriceChange] = []
+        if to_write:
+            changes = await asyncio.to_thread(_write_pages, self.p.session_factory, to_write)
+
+        n = 0
+        for page in pages:
+            state = self.requests[page.key]
+            state.committed[page.start] = page.display
+            state.saved += len(page.items)
+            n += len(page.items)
+        self.saved += n
+        self.saved_pages += len(to_write)
+        return (changes or None), len(pages), n
+
+    async def _evaluate(self, batch: List[List[PriceChange]]) -> Tuple[Any, int, int]:
+        changes = [c for page in batch for c in page]
+        self.alerts += await asyncio.to_thread(_evaluate_alerts, self.p.session_factory, changes)
+        return None, len(batch), len(changes)
+
+
+async def _group(
+    n: int,
+    worker: Callable[[], Awaitable[None]],
+    out: Optional[asyncio.Queue],
+    downstream_workers: int,
+) -> None:
+    # 한 단계의 worker를 모두 끝낸 뒤 하류 worker 수만큼 종료 표시를 넣는다
+    try:
+        await asyncio.gather(*(worker() for _ in range(n)))
+    finally:
+        if out is not None:
+            for _ in range(downstream_workers):
+                await out.put(_DONE)
+
+
+def _normalize_page(raw: List[Any], strict: bool) -> List[NaverProduct]:
+    # 페이지 단위 대량 수집이라 dict 대신 NaverProduct (저장 단계는 속성으로 읽는다)
+    normalized: List[NaverProduct] = []
+    for it in raw:
+        try:
+            normalized.append(normalize_naver_product(it))
+        except DataCleaningError:
+            if strict:
+                raise
+    return normalized
+
+
+def _write_pages(session_factory: Callable[[], Session], pages: List[List[NaverProduct]]) -> List[PriceChange]:
+    db = session_factory()
+    try:
+        changes: List[PriceChange] = []
+        for items in pages:
+            _, page_changes = ingest_page_prices(db, items)
+            changes.extend(page_changes)
+        # 알림 단계는 다른 세션/스레드에서 ph.id, ph.price만 읽으므로 commit 전에 떼어 둔다 (expire 방지)
+        for c in changes:
+            db.expunge(c.new_ph)
+        db.commit()
+        return changes
+    finally:
+        db.close()
+
+
+def _evaluate_alerts(session_factory: Callable[[], Session], changes: List[PriceChange]) -> int:
+    db = session_factory()
+    try:
+        triggered = evaluate_alerts_for_price_changes(db, changes)
+        db.commit()
+        return triggered
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# 마지막 실행 결과 (GET /health/collect-pipeline)
+# ---------------------------------------------------------
+_last_run_lock = threading.Lock()
+_last_run: Optional[Dict[str, Any]] = None
+
+
+def record_run(result: PipelineResult) -> None:
+    global _last_run
+    with _last_run_lock:
+        _last_run = {
+            "finished_at": time.time(),
+            **result._asdict(),
+            "requests": {key: r._asdict() for key, r in result.requests.items()},
+        }
+
+
+def last_run() -> Optional[Dict[str, Any]]:
+    with _last_run_lock:
+        return _last_run
+
+
+def format_stages(stages: Dict[str, Dict[str, Any]]) -> str:
+    """job 로그용 한 줄 요약: stage=busy/idle/blocked(초)"""
+    return " ".join(
+        f"{name}={s['busy_seconds']:.2f}/{s['idle_seconds']:.2f}/{s['blocked_seconds']:.2f}"
+        for name, s in stages.items()
+    )
@@ -0,0 +1,209 @@
+# services/collect_targets.py
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from models import CollectProgress
+from services.collect_pipeline import CollectPipeline, CollectRequest, record_run
+from services.naver_shopping_client import AsyncNaverShoppingClient, plan_pages
+
+# ---------------------------------------------------------
+# 여러 검색어/카테고리 수집
+# - COLLECT_TARGETS: JSON 목록. 항목마다
+#     query(필수), category, total(한 번 훑을 상품 수), sort, interval_minutes, page_size, name
+#   예) [{"query": "기계식 키보드", "total": 1000, "interval_minutes": 60},
+#        {"query": "무선 마우스", "category": "50000151", "total": 300}]
+# - tick마다 COLLECT_CALLS_PER_TICK 페이지 요청을 대상들에 번갈아 나눠 주고, 한 파이프라인으로 같이 수집한다
+#   (fetch 동시 실행 수, 네이버 rate limiter, DB writer를 같이 쓴다. 여러 검색에 나온 상품은 한 번만 저장).
+# - 대상마다 진행 위치(collect_progress.next_start)를 남겨서 total이 커도 다음 tick에 이어서 받는다.
+#   끝까지 받으면 1로 돌아가고, 다음 훑기는 이전 훑기 시작 + interval_minutes 뒤에 시작한다.
+# ---------------------------------------------------------
+COLLECT_CALLS_PER_TICK = int(os.getenv("COLLECT_CALLS_PER_TICK", "10"))
+
+# job 실행 시각이 조금 당겨져도(interval 1분인데 59.9초 만에 도는 경우) 한 tick을 건너뛰지 않게
+_DUE_SLACK = timedelta(seconds=5)
+
+
+def _now_naive_utc() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CollectTarget(NamedTuple):
+    name: str
+    query: str
+    category: Optional[str] = None
+    total: int = 100
+    sort: str = "sim"
+    interval_minutes: float = 1.0
+    page_size: int = 50
+
+
+class CollectTick(NamedTuple):
+    targets: int        # 이번 tick에 수집한 대상 수
+    calls: int          # 배정한 페이지 요청 수
+    saved: int          # 저장한 상품 수 (중복 제외)
+    duplicates: int     # 다른 대상/페이지와 겹쳐서 건너뛴 상품 수
+    completed: int      # 이번 tick에 끝까지 훑은 대상 수
+    errors: int         # fetch가 실패한 대상 수
+
+
+def parse_targets(raw: str, *, page_size: int = 50) -> List[CollectTarget]:
+    """COLLECT_TARGETS(JSON) -> CollectTarget 목록. 형식이 틀리면 ValueError."""
+    try:
+        entries = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"COLLECT_TARGETS is not valid JSON: {e}") from e
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("COLLECT_TARGETS must be a non-empty JSON list")
+
+    targets: List[CollectTarget] = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not str(entry.get("query") or "").strip():
+            raise ValueError(f"COLLECT_TARGETS entry needs a query: {entry!r}")
+        query = str(entry["query"]).strip()
+        category = entry.get("category")
+        sort = str(entry.get("sort", "sim"))
+        target = CollectTarget(
+            name=str(entry.get("name") or f"{query}|{category or ''}|{sort}")[:64],
+            query=query,
+            category=str(category) if category is not None else None,
+            total=int(entry.get("total", 100)),
+            sort=sort,
+            interval_minutes=float(entry.get("interval_minutes", 1)),
+            page_size=int(entry.get("page_size", page_size)),
+        )
+        if target.total < 1:
+            raise ValueError(f"COLLECT_TARGETS total must be >= 1: {entry!r}")
+        if not (1 <= target.page_size <= 100):
+            raise ValueError(f"COLLECT_TARGETS page_size must be between 1 and 100: {entry!r}")
+        targets.append(target)
+
+    names = [t.name for t in targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f"COLLECT_TARGETS names must be unique: {names}")
+    return targets
+
+
+def _remaining_pages(target: CollectTarget, next_start: int) -> List[Tuple[int, int]]:
+    return plan_pages(max(0, target.total - (next_start - 1)), target.page_size, first_start=next_start)
+
+
+class TargetCollector:
+    def __init__(self, targets: List[CollectTarget], *, calls_per_tick: int = COLLECT_CALLS_PER_TICK) -> None:
+        self.targets = list(targets)
+        self.calls_per_tick = max(1, calls_per_tick)
+
+    def due(self, progress: Dict[str, CollectProgress], *, now: datetime) -> List[CollectTarget]:
+        """이어서 받을 대상(훑는 중) 먼저, 그다음 새로 훑을 때가 된 대상을 오래된 순으로."""
+        resuming, fresh = [], []
+        for t in self.targets:
+            row = progress.get(t.name)
+            if row is not None and row.next_start > 1:
+                resuming.append((row.sweep_started_at or datetime.min, t))
+            elif row is None or row.sweep_started_at is None:
+                fresh.append((datetime.min, t))
+            elif row.sweep_started_at + timedelta(minutes=t.interval_minutes) <= now + _DUE_SLACK:
+                fresh.append((row.sweep_started_at, t))
+        return [t for _, t in sorted(resuming, key=lambda x: x[0])] + [t for _, t in sorted(fresh, key=lambda x: x[0])]
+
+    def allocate(self, due: List[CollectTarget], progress: Dict[str, CollectProgress]) -> List[CollectRequest]:
+        """페이지 요청 예산을 대상들에 한 페이지씩 번갈아 배정한다."""
+        remaining = {}
+        for t in due:
+            row = progress.get(t.name)
+            remaining[t.name] = _remaining_pages(t, row.next_start if row is not None else 1)
+
+        taken: Dict[str, int] = {t.name: 0 for t in due}
+        budget = self.calls_per_tick
+        while budget > 0:
+            progressed = False
+            for t in due:
+                if budget > 0 and taken[t.name] < len(remaining[t.name]):
+                    taken[t.name] += 1
+                    budget -= 1
+                    progressed = True
+            if not progressed:
+                break
+
+        requests = []
+        for t in due:
+            pages = remaining[t.name][:taken[t.name]]
+            if not pages:
+                continue
+            requests.append(
+                CollectRequest(
+                    key=t.name,
+                    query=t.query,
+                    category=t.category,
+                    total=sum(display for _, display in pages),
+                    page_size=t.page_size,
+                    sort=t.sort,
+                    first_start=pages[0][0],
+                )
+            )
+        return requests
+
+    def run_tick(
+        self,
+        db: Session,
+        *,
+        client: AsyncNaverShoppingClient,
+        spread_over: Optional[float] = None,
+        strict: bool = False,
+        now: Optional[datetime] = None,
+    ) -> CollectTick:
+        now = now or _now_naive_utc()
+        progress = {row.name: row for row in db.query(CollectProgress).all()}
+        requests = self.allocate(self.due(progress, now=now), progress)
+        if not requests:
+            return CollectTick(targets=0, calls=0, saved=0, duplicates=0, completed=0, errors=0)
+
+        # 수집하는 동안 job 세션이 커넥션을 잡고 있지 않게 (파이프라인 writer/alert가 job 풀을 쓴다)
+        db.rollback()
+        pipeline = CollectPipeline(client, sessionmaker(bind=db.get_bind(), autoflush=False))
+        result = client.run(
+            pipeline.run_many(requests, strict=strict, spread_over=spread_over, raise_fetch_errors=False)
+        )
+        record_run(result)
+
+        progress = {row.name: row for row in db.query(CollectProgress).all()}
+
+        by_name = {t.name: t for t in self.targets}
+        completed = errors = 0
+        for request in requests:
+            r = result.requests[request.key]
+            target = by_name[request.key]
+            row = progress.get(request.key)
+            if row is None:
+                row = CollectProgress(name=request.key, next_start=1, sweep_items=0)
+                db.add(row)
+            if row.next_start <= 1 and (r.next_start > request.first_start or r.exhausted):
+                # 새 훑기 시작 (첫 페이지부터 실패했으면 다음 tick에 다시 시도)
+                row.sweep_started_at, row.sweep_items = now, 0
+
+            row.sweep_items = (row.sweep_items or 0) + r.saved
+            row.last_run_at = now
+            row.last_error = r.error[:255] if r.error else None
+            if r.error:
+                errors += 1
+            if r.exhausted or r.next_start > target.total:
+                row.next_start = 1
+                row.last_swept_at = now
+                completed += 1
+            else:
+                row.next_start = r.next_start
+        db.commit()
+
+        return CollectTick(
+            targets=len(requests),
+            calls=sum(len(plan_pages(q.total, q.page_size)) for q in requests),
+            saved=result.saved,
+            duplicates=result.duplicates,
+            completed=completed,
+            errors=errors,
+        )
@@ -0,0 +1,205 @@
+# services/job_lease.py
+from __future__ import annotations
+
+import functools
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import case, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from models import SchedulerLease
+
+# ---------------------------------------------------------
+# 여러 워커(uvicorn --workers N, 여러 pod)에서 배치 job을 한 곳에서만 돌리기
+# - scheduler_lease 테이블의 행 하나를 임대(lease)처럼 쓴다. 만료 전에는 주인만 연장할 수 있다.
+# - 리더 임대: 살아 있는 워커 중 하나가 잡고 heartbeat로 연장한다. 리더만 job을 실행한다.
+#   리더가 죽으면 TTL이 지난 뒤 다른 워커가 가져간다.
+# - job 임대: 리더가 바뀌는 순간 이전 리더의 긴 job과 겹치지 않도록 job마다 하나 더 잡는다.
+# - 시각은 앱 서버 기준 UTC. 서버 간 시계 차이는 TTL보다 충분히 작아야 한다.
+# ---------------------------------------------------------
+SCHEDULER_LEASE_TTL_SECONDS = float(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "60"))
+JOB_LEASE_TTL_SECONDS = float(os.getenv("JOB_LEASE_TTL_SECONDS", "1800"))  # job 최대 실행 시간보다 길게
+
+LEADER_LEASE = "scheduler-leader"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def try_acquire(
+    db: Session,
+    name: str,
+    owner: str,
+    ttl_seconds: float,
+    *,
+    now: Optional[datetime] = None,
+) -> bool:
+    """임대가 비었거나 만료됐거나 이미 owner 것이면 가져오고(연장하고) True."""
+    now = now or _utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+
+    # MySQL은 SET을 왼쪽부터 적용하므로 acquired_at을 owner보다 먼저 계산한다
+    stmt = (
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name)
+        .where(or_(SchedulerLease.owner == owner, SchedulerLease.expires_at <= now))
+        .ordered_values(
+            (SchedulerLease.acquired_at, case((SchedulerLease.owner == owner, SchedulerLease.acquired_at), else_=now)),
+            (SchedulerLease.owner, owner),
+            (SchedulerLease.expires_at, expires_at),
+        )
+    )
+    if db.execute(stmt).rowcount == 1:
+        db.commit()
+        return True
+
+    # 행이 아직 없으면 INSERT. 동시에 넣은 워커가 있으면 PK 충돌로 진다.
+    try:
+        db.execute(
+            insert(SchedulerLease).values(name=name, owner=owner, expires_at=expires_at, acquired_at=now)
+        )
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+
+
+def release(db: Session, name: str, owner: str, *, now: Optional[datetime] = None) -> None:
+    """owner가 가진 임대를 바로 만료시킨다."""
+    db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.owner == owner)
+        .values(expires_at=now or _utcnow())
+    )
+    db.commit()
+
+
+class JobCoordinator:
+    """
+    워커 하나당 하나. heartbeat()를 TTL보다 자주 불러 리더 임대를 유지하고,
+    job(name, fn)으로 감싼 함수는 리더이면서 job 임대를 잡았을 때만 실행된다.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        *,
+        owner: Optional[str] = None,
+        ttl_seconds: float = SCHEDULER_LEASE_TTL_SECONDS,
+        job_ttl_seconds: float = JOB_LEASE_TTL_SECONDS,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self.session_factory = session_factory
+        self.owner = owner or default_owner()
+        self.ttl_seconds = ttl_seconds
+        self.job_ttl_seconds = job_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._leader_until: Optional[datetime] = None
+
+        self.runs = 0
+        self.skipped_not_leader = 0
+        self.skipped_busy = 0
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        return self.ttl_seconds / 3
+
+    def is_leader(self) -> bool:
+        with self._lock:
+            return self._leader_until is not None and self._clock() < self._leader_until
+
+    def heartbeat(self) -> bool:
+        now = self._clock()
+        db = self.session_factory()
+        try:
+            acquired = try_acquire(db, LEADER_LEASE, self.owner, self.ttl_seconds, now=now)
+        except Exception as e:
+            print("[lease] heartbeat error:", repr(e))
+            acquired = False
+        finally:
+            db.close()
+
+        was_leader = self.is_leader()
+        with self._lock:
+            # DB 임대보다 조금 일찍 스스로 내려온다 (heartbeat가 밀려도 두 리더가 겹치지 않게)
+            self._leader_until = now + timedelta(seconds=self.ttl_seconds * 0.8) if acquired else None
+
+        if acquired and not was_leader:
+            print(f"[lease] {self.owner} is now the scheduler leader")
+        elif was_leader and not acquired:
+            print(f"[lease] {self.owner} lost scheduler leadership")
+        return acquired
+
+    def resign(self) -> None:
+        with self._lock:
+            was_leader, self._leader_until = self._leader_until is not None, None
+        if not was_leader:
+            return
+        db = self.session_factory()
+        try:
+            release(db, LEADER_LEASE, self.owner, now=self._clock())
+        except Exception as e:
+            print("[lease] resign error:", repr(e))
+        finally:
+            db.close()
+
+    def run_exclusive(self, name: str, fn: Callable[..., Any], *args: Any, ttl_seconds: Optional[float] = None, **kwargs: Any) -> Any:
+        if not self.is_leader():
+            with self._lock:
+                self.skipped_not_leader += 1
+            return None
+
+        lease = f"job:{name}"
+        db = self.session_factory()
+        try:
+            acquired = try_acquire(db, lease, self.owner, ttl_seconds or self.job_ttl_seconds, now=self._clock())
+        finally:
+            db.close()
+        if not acquired:
+            with self._lock:
+                self.skipped_busy += 1
+            print(f"[lease] skip {name}: still running elsewhere")
+            return None
+
+        with self._lock:
+            self.runs += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            db = self.session_factory()
+            try:
+                release(db, lease, self.owner, now=self._clock())
+            except Exception as e:
+                print(f"[lease] release {name} error:", repr(e))
+            finally:
+                db.close()
+
+    def job(self, name: str, fn: Callable[..., Any], *, ttl_seconds: Optional[float] = None) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self.run_exclusive(name, fn, *args, ttl_seconds=ttl_seconds, **kwargs)
+
+        return wrapper
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "owner": self.owner,
+                "leader": self._leader_until is not None and self._clock() < self._leader_until,
+                "runs": self.runs,
+                "skipped_not_leader": self.skipped_not_leader,
+                "skipped_busy": self.skipped_busy,
+            }
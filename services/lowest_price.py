@@ -0,0 +1,253 @@
+# services/lowest_price.py
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from crud import upsert_rows_statement
+from models import Item, LowestPriceSnapshot
+from services.cache import SingleFlight
+from services.naver_rate_limiter import Priority
+from services.naver_shopping_client import (
+    AsyncNaverShoppingClient,
+    KEYBOARD_CATEGORY_ID,
+    NaverAPIError,
+    search_products,
+)
+
+# ---------------------------------------------------------
+# 상품별 최저가 스냅샷 (GET /products/{item_id}/lowest-price)
+# - 요청은 lowest_price_snapshot 행을 그대로 돌려준다.
+#   LOWEST_PRICE_MAX_AGE_SECONDS보다 오래됐거나 없을 때만 네이버를 직접 검색한다.
+# - 같은 상품으로 동시에 들어온 요청은 검색 1번으로 합친다 (SingleFlight, 프로세스 안에서).
+# - 직접 검색이 실패하면 오래된 스냅샷이라도 있으면 stale로 돌려준다.
+# - 스케줄러(job_refresh_lowest_prices)가 최근 LOWEST_PRICE_TRACK_HOURS 안에 요청된 상품의 스냅샷을
+#   만료 전에 미리 갱신하므로, 자주 보는 상품은 요청 경로에서 검색하지 않는다.
+# ---------------------------------------------------------
+LOWEST_PRICE_MAX_AGE_SECONDS = float(os.getenv("LOWEST_PRICE_MAX_AGE_SECONDS", "600"))
+LOWEST_PRICE_REFRESH_MINUTES = float(os.getenv("LOWEST_PRICE_REFRESH_MINUTES", "5"))
+LOWEST_PRICE_REFRESH_BATCH = int(os.getenv("LOWEST_PRICE_REFRESH_BATCH", "30"))
+LOWEST_PRICE_TRACK_HOURS = float(os.getenv("LOWEST_PRICE_TRACK_HOURS", "24"))
+
+LOWEST_PRICE_SEARCH_DISPLAY = 100
+REQUESTED_AT_RESOLUTION = timedelta(minutes=10)  # requested_at은 이 간격으로만 갱신 (요청마다 UPDATE 방지)
+
+
+def _now_naive_utc() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Snapshot(NamedTuple):
+    item_id: int
+    price: int
+    mall_name: str
+    product_url: str
+    checked_count: int
+    matched_count: int
+    checked_at: datetime
+    requested_at: Optional[datetime]
+
+
+class LowestPriceView(NamedTuple):
+    snapshot: Snapshot
+    age_seconds: float
+    source: str          # snapshot | live | stale
+
+
+def search_kwargs(title: str) -> Dict[str, Any]:
+    # 네이버에서 가격 낮은 순으로 많이 가져와서(최대 100)
+    return {
+        "query": title,
+        "category": KEYBOARD_CATEGORY_ID,
+        "sort": "asc",
+        "display": LOWEST_PRICE_SEARCH_DISPLAY,
+    }
+
+
+def pick_lowest(item_id: int, external_id: str, results: List[Dict[str, Any]], *, now: datetime) -> Optional[Snapshot]:
+    """
+    같은 상품(external_id)의 첫 결과(sort=asc라서 최저가). 없으면 전체 결과 중 최저가.
+    검색 결과가 비었으면 None.
+    """
+    same_product = [r for r in results if r.get("external_id") == external_id]
+    if same_product:
+        best = same_product[0]
+    elif results:
+        best = results[0]
+    else:
+        return None
+    return Snapshot(
+        item_id=item_id,
+        price=int(best["price"]),
+        mall_name=best.get("mall_name", ""),
+        product_url=best.get("product_url", ""),
+        checked_count=len(results),
+        matched_count=len(same_product),
+        checked_at=now,
+        requested_at=now,
+    )
+
+
+def read_snapshot(db: Session, item_id: int) -> Optional[Snapshot]:
+    row = db.execute(
+        select(
+            LowestPriceSnapshot.item_id,
+            LowestPriceSnapshot.price,
+            LowestPriceSnapshot.mall_name,
+            LowestPriceSnapshot.product_url,
+            LowestPriceSnapshot.checked_count,
+            LowestPriceSnapshot.matched_count,
+            LowestPriceSnapshot.checked_at,
+            LowestPriceSnapshot.requested_at,
+        ).where(LowestPriceSnapshot.item_id == item_id)
+    ).first()
+    if row is None:
+        return None
+    return Snapshot(
+        int(row.item_id), int(row.price), row.mall_name or "", row.product_url or "",
+        int(row.checked_count), int(row.matched_count), row.checked_at, row.requested_at,
+    )
+
+
+def save_snapshots(db: Session, snapshots: List[Snapshot], *, touch_requested: bool = True) -> None:
+    """스냅샷 upsert (commit은 호출자가). 갱신 job은 requested_at을 건드리지 않는다."""
+    if not snapshots:
+        return
+    update_columns = ["price", "mall_name", "product_url", "checked_count", "matched_count", "checked_at"]
+    if touch_requested:
+        update_columns.append("requested_at")
+    db.execute(
+        upsert_rows_statement(
+            db,
+            LowestPriceSnapshot,
+            [s._asdict() for s in snapshots],
+            key_columns=["item_id"],
+            update_columns=update_columns,
+        )
+    )
+
+
+class LowestPriceService:
+    def __init__(self, *, max_age_seconds: float = LOWEST_PRICE_MAX_AGE_SECONDS) -> None:
+        self.max_age_seconds = max_age_seconds
+        self.flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._counts = {"snapshot": 0, "live": 0, "stale": 0, "refreshed_by_job": 0}
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += n
+
+    def get(self, db: Session, item: Any, *, now: Optional[datetime] = None) -> LowestPriceView:
+        """
+        item: id, title, external_id가 있는 객체 (Item 또는 컬럼 행)
+        스냅샷이 max_age_seconds 안이면 그대로, 아니면 네이버를 검색해 스냅샷을 갱신한다.
+        검색 결과가 비었으면 LookupError.
+        """
+        now = now or _now_naive_utc()
+        snap = read_snapshot(db, item.id)
+        if snap is not None and (now - snap.checked_at).total_seconds() <= self.max_age_seconds:
+            if snap.requested_at is None or now - snap.requested_at >= REQUESTED_AT_RESOLUTION:
+                db.execute(
+                    update(LowestPriceSnapshot)
+                    .where(LowestPriceSnapshot.item_id == item.id)
+                    .values(requested_at=now)
+                )
+                db.commit()
+            self._count("snapshot")
+            return LowestPriceView(snap, (now - snap.checked_at).total_seconds(), "snapshot")
+
+        item_id, title, external_id = item.id, item.title, item.external_id
+        try:
+            fresh, source = self.flight.do(
+                f"lowest:{item_id}", lambda: self._refresh_one(db, item_id, title, external_id)
+            )
+        except NaverAPIError as e:
+            if snap is None:
+                raise
+            print(f"[lowest-price] live search failed for item {item_id}, serving stale snapshot:", repr(e))
+            self._count("stale")
+            return LowestPriceView(snap, (now - snap.checked_at).total_seconds(), "stale")
+
+        self._count(source)
+        return LowestPriceView(fresh, max(0.0, (_now_naive_utc() - fresh.checked_at).total_seconds()), source)
+
+    def _refresh_one(self, db: Session, item_id: int, title: str, external_id: str) -> Tuple[Snapshot, str]:
+        # 다른 워커가 방금 갱신했을 수 있으니 새 트랜잭션에서 한 번 더 본다
+        # (검색하는 동안 API 풀 커넥션을 잡고 있지 않는 효과도 있다)
+        db.rollback()
+        now = _now_naive_utc()
+        snap = read_snapshot(db, item_id)
+        if snap is not None and (now - snap.checked_at).total_seconds() <= self.max_age_seconds:
+            return snap, "snapshot"
+
+        results = search_products(**search_kwargs(title), priority=Priority.INTERACTIVE)  # 배치 수집보다 먼저 토큰을 받는다
+        fresh = pick_lowest(item_id, external_id, results, now=_now_naive_utc())
+        if fresh is None:
+            raise LookupError("No search results")
+        save_snapshots(db, [fresh])
+        db.commit()
+        return fresh, "live"
+
+    def refresh_due(
+        self,
+        db: Session,
+        *,
+        client: AsyncNaverShoppingClient,
+        limit: int = LOWEST_PRICE_REFRESH_BATCH,
+        spread_over: Optional[float] = None,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """
+        최근 요청된 상품 중 스냅샷이 max_age의 절반보다 오래된 것을 오래된 순으로 limit개 갱신한다.
+        return: 갱신한 스냅샷 수
+        """
+        now = now or _now_naive_utc()
+        rows = (
+            db.query(LowestPriceSnapshot.item_id, Item.title, Item.external_id)
+            .join(Item, Item.id == LowestPriceSnapshot.item_id)
+            .filter(LowestPriceSnapshot.requested_at >= now - timedelta(hours=LOWEST_PRICE_TRACK_HOURS))
+            .filter(LowestPriceSnapshot.checked_at <= now - timedelta(seconds=self.max_age_seconds / 2))
+            .order_by(LowestPriceSnapshot.checked_at)
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            return 0
+        db.rollback()  # 검색하는 동안 커넥션을 잡고 있지 않게
+
+        results = client.run(
+            client.search_many([search_kwargs(title) for _, title, _ in rows], spread_over=spread_over)
+        )
+        checked_at = _now_naive_utc()
+        fresh = []
+        for (item_id, _, external_id), result in zip(rows, results):
+            if isinstance(result, Exception):
+                print(f"[lowest-price] refresh failed for item {item_id}:", repr(result))
+                continue
+            snap = pick_lowest(int(item_id), external_id, result, now=checked_at)
+            if snap is not None:
+                fresh.append(snap)
+
+        save_snapshots(db, fresh, touch_requested=False)
+        db.commit()
+        self._count("refreshed_by_job", len(fresh))
+        return len(fresh)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "max_age_seconds": self.max_age_seconds,
+            "served": counts,
+            "refresh_flights": self.flight.executed,   # 요청 경로에서 스냅샷 갱신을 시도한 횟수
+            "coalesced": self.flight.coalesced,        # 진행 중인 갱신에 합쳐진 요청 수
+        }
+
+
+lowest_price_service = LowestPriceService()
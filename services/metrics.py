@@ -0,0 +1,310 @@
+# services/metrics.py
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from services.sql_profiler import job_profile
+
+# ---------------------------------------------------------
+# GET /metrics (Prometheus 텍스트 형식)
+# - prometheus_client 없이 Counter / Histogram만 직접 구현한다 (라벨 값 튜플 -> 값).
+# - 기록 비용은 dict 조회 + bisect + lock 한 번 (요청/쿼리/네이버 호출마다 불린다).
+# - 풀 상태 같은 값은 scrape할 때 add_collector로 등록한 함수가 만든다 (gauge).
+#
+# 지표 묶음
+# - http_*:   라우트(경로 템플릿)별 요청 수와 지연 시간 (MetricsMiddleware)
+# - naver_*:  search_products 시도별 지연 시간, 상태 코드, 재시도 수 (sync/async 클라이언트)
+# - db_*:     엔진별 쿼리 수/시간, 요청 하나가 쓴 쿼리 수/시간 (database.py 커서 이벤트)
+# - job_*:    스케줄러 job 실행 시간, 처리한 항목 수, 실패 수 (job_run)
+# ---------------------------------------------------------
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, v in values:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(v)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 -> [버킷별 개수(누적 아님, 마지막 칸은 +Inf), 합계, 개수]
+        self._series: Dict[LabelValues, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return series[2] if series is not None else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, n) in snapshot:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {n}")
+        return lines
+
+
+# 컬렉터: scrape 때 (이름, 설명, 타입, [(라벨 dict, 값)]) 목록을 돌려주는 함수
+Sample = Tuple[Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, fn: Callable[[], Iterable[Family]]) -> None:
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print("[metrics] collector failed:", repr(e))
+                continue
+            for name, documentation, kind, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, v in samples:
+                    lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(v)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# -- HTTP ------------------------------------------------------------
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status"),
+))
+http_request_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"),
+))
+
+# -- Naver -----------------------------------------------------------
+naver_requests = registry.register(Counter(
+    "naver_requests_total",
+    "Naver search attempts by client and outcome (HTTP status, error, quota).",
+    ("client", "status"),
+))
+naver_request_seconds = registry.register(Histogram(
+    "naver_request_duration_seconds", "Naver search attempt latency (HTTP round trip).", ("client",),
+))
+naver_retries = registry.register(Counter(
+    "naver_retries_total", "Naver search attempts retried after 429/5xx.", ("client",),
+))
+
+# -- DB --------------------------------------------------------------
+db_queries = registry.register(Counter(
+    "db_queries_total", "SQL statements executed by engine.", ("engine",),
+))
+db_query_seconds = registry.register(Counter(
+    "db_query_seconds_total", "Time spent executing SQL statements by engine.", ("engine",),
+))
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements executed while serving one HTTP request.", ("route",),
+    buckets=QUERY_COUNT_BUCKETS,
+))
+db_seconds_per_request = registry.register(Histogram(
+    "db_seconds_per_request", "Time spent in SQL statements while serving one HTTP request.", ("route",),
+))
+
+# -- 스케줄러 job ------------------------------------------------------
+job_seconds = registry.register(Histogram(
+    "job_duration_seconds", "Scheduler job run time.", ("job",), buckets=JOB_BUCKETS,
+))
+job_runs = registry.register(Counter(
+    "job_runs_total", "Scheduler job runs by result (ok, failed).", ("job", "result"),
+))
+job_items = registry.register(Counter(
+    "job_items_processed_total", "Items processed by scheduler jobs (saved, refreshed, deleted...).", ("job",),
+))
+
+
+# ---------------------------------------------------------
+# 요청별 DB 사용량
+# - MetricsMiddleware가 요청마다 _DbUsage를 contextvar에 넣고, 커서 이벤트가 거기에 더한다.
+# - 동기 핸들러는 threadpool에서 돌지만 contextvar는 복사되어 같은 _DbUsage 객체를 본다.
+# - 요청 밖(스케줄러 job 등)에서는 엔진별 합계만 남는다.
+# ---------------------------------------------------------
+class _DbUsage:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_request_db: ContextVar[Optional[_DbUsage]] = ContextVar("request_db_usage", default=None)
+
+
+def record_db_query(engine_name: str, seconds: float) -> None:
+    db_queries.inc(engine_name)
+    db_query_seconds.inc(engine_name, amount=seconds)
+    usage = _request_db.get()
+    if usage is not None:
+        usage.queries += 1
+        usage.seconds += seconds
+
+
+def record_naver_attempt(client: str, status: str, seconds: Optional[float] = None) -> None:
+    naver_requests.inc(client, status)
+    if seconds is not None:
+        naver_request_seconds.observe(seconds, client)
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 수/지연 시간과 요청당 DB 쿼리 수/시간을 기록하는 ASGI 미들웨어.
+    route 라벨은 경로 템플릿(/products/{item_id}/lowest-price)이라 라벨 수가 늘지 않는다.
+    BaseHTTPMiddleware와 달리 응답 본문을 다시 감싸지 않는다.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        usage = _DbUsage()
+        token = _request_db.set(usage)
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - t0
+            _request_db.reset(token)
+            # 라우팅이 끝나면 FastAPI가 scope["route"]에 매칭된 라우트를 넣는다
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_request_seconds.observe(elapsed, method, route)
+            db_queries_per_request.observe(usage.queries, route)
+            db_seconds_per_request.observe(usage.seconds, route)
+
+
+class JobRun:
+    __slots__ = ("items",)
+
+    def __init__(self) -> None:
+        self.items = 0
+
+
+@contextmanager
+def job_run(name: str) -> Iterator[JobRun]:
+    """
+    with job_run("item_collect") as run:
+        ...
+        run.items = saved
+    블록이 예외로 끝나면 failed로 센다 (예외는 그대로 올린다).
+    """
+    run = JobRun()
+    t0 = time.perf_counter()
+    result = "failed"
+    try:
+        with job_profile(name):
+            yield run
+        result = "ok"
+    finally:
+        job_seconds.observe(time.perf_counter() - t0, name)
+        job_runs.inc(name, result)
+        if run.items:
+            job_items.inc(name, amount=run.items)
+
+
+def render_metrics() -> str:
+    return registry.render()
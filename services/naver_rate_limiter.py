@@ -0,0 +1,220 @@
+# services/naver_rate_limiter.py
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from datetime import date, datetime
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+# 네이버 오픈API 일일 호출 한도는 한국 시간 자정에 초기화된다
+_QUOTA_TZ = ZoneInfo("Asia/Seoul")
+
+
+class Priority(IntEnum):
+    # 값이 작을수록 우선순위가 높다
+    INTERACTIVE = 0  # 사용자 요청 처리 중인 호출 (/products/{id}/lowest-price 등)
+    BACKGROUND = 1   # 스케줄러 수집/갱신 배치
+
+
+class QuotaExhaustedError(RuntimeError):
+    """해당 우선순위로 쓸 수 있는 오늘의 호출 한도를 다 썼을 때 발생."""
+
+
+class NaverRateLimiter:
+    """
+    네이버 API 호출 전체가 공유하는 토큰 버킷 + 일일 한도 관리자.
+
+    - 초당 한도: per_second 속도로 토큰이 차고, 최대 burst개까지 쌓인다.
+    - 일일 한도: per_day회. 이 중 interactive_daily_reserve 비율은 INTERACTIVE 전용.
+    - 우선순위: BACKGROUND 호출은 버킷에 background_floor 비율 이상의 토큰이 남아 있을 때만,
+      그리고 기다리는 INTERACTIVE 호출이 없을 때만 토큰을 가져간다.
+    - 스레드(동기 클라이언트)와 이벤트 루프(비동기 클라이언트) 양쪽에서 같이 쓸 수 있다.
+    """
+
+    def __init__(
+        self,
+        *,
+        per_second: float,
+        per_day: int,
+        burst: Optional[float] = None,
+        background_floor: float = 0.2,
+        interactive_daily_reserve: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        today: Optional[Callable[[], date]] = None,
+    ) -> None:
+        if per_second <= 0:
+            raise ValueError("per_second must be > 0")
+        if per_day < 1:
+            raise ValueError("per_day must be >= 1")
+        if not 0.0 <= background_floor < 1.0:
+            raise ValueError("background_floor must be in [0, 1)")
+        if not 0.0 <= interactive_daily_reserve < 1.0:
+            raise ValueError("interactive_daily_reserve must be in [0, 1)")
+
+        self.per_second = float(per_second)
+        self.per_day = int(per_day)
+        self.capacity = float(burst if burst is not None else max(1.0, per_second))
+        if self.capacity < 1.0:
+            raise ValueError("burst must be >= 1 (a call takes one token)")
+        # BACKGROUND는 토큰 1개를 가져가고도 floor 이상이 남아야 하므로 floor는 capacity - 1을 넘으면 안 된다
+        # (예: per_second=1, burst 없음 -> capacity=1, 0.2를 그대로 쓰면 배치가 영원히 못 나감)
+        self.background_floor = min(self.capacity * background_floor, self.capacity - 1.0)
+        self.background_daily_limit = int(self.per_day * (1.0 - interactive_daily_reserve))
+        if self.background_daily_limit < 1:
+            raise ValueError(
+                f"per_day={per_day} with interactive_daily_reserve={interactive_daily_reserve} "
+                "leaves no daily quota for BACKGROUND calls"
+            )
+
+        self._clock = clock
+        self._today = today or (lambda: datetime.now(_QUOTA_TZ).date())
+        self._lock = threading.Lock()
+
+        self._tokens = self.capacity
+        self._refilled_at = self._clock()
+        self._day = self._today()
+        self._used_today = 0
+        self._interactive_waiting = 0
+
+        self._acquired: Dict[str, int] = {p.name: 0 for p in Priority}
+        self._throttled: Dict[str, int] = {p.name: 0 for p in Priority}
+        self._rejected: Dict[str, int] = {p.name: 0 for p in Priority}
+        self._retries = 0
+
+    # -- 내부 ---------------------------------------------------------
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._refilled_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.per_second)
+            self._refilled_at = now
+
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._used_today = 0
+
+    def _try_reserve(self, priority: Priority) -> float:
+        """
+        토큰을 가져가면 0을, 아니면 다시 시도하기까지 기다릴 초를 돌려준다.
+        일일 한도를 넘으면 QuotaExhaustedError.
+        """
+        with self._lock:
+            self._refill()
+
+            daily_limit = self.per_day if priority == Priority.INTERACTIVE else self.background_daily_limit
+            if self._used_today >= daily_limit:
+                self._rejected[priority.name] += 1
+                raise QuotaExhaustedError(
+                    f"daily quota exhausted for {priority.name} "
+                    f"(used={self._used_today}, limit={daily_limit})"
+                )
+
+            if priority == Priority.INTERACTIVE:
+                floor = 0.0
+            elif self._interactive_waiting:
+                # 기다리는 사용자 요청이 있으면 배치는 버킷이 가득 찰 때까지 양보
+                floor = self.capacity - 1.0
+            else:
+                floor = self.background_floor
+
+            if self._tokens - 1.0 >= floor:
+                self._tokens -= 1.0
+                self._used_today += 1
+                self._acquired[priority.name] += 1
+                return 0.0
+
+            self._throttled[priority.name] += 1
+            return (floor + 1.0 - self._tokens) / self.per_second
+
+    def _set_waiting(self, priority: Priority, delta: int) -> None:
+        if priority == Priority.INTERACTIVE:
+            with self._lock:
+                self._interactive_waiting += delta
+
+    # -- 공개 API -----------------------------------------------------
+    def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """토큰 1개를 얻을 때까지 현재 스레드를 재운다."""
+        wait = self._try_reserve(priority)
+        if not wait:
+            return
+
+        self._set_waiting(priority, 1)
+        try:
+            while wait:
+                time.sleep(wait)
+                wait = self._try_reserve(priority)
+        finally:
+            self._set_waiting(priority, -1)
+
+    async def acquire_async(self, priority: Priority = Priority.BACKGROUND) -> None:
+        """토큰 1개를 얻을 때까지 이벤트 루프를 막지 않고 기다린다."""
+        wait = self._try_reserve(priority)
+        if not wait:
+            return
+
+        self._set_waiting(priority, 1)
+        try:
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self._try_reserve(priority)
+        finally:
+            self._set_waiting(priority, -1)
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self._retries += 1
+
+    def remaining_today(self, priority: Priority = Priority.INTERACTIVE) -> int:
+        with self._lock:
+            self._refill()
+            limit = self.per_day if priority == Priority.INTERACTIVE else self.background_daily_limit
+            return max(0, limit - self._used_today)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            self._refill()
+            return {
+                "day": self._day.isoformat(),
+                "per_second": self.per_second,
+                "per_day": self.per_day,
+                "used_today": self._used_today,
+                "remaining_today": max(0, self.per_day - self._used_today),
+                "remaining_today_background": max(0, self.background_daily_limit - self._used_today),
+                "tokens": round(self._tokens, 3),
+                "acquired": dict(self._acquired),
+                "throttled": dict(self._throttled),
+                "rejected": dict(self._rejected),
+                "retries": self._retries,
+            }
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float = 0.5,
+    cap: float = 30.0,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    재시도 대기 시간 (exponential backoff + full jitter).
+    서버가 Retry-After를 주면 그보다 짧게 기다리지 않는다.
+    """
+    delay = random.uniform(0.0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def spread_offsets(count: int, spread_over: Optional[float]) -> List[float]:
+    """count개의 호출을 spread_over초 동안 고르게 나눠 시작하도록 한 시작 오프셋 목록."""
+    if count <= 0:
+        return []
+    if not spread_over or count == 1:
+        return [0.0] * count
+    step = spread_over / count
+    return [i * step for i in range(count)]
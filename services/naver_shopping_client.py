@@ -1,12 +1,39 @@
 # services/naver_shopping_client.py
 from __future__ import annotations
 
+import asyncio
+import json
 import re
+import threading
+import time
+from concurrent.futures import Future
 from html import unescape
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar
 
-import requests
+import httpx
 from settings import settings
+from services.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend, SingleFlight
+from services.metrics import naver_retries, record_naver_attempt
+from services.naver_rate_limiter import (
+    NaverRateLimiter,
+    Priority,
+    QuotaExhaustedError,
+    backoff_delay,
+    spread_offsets,
+)
+
+try:  # httpx[http2] 설치 시에만 HTTP/2 사용
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+try:  # orjson 설치 시 응답 JSON을 orjson으로 파싱 (NAVER_JSON_DECODER)
+    import orjson
+except ImportError:
+    orjson = None
+
+T = TypeVar("T")
 
 # 기본 카테고리(예: 키보드)
 KEYBOARD_CATEGORY_ID = "50000151"
@@ -17,10 +44,37 @@ class DataCleaningError(ValueError):
 class NaverAPIError(RuntimeError):
     """네이버 쇼핑 API 호출 자체가 실패했을 때 발생(인증/제한/서버/응답형식 오류 등)."""
 
-NAVER_SHOPPING_SEARCH_URL = "https://openapi.naver.com/v1/search/shop.json"
+NAVER_SHOPPING_SEARCH_URL = f"{settings.NAVER_API_BASE_URL.rstrip('/')}/v1/search/shop.json"
+NAVER_MAX_START = 1000  # 네이버 검색 start 파라미터 최댓값
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 프로세스 전체의 네이버 호출이 공유하는 rate limiter (초당/일일 한도 + 우선순위)
+naver_rate_limiter = NaverRateLimiter(
+    per_second=settings.NAVER_RATE_PER_SECOND,
+    per_day=settings.NAVER_DAILY_QUOTA,
+    interactive_daily_reserve=settings.NAVER_INTERACTIVE_DAILY_RESERVE,
+)
+
 _HTML_TAG_RE = re.compile(r"<[^>]+>")
 _ID_RE = re.compile(r"/(catalog|products)/(\d+)")
 
+
+def select_json_decoder(name: str) -> Callable[[bytes], Any]:
+    """bytes -> 객체. auto는 orjson이 있으면 orjson, 없으면 표준 json."""
+    if name == "json":
+        return json.loads
+    if name in ("auto", "orjson"):
+        if orjson is not None:
+            return orjson.loads
+        if name == "orjson":
+            raise ValueError("NAVER_JSON_DECODER=orjson but orjson is not installed")
+        return json.loads
+    raise ValueError(f"NAVER_JSON_DECODER must be auto, orjson or json (got {name!r})")
+
+
+# 응답 본문(bytes)을 str로 바꾸지 않고 바로 파싱한다 (orjson.JSONDecodeError도 ValueError)
+decode_json = select_json_decoder(settings.NAVER_JSON_DECODER)
+
 def _build_naver_headers() -> Dict[str, str]:
     cid = getattr(settings, "NAVER_CLIENT_ID", None)
     secret = getattr(settings, "NAVER_CLIENT_SECRET", None)
@@ -37,8 +91,16 @@ def clean_title(raw_title: Any) -> str:
     if not isinstance(raw_title, str):
         raise DataCleaningError(f"title is not a string: type={type(raw_title)} value={raw_title!r}")
 
-    s = unescape(raw_title)
-    s = _HTML_TAG_RE.sub("", s).strip()
+    # 대부분의 제목은 엔티티(&...;)가 없고, 태그는 검색어 강조(<b>, </b>)뿐이다
+    # - 엔티티/태그가 없으면 unescape/정규식을 건너뛴다
+    # - 모든 '<'가 <b> 또는 </b>의 시작이면 정규식과 결과가 같으므로 replace로 지운다
+    s = unescape(raw_title) if "&" in raw_title else raw_title
+    if "<" in s:
+        if s.count("<") == s.count("<b>") + s.count("</b>"):
+            s = s.replace("<b>", "").replace("</b>", "")
+        else:
+            s = _HTML_TAG_RE.sub("", s)
+    s = s.strip()
     if not s:
         raise DataCleaningError(f"title is empty after cleaning: raw={raw_title!r}")
     return s
@@ -54,6 +116,8 @@ def parse_price_to_int(raw_price: Any, *, field_name: str = "lprice") -> int:
         return raw_price
 
     if isinstance(raw_price, str):
+        if raw_price.isdigit():  # 네이버 lprice는 보통 "12345"
+            return int(raw_price)
         s = raw_price.strip().replace(",", "")
         if not s:
             raise DataCleaningError(f"{field_name} is empty string")
@@ -72,7 +136,24 @@ def extract_external_id(product_url: str) -> str:
         raise DataCleaningError(f"cannot extract external_id from url: {product_url!r}")
     return m.group(2)
 
-def normalize_naver_item(naver_item: Dict[str, Any]) -> Dict[str, Any]:
+class NaverProduct(NamedTuple):
+    """
+    정제된 네이버 상품 1개 (normalize_naver_item dict와 같은 필드).
+    dict보다 작고 빨리 만들어져서 여러 페이지를 한꺼번에 수집할 때 쓴다. 저장 경로(crud.bulk_upsert_items_from_naver)는 속성으로 읽는다.
+    dict에서 만들 때는 NaverProduct(**data), JSON으로 내보낼 때는 _asdict() (tuple이라 그대로 두면 배열이 된다).
+    """
+    external_id: str
+    title: str
+    product_url: str
+    image_url: str
+    mall_name: str
+    price: int
+
+
+_new_product = tuple.__new__  # NamedTuple.__new__(파이썬 함수)를 거치지 않고 바로 만든다
+
+
+def _clean_naver_item(naver_item: Dict[str, Any]) -> Tuple[str, str, str, str, str, int]:
     if not isinstance(naver_item, dict):
         raise DataCleaningError(f"naver_item is not dict: type={type(naver_item)} value={naver_item!r}")
 
@@ -93,7 +174,17 @@ def normalize_naver_item(naver_item: Dict[str, Any]) -> Dict[str, Any]:
     mall_name = raw_mall.strip() if isinstance(raw_mall, str) else ""
     price = parse_price_to_int(raw_price, field_name="lprice")
 
-    # ✅ 외부 호출/정제 담당자는 여기까지만 책임진다 (DB 필드 매핑용 표준 dict)
+    # ✅ 외부 호출/정제 담당자는 여기까지만 책임진다 (DB 필드 매핑용 표준 레코드, NaverProduct 필드 순서)
+    return external_id, title, product_url, image_url, mall_name, price
+
+
+def normalize_naver_product(naver_item: Dict[str, Any]) -> NaverProduct:
+    return _new_product(NaverProduct, _clean_naver_item(naver_item))
+
+
+def normalize_naver_item(naver_item: Dict[str, Any]) -> Dict[str, Any]:
+    """normalize_naver_product의 dict 버전 (검색 결과 캐시/API 응답처럼 JSON으로 나가는 곳)."""
+    external_id, title, product_url, image_url, mall_name, price = _clean_naver_item(naver_item)
     return {
         "external_id": external_id,
         "title": title,
@@ -103,16 +194,14 @@ def normalize_naver_item(naver_item: Dict[str, Any]) -> Dict[str, Any]:
         "price": price,
     }
 
-def search_products(
+def _build_search_params(
     query: str,
     *,
-    category: str | None = None,
-    display: int = 10,
-    start: int = 1,
-    sort: str = "sim",
-    timeout: float = 5.0,
-    strict: bool = False,
-) -> List[Dict[str, Any]]:
+    category: str | None,
+    display: int,
+    start: int,
+    sort: str,
+) -> Dict[str, Any]:
     if not isinstance(query, str) or not query.strip():
         raise ValueError("query must be a non-empty string")
     if not (1 <= display <= 100):
@@ -123,7 +212,7 @@ def search_products(
     if category is None:
         category = KEYBOARD_CATEGORY_ID
 
-    params = {
+    return {
         "query": query.strip(),
         "display": display,
         "start": start,
@@ -131,16 +220,8 @@ def search_products(
         "category": category,
     }
 
-    try:
-        resp = requests.get(
-            NAVER_SHOPPING_SEARCH_URL,
-            headers=_build_naver_headers(),
-            params=params,
-            timeout=timeout,
-        )
-    except requests.RequestException as e:
-        raise NaverAPIError(f"Naver API request failed: {e!r}") from e
 
+def _parse_search_response(resp: httpx.Response, *, strict: bool, normalize: bool = True) -> List[Dict[str, Any]]:
     if resp.status_code == 200:
         pass
     elif resp.status_code in (401, 403):
@@ -152,13 +233,15 @@ def search_products(
         raise NaverAPIError(f"Naver API error: status={resp.status_code}, body={body_preview!r}")
 
     try:
-        data = resp.json()
+        data = decode_json(resp.content)
     except ValueError as e:
         raise NaverAPIError(f"Invalid JSON response: {e!r}") from e
 
     items = data.get("items")
     if not isinstance(items, list):
         raise NaverAPIError(f"Unexpected response shape: items is not a list (got {type(items)})")
+    if not normalize:
+        return items
 
     normalized: List[Dict[str, Any]] = []
     for it in items:
@@ -171,6 +254,493 @@ def search_products(
 
     return normalized
 
+
+def _quota_error(e: QuotaExhaustedError) -> NaverAPIError:
+    return NaverAPIError(f"Naver API daily quota exhausted: {e}")
+
+
+def _retry_delay(resp: httpx.Response, attempt: int, limiter: NaverRateLimiter) -> Optional[float]:
+    """재시도할 응답이면 기다릴 초를, 아니면 None을 돌려준다."""
+    if resp.status_code not in _RETRY_STATUSES or attempt >= settings.NAVER_MAX_RETRIES:
+        return None
+
+    retry_after: Optional[float] = None
+    raw = resp.headers.get("Retry-After")
+    if raw and raw.isdigit():
+        retry_after = float(raw)
+
+    limiter.record_retry()
+    return backoff_delay(attempt, retry_after=retry_after)
+
+
+def plan_pages(total: int, page_size: int, *, first_start: int = 1) -> List[Tuple[int, int]]:
+    """
+    total개를 page_size 단위로 나눈 (start, display) 목록.
+    네이버 start 최대값(1000)을 넘는 페이지는 만들지 않는다.
+    """
+    if not (1 <= page_size <= 100):
+        raise ValueError("page_size must be between 1 and 100")
+
+    pages: List[Tuple[int, int]] = []
+    start = first_start
+    remaining = total
+    while remaining > 0 and start <= NAVER_MAX_START:
+        display = min(page_size, remaining)
+        pages.append((start, display))
+        start += display
+        remaining -= display
+    return pages
+
+
+# ---------------------------------------------------------
+# 검색 결과 캐시
+# - key: 정규화한 (query, category, display, start, sort, strict)
+# - 값: 정제된 결과 리스트(JSON bytes). TTL 동안 재사용한다.
+# - 같은 key의 동시 miss는 SingleFlight로 묶어서 네이버 호출 1번만 한다.
+#   호출자끼리 같은 리스트를 나눠 갖지 않도록 SingleFlight로는 JSON bytes를 넘기고 각자 디코딩한다.
+# ---------------------------------------------------------
+class SearchResultCache:
+    def __init__(self, backend: CacheBackend, *, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.flight = SingleFlight()
+
+    @staticmethod
+    def make_key(params: Dict[str, Any], *, strict: bool) -> str:
+        query = " ".join(str(params["query"]).split()).casefold()
+        return "naver:search:" + "|".join(
+            [
+                query,
+                str(params["category"]),
+                str(params["display"]),
+                str(params["start"]),
+                str(params["sort"]),
+                "1" if strict else "0",
+            ]
+        )
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        raw = self.backend.get(key)
+        if raw is None:
+            return None
+        return decode_json(raw)
+
+    def put(self, key: str, items: List[Dict[str, Any]]) -> bytes:
+        raw = json.dumps(items, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.backend.set(key, raw, self.ttl)
+        return raw
+
+    def fetch(self, key: str, loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        def load() -> bytes:
+            return self.put(key, loader())
+
+        return decode_json(self.flight.do(key, load))
+
+    async def fetch_async(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        async def load() -> bytes:
+            return self.put(key, await loader())
+
+        return decode_json(await self.flight.do_async(key, load))
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl": self.ttl,
+            **self.backend.stats(),
+            "singleflight": self.flight.stats(),
+        }
+
+
+def _build_search_cache() -> SearchResultCache:
+    backend: CacheBackend
+    if settings.NAVER_CACHE_REDIS_URL:
+        backend = RedisCacheBackend.from_url(settings.NAVER_CACHE_REDIS_URL)
+    else:
+        backend = MemoryCacheBackend(
+            max_entries=settings.NAVER_CACHE_MAX_ENTRIES,
+            max_bytes=settings.NAVER_CACHE_MAX_BYTES,
+        )
+    return SearchResultCache(backend, ttl=settings.NAVER_CACHE_TTL_SECONDS)
+
+
+search_cache = _build_search_cache()
+
+
+# ---------------------------------------------------------
+# 동기 클라이언트 (기존 search_products API)
+# - 프로세스 전역 httpx.Client 하나를 재사용해서 매 호출마다 TLS 핸드셰이크를 하지 않는다.
+# ---------------------------------------------------------
+_sync_client: Optional[httpx.Client] = None
+_sync_client_lock = threading.Lock()
+
+
+def _get_sync_client() -> httpx.Client:
+    global _sync_client
+    if _sync_client is None:
+        with _sync_client_lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+                )
+    return _sync_client
+
+
+def close_sync_client() -> None:
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+
+def search_products(
+    query: str,
+    *,
+    category: str | None = None,
+    display: int = 10,
+    start: int = 1,
+    sort: str = "sim",
+    timeout: float = 5.0,
+    strict: bool = False,
+    priority: Priority,
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    params = _build_search_params(
+        query, category=category, display=display, start=start, sort=sort
+    )
+
+    def load() -> List[Dict[str, Any]]:
+        return _request_search(params, timeout=timeout, strict=strict, priority=priority)
+
+    if not use_cache:
+        return load()
+    return search_cache.fetch(SearchResultCache.make_key(params, strict=strict), load)
+
+
+def _request_search(
+    params: Dict[str, Any],
+    *,
+    timeout: float,
+    strict: bool,
+    priority: Priority,
+) -> List[Dict[str, Any]]:
+    attempt = 0
+    while True:
+        try:
+            naver_rate_limiter.acquire(priority)
+        except QuotaExhaustedError as e:
+            record_naver_attempt("sync", "quota")
+            raise _quota_error(e) from e
+
+        t0 = time.perf_counter()
+        try:
+            resp = _get_sync_client().get(
+                NAVER_SHOPPING_SEARCH_URL,
+                headers=_build_naver_headers(),
+                params=params,
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            record_naver_attempt("sync", "error", time.perf_counter() - t0)
+            raise NaverAPIError(f"Naver API request failed: {e!r}") from e
+        record_naver_attempt("sync", str(resp.status_code), time.perf_counter() - t0)
+
+        delay = _retry_delay(resp, attempt, naver_rate_limiter)
+        if delay is None:
+            return _parse_search_response(resp, strict=strict)
+
+        naver_retries.inc("sync")
+        time.sleep(delay)
+        attempt += 1
+
+
+class PageError(NamedTuple):
+    start: int
+    error: BaseException
+
+
+class SearchPagesResult(NamedTuple):
+    """search_pages 결과: 앞에서부터 이어지는 페이지들 + 실패한 페이지 목록."""
+    pages: List[List[Dict[str, Any]]]
+    errors: List[PageError]
+
+
+# ---------------------------------------------------------
+# 비동기 클라이언트
+# - 커넥션 풀(httpx.AsyncClient) 하나를 오래 유지한다 (가능하면 HTTP/2).
+# - max_in_flight로 동시에 나가는 요청 수를 제한한다.
+# - 모든 호출은 공유 rate limiter를 거친다 (기본 우선순위 BACKGROUND).
+# - 동기 코드(스케줄러 job 등)에서는 run()으로 클라이언트 전용 이벤트 루프에서 실행한다.
+#   httpx.AsyncClient는 처음 사용된 이벤트 루프에 묶이므로, 한 인스턴스를
+#   `async with`(호출자 루프)와 run()(전용 루프)에서 섞어 쓰면 안 된다.
+# ---------------------------------------------------------
+class AsyncNaverShoppingClient:
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 8,
+        timeout: float = 5.0,
+        http2: bool = True,
+        max_connections: int | None = None,
+        priority: Priority = Priority.BACKGROUND,
+        rate_limiter: NaverRateLimiter | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.http2 = http2 and _HTTP2_AVAILABLE
+        self.max_connections = max_connections or max_in_flight
+        self.priority = priority
+        self.rate_limiter = rate_limiter or naver_rate_limiter
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    # -- lifecycle ---------------------------------------------------
+    async def __aenter__(self) -> "AsyncNaverShoppingClient":
+        self._ensure_client()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+
+    def close(self) -> None:
+        """run()으로 쓰던 클라이언트를 정리하고 전용 루프 스레드를 멈춘다."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = None
+            self._loop_thread = None
+
+        if loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """동기 코드에서 코루틴을 클라이언트 전용 이벤트 루프에서 실행하고 결과를 기다린다."""
+        return self._submit(coro).result()
+
+    def _submit(self, coro: Awaitable[T]) -> "Future[T]":
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="naver-client-loop",
+                    daemon=True,
+                )
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    # -- API ---------------------------------------------------------
+    async def search_products(
+        self,
+        query: str,
+        *,
+        category: str | None = None,
+        display: int = 10,
+        start: int = 1,
+        sort: str = "sim",
+        strict: bool = False,
+        priority: Priority | None = None,
+        delay: float = 0.0,
+        use_cache: bool = True,
+        normalize: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        normalize=False면 네이버 응답의 items를 그대로 돌려준다 (정규화는 호출자가, 캐시는 쓰지 않음).
+        """
+        params = _build_search_params(
+            query, category=category, display=display, start=start, sort=sort
+        )
+        if priority is None:
+            priority = self.priority
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async def load() -> List[Dict[str, Any]]:
+            return await self._request_search(params, strict=strict, priority=priority, normalize=normalize)
+
+        if not use_cache or not normalize:
+            return await load()
+        return await search_cache.fetch_async(
+            SearchResultCache.make_key(params, strict=strict), load
+        )
+
+    async def _request_search(
+        self,
+        params: Dict[str, Any],
+        *,
+        strict: bool,
+        priority: Priority,
+        normalize: bool = True,
+    ) -> List[Dict[str, Any]]:
+        client = self._ensure_client()
+
+        assert self._semaphore is not None
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                try:
+                    await self.rate_limiter.acquire_async(priority)
+                except QuotaExhaustedError as e:
+                    record_naver_attempt("async", "quota")
+                    raise _quota_error(e) from e
+
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.get(
+                        NAVER_SHOPPING_SEARCH_URL,
+                        headers=_build_naver_headers(),
+                        params=params,
+                    )
+                except httpx.HTTPError as e:
+                    record_naver_attempt("async", "error", time.perf_counter() - t0)
+                    raise NaverAPIError(f"Naver API request failed: {e!r}") from e
+                record_naver_attempt("async", str(resp.status_code), time.perf_counter() - t0)
+
+            retry_in = _retry_delay(resp, attempt, self.rate_limiter)
+            if retry_in is None:
+                return _parse_search_response(resp, strict=strict, normalize=normalize)
+
+            naver_retries.inc("async")
+            # 재시도 대기 중에는 in-flight 슬롯을 반납한다
+            await asyncio.sleep(retry_in)
+            attempt += 1
+
+    async def search_pages(
+        self,
+        query: str,
+        *,
+        category: str | None = None,
+        total: int = 100,
+        page_size: int = 50,
+        sort: str = "sim",
+        strict: bool = False,
+        spread_over: float | None = None,
+    ) -> SearchPagesResult:
+        """
+        total개를 page_size 단위 페이지로 나눠 동시에 요청한다 (동시 요청 수는 max_in_flight).
+        spread_over(초)를 주면 요청 시작 시각을 그 구간에 고르게 나눈다.
+        한 페이지가 실패해도 나머지 요청은 끝까지 기다리고, 실패는 errors에 (start, 예외)로 모은다.
+        pages는 페이지 순서대로이며, 빈 페이지나 실패한 페이지 이후의 페이지는 버린다.
+        """
+        pages = plan_pages(total, page_size)
+        if not pages:
+            return SearchPagesResult([], [])
+
+        offsets = spread_offsets(len(pages), spread_over)
+        results = await asyncio.gather(
+            *(
+                self.search_products(
+                    query,
+                    category=category,
+                    display=display,
+                    start=start,
+                    sort=sort,
+                    strict=strict,
+                    delay=offset,
+                )
+                for (start, display), offset in zip(pages, offsets)
+            ),
+            return_exceptions=True,
+        )
+
+        errors = [
+            PageError(start, page)
+            for (start, _), page in zip(pages, results)
+            if isinstance(page, BaseException)
+        ]
+        ordered: List[List[Dict[str, Any]]] = []
+        for page in results:
+            if isinstance(page, BaseException) or not page:
+                break
+            ordered.append(page)
+        return SearchPagesResult(ordered, errors)
+
+    async def search_many(
+        self,
+        calls: List[Dict[str, Any]],
+        *,
+        return_exceptions: bool = True,
+        spread_over: float | None = None,
+    ) -> List[Any]:
+        """
+        search_products 인자(dict) 목록을 동시에 실행한다.
+        spread_over(초)를 주면 요청 시작 시각을 그 구간에 고르게 나눈다.
+        return_exceptions=True면 실패한 요청은 예외 객체로 채워서 돌려준다.
+        """
+        offsets = spread_offsets(len(calls), spread_over)
+        return await asyncio.gather(
+            *(
+                self.search_products(**kw, delay=offset)
+                for kw, offset in zip(calls, offsets)
+            ),
+            return_exceptions=return_exceptions,
+        )
+
+
+REFRESH_SEARCH_DISPLAY = 20  # 검색 순위 변동 대비
+
+
+def find_product_price(items: List[Dict[str, Any]], *, query: str, product_url: str) -> int:
+    for item in items:
+        if item["product_url"] == product_url:
+            return item["price"]
+
+    raise NaverAPIError(
+        f"Product not found in search results during refresh "
+        f"(query={query}, product_url={product_url})"
+    )
+
+
 def refresh_product_price(
     *,
     query: str,
@@ -189,16 +759,10 @@ def refresh_product_price(
     items = search_products(
         query=query,
         category=category,
-        display=20,  # 검색 순위 변동 대비
+        display=REFRESH_SEARCH_DISPLAY,
         strict=False,
         timeout=timeout,
+        priority=Priority.BACKGROUND,
     )
 
-    for item in items:
-        if item["product_url"] == product_url:
-            return item["price"]
-
-    raise NaverAPIError(
-        f"Product not found in search results during refresh "
-        f"(query={query}, product_url={product_url})"
-    )
\ No newline at end of file
+    return find_product_price(items, query=query, product_url=product_url)
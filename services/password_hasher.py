@@ -0,0 +1,179 @@
+# services/password_hasher.py
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from passlib.context import CryptContext
+
+# ---------------------------------------------------------
+# 비밀번호 해싱 전용 프로세스 풀
+# - pbkdf2는 호출마다 수십 ms CPU를 쓴다. 요청 스레드/이벤트 루프 대신 별도 프로세스에서 돌린다.
+# - 동시에 받을 수 있는 작업 수 = 워커 수 + 대기열 길이. 넘치면 PasswordHasherBusy (라우터에서 503).
+# - PASSWORD_HASH_TIMEOUT_SECONDS 안에 결과가 없으면 PasswordHasherTimeout (역시 503).
+# - 워커 프로세스가 죽어서 풀이 깨지면(BrokenProcessPool) 풀을 버리고 다음 작업 때 새로 띄운다.
+# - 워커는 spawn으로 띄운다 (스레드가 도는 서버 프로세스를 fork하지 않도록).
+# ---------------------------------------------------------
+PASSWORD_HASH_WORKERS = max(1, int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))))
+PASSWORD_HASH_QUEUE_LIMIT = max(0, int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", str(PASSWORD_HASH_WORKERS * 8))))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+
+# 워커 프로세스에서 실행되는 함수 (pickle 가능해야 하므로 모듈 최상위에 둔다)
+def hash_password_sync(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password_sync(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """워커와 대기열이 모두 찬 상태 (또는 풀이 깨져서 이번 작업을 못 끝낸 경우)."""
+
+
+class PasswordHasherTimeout(PasswordHasherBusy):
+    """제한 시간 안에 해싱 결과를 받지 못함."""
+
+
+class PasswordHasher:
+    def __init__(self, *, workers: int, queue_limit: int) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.pool_restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_executor(self, broken: ProcessPoolExecutor) -> None:
+        # 깨진 풀만 버린다 (다른 작업이 이미 새 풀로 바꿨으면 그대로 둔다)
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+            self.pool_restarts += 1
+        print("[password-hasher] process pool broken, starting a new one")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> "Future[Any]":
+        # 자리가 없으면 기다리지 않고 바로 거절한다
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy()
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            executor = self._get_executor()
+            try:
+                fut = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # 이전 작업 중에 워커가 죽은 풀: 새 풀로 한 번만 다시 넣는다
+                self._discard_executor(executor)
+                executor = self._get_executor()
+                fut = executor.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        fut.add_done_callback(self._release)
+        fut.add_done_callback(lambda f: self._check_broken(f, executor))
+        return fut
+
+    def _check_broken(self, fut: "Future[Any]", executor: ProcessPoolExecutor) -> None:
+        if not fut.cancelled() and isinstance(fut.exception(), BrokenProcessPool):
+            self._discard_executor(executor)
+
+    def _release(self, _fut: Optional["Future[Any]"]) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if _fut is not None:
+                self.completed += 1
+        self._slots.release()
+
+    def _timed_out(self) -> PasswordHasherTimeout:
+        with self._lock:
+            self.timeouts += 1
+        return PasswordHasherTimeout(f"no result within {PASSWORD_HASH_TIMEOUT_SECONDS}s")
+
+    # 동기 라우터용 (요청 스레드는 결과만 기다린다)
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        fut = self._submit(fn, *args)
+        try:
+            return fut.result(PASSWORD_HASH_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            fut.cancel()  # 아직 대기열에 있으면 워커를 쓰지 않게
+            raise self._timed_out() from None
+        except BrokenProcessPool:
+            raise PasswordHasherBusy("password hashing pool restarted") from None
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password_sync, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(verify_password_sync, password, hashed_password)
+
+    # async 라우터용 (이벤트 루프도 스레드풀 슬롯도 잡지 않는다)
+    async def _run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        fut = asyncio.wrap_future(self._submit(fn, *args))
+        try:
+            # 시간이 지나면 wait_for가 fut을 취소한다 (대기열에 있던 작업은 워커를 쓰지 않음)
+            return await asyncio.wait_for(fut, PASSWORD_HASH_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise self._timed_out() from None
+        except BrokenProcessPool:
+            raise PasswordHasherBusy("password hashing pool restarted") from None
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(hash_password_sync, password)
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        return await self._run_async(verify_password_sync, password, hashed_password)
+
+    def warm_up(self) -> None:
+        # 워커 프로세스를 미리 띄워서 첫 로그인이 spawn 시간을 기다리지 않게 한다
+        executor = self._get_executor()
+        for f in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            f.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "pool_restarts": self.pool_restarts,
+            }
+
+
+password_hasher = PasswordHasher(workers=PASSWORD_HASH_WORKERS, queue_limit=PASSWORD_HASH_QUEUE_LIMIT)
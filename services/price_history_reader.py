@@ -0,0 +1,171 @@
+# services/price_history_reader.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from models import PriceHistory, PriceRollupDaily, PriceRollupHourly
+from services.price_rollup import PRICE_HISTORY_RETENTION_DAYS, day_bucket, hour_bucket
+
+RESOLUTIONS = ("raw", "hourly", "daily")
+
+# auto 해상도 기준: 구간 길이가 이 값 이하이면 해당 해상도를 쓴다
+RAW_MAX_SPAN = timedelta(days=2)
+HOURLY_MAX_SPAN = timedelta(days=31)
+
+# 한 번에 DB에서 읽는 행 수. 요청 하나가 들고 있는 행은 최대 이만큼이다.
+FETCH_CHUNK_SIZE = 500
+
+_ROLLUPS = {
+    "hourly": (PriceRollupHourly, hour_bucket),
+    "daily": (PriceRollupDaily, day_bucket),
+}
+
+
+def to_naive_utc(ts: datetime) -> datetime:
+    # DB의 checked_at은 UTC naive로 저장된다
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def choose_resolution(start: datetime, end: datetime, *, now: Optional[datetime] = None) -> str:
+    """
+    조회 구간에 맞는 해상도를 고른다.
+    - 원본 보관 기간 밖이 섞이면 원본은 빠진 구간이 있으므로 롤업만 쓴다.
+    - 그 외에는 구간이 짧을수록 촘촘한 해상도.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+    span = end - start
+    raw_available = start >= now - timedelta(days=PRICE_HISTORY_RETENTION_DAYS)
+
+    if raw_available and span <= RAW_MAX_SPAN:
+        return "raw"
+    if span <= HOURLY_MAX_SPAN:
+        return "hourly"
+    return "daily"
+
+
+# ---------------------------------------------------------
+# 커서: "<resolution>~<마지막 시각 ISO>~<마지막 price_history id>"
+# - raw는 (checked_at, id), 롤업은 (bucket_start)로 이어 읽는다 (롤업은 상품당 시각이 유일).
+# ---------------------------------------------------------
+def encode_cursor(resolution: str, ts: datetime, row_id: int = 0) -> str:
+    return f"{resolution}~{ts.isoformat()}~{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, datetime, int]:
+    try:
+        resolution, ts, row_id = cursor.split("~")
+        if resolution not in RESOLUTIONS:
+            raise ValueError(resolution)
+        return resolution, datetime.fromisoformat(ts), int(row_id)
+    except ValueError as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+
+def _raw_chunk(
+    db: Session,
+    item_id: int,
+    start: datetime,
+    end: datetime,
+    after: Optional[Tuple[datetime, int]],
+    size: int,
+) -> List[Tuple[Dict[str, Any], Tuple[datetime, int]]]:
+    # ix_ph_item_checked(item_id, checked_at) 범위 스캔 + (checked_at, id) keyset
+    stmt = (
+        select(PriceHistory.id, PriceHistory.price, PriceHistory.checked_at)
+        .where(PriceHistory.item_id == item_id)
+        .where(PriceHistory.checked_at >= start)
+        .where(PriceHistory.checked_at < end)
+    )
+    if after is not None:
+        after_ts, after_id = after
+        stmt = stmt.where(
+            or_(
+                PriceHistory.checked_at > after_ts,
+                and_(PriceHistory.checked_at == after_ts, PriceHistory.id > after_id),
+            )
+        )
+    rows = db.execute(
+        stmt.order_by(PriceHistory.checked_at, PriceHistory.id).limit(size)
+    ).all()
+    return [
+        ({"t": checked_at.isoformat(), "price": int(price)}, (checked_at, int(ph_id)))
+        for ph_id, price, checked_at in rows
+    ]
+
+
+def _rollup_chunk(
+    db: Session,
+    resolution: str,
+    item_id: int,
+    start: datetime,
+    end: datetime,
+    after: Optional[Tuple[datetime, int]],
+    size: int,
+) -> List[Tuple[Dict[str, Any], Tuple[datetime, int]]]:
+    model, bucket_fn = _ROLLUPS[resolution]
+    # 시작 시각이 걸쳐 있는 버킷도 포함한다 (PK (item_id, bucket_start) 범위 스캔)
+    stmt = (
+        select(model)
+        .where(model.item_id == item_id)
+        .where(model.bucket_start >= bucket_fn(start))
+        .where(model.bucket_start < end)
+    )
+    if after is not None:
+        stmt = stmt.where(model.bucket_start > after[0])
+    rows = db.execute(stmt.order_by(model.bucket_start).limit(size)).scalars().all()
+    return [
+        (
+            {
+                "t": r.bucket_start.isoformat(),
+                "open": r.open_price,
+                "high": r.high_price,
+                "low": r.low_price,
+                "close": r.close_price,
+                "count": r.sample_count,
+            },
+            (r.bucket_start, 0),
+        )
+        for r in rows
+    ]
+
+
+def iter_price_points(
+    db: Session,
+    *,
+    item_id: int,
+    resolution: str,
+    start: datetime,
+    end: datetime,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int,
+    chunk_size: int = FETCH_CHUNK_SIZE,
+) -> Iterator[Tuple[Dict[str, Any], Tuple[datetime, int]]]:
+    """
+    (점, keyset 위치)를 시간 순으로 최대 limit개 내보낸다.
+    DB에서는 chunk_size개씩 keyset으로 이어 읽으므로 기록 길이와 상관없이 메모리는 chunk 1개 분량이다.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"unknown resolution: {resolution!r}")
+
+    remaining = limit
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        if resolution == "raw":
+            chunk = _raw_chunk(db, item_id, start, end, after, size)
+        else:
+            chunk = _rollup_chunk(db, resolution, item_id, start, end, after, size)
+
+        for point in chunk:
+            yield point
+        if len(chunk) < size:
+            return
+
+        after = chunk[-1][1]
+        remaining -= len(chunk)
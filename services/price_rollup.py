@@ -0,0 +1,287 @@
+# services/price_rollup.py
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Set, Tuple, Type
+
+from sqlalchemy import delete, desc, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from crud import upsert_rows_statement
+from models import (
+    Alert,
+    PriceHistory,
+    PriceRollupDaily,
+    PriceRollupHourly,
+    RollupState,
+)
+
+ROLLUP_STATE_NAME = "price_rollup"
+ROLLUP_BATCH_SIZE = 5000
+COMPACT_BATCH_SIZE = 5000
+# 원본 price_history 보관 기간(일). 이보다 오래된 구간은 롤업으로만 조회할 수 있다.
+PRICE_HISTORY_RETENTION_DAYS = int(os.getenv("PRICE_HISTORY_RETENTION_DAYS", "90"))
+KEEP_LATEST_PER_ITEM = 2  # 직전 가격(DROP_FROM_PREV) 판별에 최근 2건이 필요
+# checked_at이 이보다 최근인 행이 나오면 그 앞에서 롤업을 멈춘다 (아래 rollup_price_history 참고)
+ROLLUP_SAFETY_LAG_MINUTES = int(os.getenv("ROLLUP_SAFETY_LAG_MINUTES", "10"))
+
+_ROLLUP_COLUMNS = [
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "sample_count",
+    "first_ph_id",
+    "last_ph_id",
+]
+
+
+def _now_naive_utc() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def hour_bucket(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# ---------------------------------------------------------
+# 롤업 (price_history -> price_rollup_hourly / price_rollup_daily)
+# - rollup_state.last_ph_id 이후의 price_history만 id 순서로 읽는다.
+# - id는 여러 트랜잭션(수집 writer, 갱신, /shopping/search)이 동시에 받으므로 commit 순서와 다르다.
+#   최근 행까지 읽으면 아직 commit 안 된 더 작은 id를 건너뛰고 영영 놓친다 (압축 때 롤업 없이 삭제됨).
+#   그래서 checked_at이 ROLLUP_SAFETY_LAG_MINUTES 안쪽인 첫 행 앞에서 멈춘다
+#   (트랜잭션이 그보다 오래 열려 있지 않다는 전제).
+# - 버킷별 OHLC는 price_history.id 순서 기준(open=가장 작은 id, close=가장 큰 id)
+# ---------------------------------------------------------
+def _aggregate(
+    rows: Iterable[Tuple[int, int, int, datetime]],
+    bucket_fn,
+) -> Dict[Tuple[int, datetime], Dict[str, Any]]:
+    buckets: Dict[Tuple[int, datetime], Dict[str, Any]] = {}
+    for ph_id, item_id, price, checked_at in rows:
+        key = (item_id, bucket_fn(checked_at))
+        b = buckets.get(key)
+        if b is None:
+            buckets[key] = {
+                "item_id": item_id,
+                "bucket_start": key[1],
+                "open_price": price,
+                "high_price": price,
+                "low_price": price,
+                "close_price": price,
+                "sample_count": 1,
+                "first_ph_id": ph_id,
+                "last_ph_id": ph_id,
+            }
+            continue
+
+        b["high_price"] = max(b["high_price"], price)
+        b["low_price"] = min(b["low_price"], price)
+        b["sample_count"] += 1
+        if ph_id < b["first_ph_id"]:
+            b["first_ph_id"], b["open_price"] = ph_id, price
+        if ph_id > b["last_ph_id"]:
+            b["last_ph_id"], b["close_price"] = ph_id, price
+    return buckets
+
+
+def _merge_into(
+    db: Session,
+    model: Type[Any],
+    buckets: Dict[Tuple[int, datetime], Dict[str, Any]],
+) -> None:
+    if not buckets:
+        return
+
+    # 배치는 id(≈시간) 순서라 버킷 시각 범위가 좁다. (item_id, bucket_start) PK 범위 조회로 기존 버킷을 읽는다.
+    item_ids = {item_id for item_id, _ in buckets}
+    starts = [start for _, start in buckets]
+    existing = db.execute(
+        select(model)
+        .where(model.item_id.in_(item_ids))
+        .where(model.bucket_start.between(min(starts), max(starts)))
+    ).scalars()
+    for old in existing:
+        b = buckets.get((old.item_id, old.bucket_start))
+        if b is None:
+            continue
+        b["high_price"] = max(b["high_price"], old.high_price)
+        b["low_price"] = min(b["low_price"], old.low_price)
+        b["sample_count"] += old.sample_count
+        if old.first_ph_id < b["first_ph_id"]:
+            b["first_ph_id"], b["open_price"] = old.first_ph_id, old.open_price
+        if old.last_ph_id > b["last_ph_id"]:
+            b["last_ph_id"], b["close_price"] = old.last_ph_id, old.close_price
+
+    stmt = upsert_rows_statement(
+        db,
+        model,
+        None,
+        key_columns=["item_id", "bucket_start"],
+        update_columns=_ROLLUP_COLUMNS,
+    )
+    db.connection().execute(stmt, list(buckets.values()))
+
+
+def _get_state(db: Session, *, lock: bool = False) -> RollupState:
+    """
+    lock=True면 SELECT ... FOR UPDATE로 읽는다 (commit까지 다른 롤업이 기다림).
+    price_rollup job과 price_compaction job(안에서 롤업을 먼저 돈다)은 임대가 달라서 동시에 돌 수 있다.
+    """
+    stmt = select(RollupState).where(RollupState.name == ROLLUP_STATE_NAME)
+    if lock:
+        stmt = stmt.with_for_update()
+    state = db.execute(stmt.execution_options(populate_existing=True)).scalar_one_or_none()
+    if state is None:
+        try:
+            with db.begin_nested():
+                db.add(RollupState(name=ROLLUP_STATE_NAME, last_ph_id=0))
+        except IntegrityError:
+            pass  # 동시에 다른 쪽이 먼저 만들었다
+        state = db.execute(stmt.execution_options(populate_existing=True)).scalar_one()
+    return state
+
+
+def rollup_price_history(
+    db: Session,
+    *,
+    batch_size: int = ROLLUP_BATCH_SIZE,
+    safety_lag: timedelta = timedelta(minutes=ROLLUP_SAFETY_LAG_MINUTES),
+) -> int:
+    """
+    아직 롤업되지 않은 price_history 중 safety_lag보다 오래된 구간을 시간/일 롤업에 반영한다. 배치마다 commit.
+    return: 반영한 price_history 행 수
+    """
+    processed = 0
+
+    # 이 id부터는 아직 늦게 commit되는 행이 있을 수 있다.
+    # 최근 행이 없으면 지금 보이는 마지막 행까지만 (실행 중에 들어오는 행은 다음 실행에서)
+    stop_id = db.execute(
+        select(func.min(PriceHistory.id))
+        .where(PriceHistory.id > _get_state(db).last_ph_id)
+        .where(PriceHistory.checked_at >= _now_naive_utc() - safety_lag)
+    ).scalar()
+    if stop_id is None:
+        stop_id = (db.execute(select(func.max(PriceHistory.id))).scalar() or 0) + 1
+    db.commit()
+
+    while True:
+        # 배치마다 상태 행을 잠그고 다시 읽는다: 다른 롤업이 같은 구간을 먼저 반영했으면 그 뒤부터
+        state = _get_state(db, lock=True)
+        rows = db.execute(
+            select(PriceHistory.id, PriceHistory.item_id, PriceHistory.price, PriceHistory.checked_at)
+            .where(PriceHistory.id > state.last_ph_id)
+            .where(PriceHistory.id < stop_id)
+            .order_by(PriceHistory.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            db.commit()
+            break
+
+        rows = [(int(i), int(item_id), int(price), checked_at) for i, item_id, price, checked_at in rows]
+        _merge_into(db, PriceRollupHourly, _aggregate(rows, hour_bucket))
+        _merge_into(db, PriceRollupDaily, _aggregate(rows, day_bucket))
+
+        state.last_ph_id = rows[-1][0]
+        state.updated_at = _now_naive_utc()
+        db.commit()
+
+        processed += len(rows)
+        if len(rows) < batch_size:
+            break
+
+    return processed
+
+
+# ---------------------------------------------------------
+# 보관 정책 (오래된 price_history 압축)
+# - retain_days보다 오래됐고 이미 롤업에 반영된 원본 행만 지운다.
+# - 알람이 참조 중인 행(alerts.last_triggered_ph_id)과 상품별 최근 2건은 남긴다.
+# ---------------------------------------------------------
+def _latest_ids(db: Session, cutoff: datetime) -> Set[int]:
+    """
+    cutoff 이전 행 중 상품별 최근 KEEP_LATEST_PER_ITEM건에 드는 행 id.
+    cutoff 이후 행은 지울 대상이 아니므로 window는 cutoff 이전 행에만 돌리고,
+    cutoff 이후 행 수만큼 순위를 밀어서 본다 (ix_ph_item_checked 범위 count).
+    시작 시점에 한 번만 구한다. 이후 들어오는 행은 더 최신이라 이 집합을 보수적으로만 만든다.
+    """
+    rn = func.row_number().over(
+        partition_by=PriceHistory.item_id,
+        order_by=(desc(PriceHistory.checked_at), desc(PriceHistory.id)),
+    ).label("rn")
+    old = (
+        select(PriceHistory.id, PriceHistory.item_id, rn)
+        .where(PriceHistory.checked_at < cutoff)
+        .subquery()
+    )
+    recent = aliased(PriceHistory)
+    newer = (
+        select(func.count())
+        .where(recent.item_id == old.c.item_id)
+        .where(recent.checked_at >= cutoff)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(old.c.id)
+        .where(old.c.rn <= KEEP_LATEST_PER_ITEM)
+        .where(old.c.rn + newer <= KEEP_LATEST_PER_ITEM)
+    )
+    return {int(ph_id) for (ph_id,) in db.execute(stmt)}
+
+
+def compact_price_history(
+    db: Session,
+    *,
+    retain_days: int,
+    batch_size: int = COMPACT_BATCH_SIZE,
+) -> int:
+    """
+    retain_days보다 오래된 원본 price_history를 롤업만 남기고 삭제한다. 배치마다 commit.
+    return: 삭제한 행 수
+    """
+    if retain_days < 1:
+        raise ValueError("retain_days must be >= 1")
+
+    # 지우기 전에 롤업부터 최신으로
+    rollup_price_history(db)
+    watermark = _get_state(db).last_ph_id
+    cutoff = _now_naive_utc() - timedelta(days=retain_days)
+
+    referenced = select(Alert.last_triggered_ph_id).where(Alert.last_triggered_ph_id.is_not(None))
+    keep = _latest_ids(db, cutoff)
+
+    deleted = 0
+    after_id = 0
+    while True:
+        candidates = db.execute(
+            select(PriceHistory.id)
+            .where(PriceHistory.id > after_id)
+            .where(PriceHistory.id <= watermark)
+            .where(PriceHistory.checked_at < cutoff)
+            .where(PriceHistory.id.not_in(referenced))
+            .order_by(PriceHistory.id)
+            .limit(batch_size)
+        ).all()
+        if not candidates:
+            break
+
+        after_id = int(candidates[-1][0])
+        ids: List[int] = [int(ph_id) for (ph_id,) in candidates if int(ph_id) not in keep]
+
+        if ids:
+            db.execute(delete(PriceHistory).where(PriceHistory.id.in_(ids)))
+            deleted += len(ids)
+        db.commit()
+
+        if len(candidates) < batch_size:
+            break
+
+    return deleted
+
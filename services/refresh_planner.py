@@ -0,0 +1,93 @@
+# services/refresh_planner.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from models import Item
+from services.naver_shopping_client import KEYBOARD_CATEGORY_ID, REFRESH_SEARCH_DISPLAY
+
+
+@dataclass
+class RefreshGroup:
+    """
+    같은 검색어(query)를 공유하는 상품 묶음.
+    검색 1회(결과 페이지 1개)로 묶음 안의 모든 상품 가격을 찾는다.
+    """
+    query: str
+    category: str
+    items: List[Item] = field(default_factory=list)
+
+    @property
+    def display(self) -> int:
+        # 상품 하나당 기존과 같은 검색 깊이(REFRESH_SEARCH_DISPLAY)를 보장하되 최대 100
+        return min(100, REFRESH_SEARCH_DISPLAY * len(self.items))
+
+    def search_kwargs(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "category": self.category,
+            "display": self.display,
+        }
+
+
+def normalize_query(title: str) -> str:
+    # 공백 차이만 있는 제목은 같은 검색어로 취급
+    return " ".join(title.split())
+
+
+def plan_refresh(
+    items: Iterable[Item],
+    *,
+    category: str | None = None,
+) -> List[RefreshGroup]:
+    """
+    갱신 대상 상품들을 중복 제거(item.id 기준)한 뒤 검색어별로 묶는다.
+    반환되는 묶음 수 == 실제 네이버 검색 호출 수.
+    """
+    if category is None:
+        category = KEYBOARD_CATEGORY_ID
+
+    groups: Dict[str, RefreshGroup] = {}
+    seen_ids = set()
+
+    for item in items:
+        if item.id in seen_ids:
+            continue
+        seen_ids.add(item.id)
+
+        query = normalize_query(item.title or "")
+        if not query:
+            continue
+
+        group = groups.get(query)
+        if group is None:
+            group = groups[query] = RefreshGroup(query=query, category=category)
+        group.items.append(item)
+
+    return list(groups.values())
+
+
+def resolve_group_prices(
+    group: RefreshGroup,
+    results: List[Dict[str, Any]],
+) -> Dict[int, Optional[int]]:
+    """
+    공유 검색 결과 한 페이지에서 묶음 안 상품들의 가격을 찾는다.
+    product_url이 일치하는 결과를 우선하고, 없으면 external_id로 찾는다.
+    return: {item_id: price 또는 None(검색 결과에 없음)}
+    """
+    by_url: Dict[str, int] = {}
+    by_external_id: Dict[str, int] = {}
+    for r in results:
+        # 같은 키가 여러 번 나오면 첫 번째(검색 순위가 높은) 결과를 쓴다
+        by_url.setdefault(r["product_url"], r["price"])
+        by_external_id.setdefault(r["external_id"], r["price"])
+
+    prices: Dict[int, Optional[int]] = {}
+    for item in group.items:
+        price = by_url.get(item.product_url)
+        if price is None:
+            price = by_external_id.get(item.external_id)
+        prices[item.id] = price
+    return prices
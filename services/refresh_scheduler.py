@@ -0,0 +1,197 @@
+# services/refresh_scheduler.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import exists, func, or_, update
+from sqlalchemy.orm import Session
+
+from models import Item, PriceHistory, Wishlist
+from services.naver_shopping_client import AsyncNaverShoppingClient
+from services.refresh_planner import normalize_query
+from services.shopping_service import refresh_items
+
+# ---------------------------------------------------------
+# 우선순위 가격 갱신
+# - 상품마다 "다음 확인 시각" = last_checked_at + 갱신 주기
+#   · wishlist에 있는 상품: REFRESH_WATCHED_INTERVAL_MINUTES
+#   · wishlist에 없는 상품: REFRESH_UNWATCHED_INTERVAL_HOURS
+#   · 최근 7일 가격 변동 횟수(price_history 행 수)만큼 주기를 나눈다 (최소 REFRESH_MIN_INTERVAL_MINUTES)
+# - tick마다 확인 시각이 지난 상품을 오래된 순으로 골라, 예산(검색 호출 수) 안에서만 갱신한다.
+#   예산 = REFRESH_CALLS_PER_HOUR * tick 길이
+# - 후보는 전체를 읽지 않는다. wishlist 상품 / 나머지 상품을 각각 last_checked_at 오래된 순으로
+#   예산 * REFRESH_CANDIDATES_PER_CALL개까지만 읽고(ix_items_active_checked), 그 안에서 due_at을 계산한다.
+# - 같은 검색어를 쓰는 상품은 검색 1번으로 같이 갱신되므로, 아직 때가 안 된 상품도 덤으로 끼워 넣는다.
+# ---------------------------------------------------------
+REFRESH_CALLS_PER_HOUR = int(os.getenv("REFRESH_CALLS_PER_HOUR", "600"))
+REFRESH_TICK_MINUTES = float(os.getenv("REFRESH_TICK_MINUTES", "2"))
+REFRESH_WATCHED_INTERVAL_MINUTES = float(os.getenv("REFRESH_WATCHED_INTERVAL_MINUTES", "60"))
+REFRESH_UNWATCHED_INTERVAL_HOURS = float(os.getenv("REFRESH_UNWATCHED_INTERVAL_HOURS", "24"))
+REFRESH_MIN_INTERVAL_MINUTES = float(os.getenv("REFRESH_MIN_INTERVAL_MINUTES", "10"))
+# 검색 호출 1번당 읽어 오는 후보 수 (변동이 잦아 주기가 짧은 상품, 같은 검색어로 끼워 넣을 상품 몫)
+REFRESH_CANDIDATES_PER_CALL = max(1, int(os.getenv("REFRESH_CANDIDATES_PER_CALL", "4")))
+
+VOLATILITY_WINDOW = timedelta(days=7)
+VOLATILITY_CACHE_SECONDS = 3600  # 변동 횟수 집계는 한 시간에 한 번만
+
+_NEVER = datetime(1970, 1, 1)
+
+
+def _now_naive_utc() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RefreshCandidate(NamedTuple):
+    item_id: int
+    query: str
+    last_checked_at: Optional[datetime]
+    watched: bool
+    changes: int
+    due_at: datetime
+
+
+class RefreshTick(NamedTuple):
+    due: int          # 읽어 온 후보 중 확인 시각이 지난 상품 수
+    selected: int     # 이번 tick에 갱신한 상품 수 (덤 포함)
+    calls: int        # 네이버 검색 호출 수
+    updated: int      # 가격을 확인한 상품 수
+
+
+def refresh_interval(*, watched: bool, changes: int) -> timedelta:
+    base = REFRESH_WATCHED_INTERVAL_MINUTES if watched else REFRESH_UNWATCHED_INTERVAL_HOURS * 60
+    minutes = max(REFRESH_MIN_INTERVAL_MINUTES, base / (1 + max(0, changes)))
+    return timedelta(minutes=minutes)
+
+
+def tick_budget(calls_per_hour: int = REFRESH_CALLS_PER_HOUR, tick_minutes: float = REFRESH_TICK_MINUTES) -> int:
+    return max(1, int(calls_per_hour * tick_minutes / 60))
+
+
+def select_for_refresh(candidates: List[RefreshCandidate], *, now: datetime, budget_calls: int) -> List[RefreshCandidate]:
+    """
+    확인 시각이 지난 상품을 due_at 순으로 골라 검색어 budget_calls개까지 채운다.
+    고른 검색어를 쓰는 나머지 후보는 호출 수가 늘지 않으므로 같이 돌려준다.
+    """
+    due = sorted((c for c in candidates if c.due_at <= now), key=lambda c: c.due_at)
+
+    queries: "OrderedDict[str, None]" = OrderedDict()
+    for c in due:
+        if c.query in queries:
+            continue
+        if len(queries) >= budget_calls:
+            break
+        queries[c.query] = None
+
+    return [c for c in candidates if c.query in queries]
+
+
+class RefreshScheduler:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._changes: Dict[int, int] = {}
+        self._changes_loaded_at: Optional[float] = None
+
+    def _price_changes(self, db: Session, now: datetime) -> Dict[int, int]:
+        with self._lock:
+            fresh = (
+                self._changes_loaded_at is not None
+                and time.monotonic() - self._changes_loaded_at < VOLATILITY_CACHE_SECONDS
+            )
+            if fresh:
+                return self._changes
+
+        rows = (
+            db.query(PriceHistory.item_id, func.count())
+            .filter(PriceHistory.checked_at >= now - VOLATILITY_WINDOW)
+            .group_by(PriceHistory.item_id)
+            .all()
+        )
+        # 첫 가격 기록(상품 생성)도 1행이므로 변동 횟수는 행 수 - 1로 본다
+        changes = {int(item_id): max(0, int(n) - 1) for item_id, n in rows}
+        with self._lock:
+            self._changes, self._changes_loaded_at = changes, time.monotonic()
+        return changes
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._changes_loaded_at = None
+
+    def load_candidates(self, db: Session, *, now: datetime, limit: int) -> List[RefreshCandidate]:
+        """
+        wishlist 상품 limit개 + 나머지 상품 limit개를 last_checked_at 오래된 순(한 번도 확인 안 한 상품 먼저)으로 읽는다.
+        wishlist 상품이 먼저 온다.
+        """
+        # REFRESH_MIN_INTERVAL 안에 확인한 상품은 어떤 경우에도 때가 아니므로 인덱스(ix_items_active_checked)로 먼저 거른다
+        recent = now - timedelta(minutes=REFRESH_MIN_INTERVAL_MINUTES)
+        watched = exists().where(Wishlist.item_id == Item.id, Wishlist.is_active == 1)
+        rows = []
+        for is_watched, cond in ((True, watched), (False, ~watched)):
+            rows.extend(
+                (item_id, title, last_checked_at, is_watched)
+                for item_id, title, last_checked_at in (
+                    db.query(Item.id, Item.title, Item.last_checked_at)
+                    .filter(Item.is_active == 1)
+                    .filter(or_(Item.last_checked_at.is_(None), Item.last_checked_at <= recent))
+                    .filter(cond)
+                    .order_by(Item.last_checked_at, Item.id)
+                    .limit(limit)
+                    .all()
+                )
+            )
+        changes = self._price_changes(db, now)
+
+        candidates = []
+        for item_id, title, last_checked_at, is_watched in rows:
+            query = normalize_query(title or "")
+            if not query:
+                continue
+            n = changes.get(int(item_id), 0)
+            due_at = (
+                last_checked_at + refresh_interval(watched=bool(is_watched), changes=n)
+                if last_checked_at is not None
+                else _NEVER
+            )
+            candidates.append(RefreshCandidate(int(item_id), query, last_checked_at, bool(is_watched), n, due_at))
+        return candidates
+
+    def run_tick(
+        self,
+        db: Session,
+        *,
+        client: Optional[AsyncNaverShoppingClient] = None,
+        budget_calls: Optional[int] = None,
+        spread_over: Optional[float] = None,
+        now: Optional[datetime] = None,
+    ) -> RefreshTick:
+        now = now or _now_naive_utc()
+        budget_calls = tick_budget() if budget_calls is None else budget_calls
+
+        candidates = self.load_candidates(db, now=now, limit=budget_calls * REFRESH_CANDIDATES_PER_CALL)
+        selected = select_for_refresh(candidates, now=now, budget_calls=budget_calls)
+        due = sum(1 for c in candidates if c.due_at <= now)
+        if not selected:
+            return RefreshTick(due=due, selected=0, calls=0, updated=0)
+
+        ids = [c.item_id for c in selected]
+        items = db.query(Item).filter(Item.id.in_(ids)).all()
+        updated = refresh_items(db, items, client=client, spread_over=spread_over)
+
+        # 검색 결과에 없었거나 검색이 실패한 상품도 확인 시각을 옮겨서 다음 tick 맨 앞을 계속 차지하지 않게 한다
+        db.execute(
+            update(Item)
+            .where(Item.id.in_(ids))
+            .where(or_(Item.last_checked_at.is_(None), Item.last_checked_at < now))
+            .values(last_checked_at=now)
+        )
+        db.commit()
+
+        calls = len({c.query for c in selected})
+        return RefreshTick(due=due, selected=len(selected), calls=calls, updated=updated)
+
+
+refresh_scheduler = RefreshScheduler()
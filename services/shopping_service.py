@@ -1,18 +1,33 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy import exists
+from sqlalchemy.orm import Session, sessionmaker
 
 # crud에서 수정된 함수들 import
 from crud import (
-    upsert_item_from_naver,
+    NaverItemRecord,
+    UpsertedItem,
+    bulk_insert_price_history,
+    bulk_update_item_prices,
+    bulk_upsert_items_from_naver,
     insert_price_history,
+    min_prices_last_7d,
     update_min_price_last_7d,
 )
-from services.naver_shopping_client import refresh_product_price, search_products, KEYBOARD_CATEGORY_ID
-from services.alert_service import evaluate_alerts_for_price_update
+from services.naver_shopping_client import (
+    AsyncNaverShoppingClient,
+    KEYBOARD_CATEGORY_ID,
+    NaverProduct,
+    plan_pages,
+    search_products,
+)
+from services.naver_rate_limiter import Priority
+from services.refresh_planner import plan_refresh, resolve_group_prices
+from services.alert_service import PriceChange, evaluate_alerts_for_price_changes
 from models import Wishlist, Item, PriceHistory
 
 
@@ -23,17 +38,25 @@ def _now_naive_utc() -> datetime:
 # ---------------------------------------------------------
 # 🛠️ [핵심] 가격 변동 처리 공통 로직
 # ---------------------------------------------------------
-def _process_price_update(db: Session, item: Item, new_price: int, is_created: bool):
+def _process_price_update(
+    db: Session,
+    item: Item,
+    new_price: int,
+    is_created: bool,
+    *,
+    evaluate_alerts: bool = True,
+) -> Optional[PriceChange]:
     """
     아이템의 가격 변동을 감지하고, 변동이 있을 때만:
     1. PriceHistory 저장
     2. Item의 last_seen_price, min_price 갱신
-    3. 알림(Alert) 트리거 체크
+    3. 알림(Alert) 트리거 체크 (evaluate_alerts=False면 건너뛰고 호출자가 모아서 배치로 판별)
+    return: 가격 변동이 있었으면 PriceChange, 아니면 None
     """
     # 1. 신규 상품이면? -> 이미 crud에서 가격을 넣었으니 히스토리만 쌓고 끝냄
     if is_created:
         insert_price_history(db, item.id, new_price)
-        return
+        return None
 
     # 2. 기존 상품 -> 가격 비교 (이제 crud가 가격을 안 건드렸으니 비교 가능!)
     old_last_seen_price = item.last_seen_price
@@ -42,7 +65,7 @@ def _process_price_update(db: Session, item: Item, new_price: int, is_created: b
     # 변동 없음: 시간만 갱신하고 종료
     if old_last_seen_price is not None and int(old_last_seen_price) == new_price:
         item.last_checked_at = _now_naive_utc()
-        return
+        return None
 
         # 3. 변동 발생: 히스토리 기록 & 아이템 업데이트
     ph = insert_price_history(db, item.id, new_price)
@@ -57,20 +80,84 @@ def _process_price_update(db: Session, item: Item, new_price: int, is_created: b
         update_min_price_last_7d(db, item)
 
     # 5. 알림 체크 (가격 변동 시에만)
-    wishlists = (
-        db.query(Wishlist)
-        .filter(Wishlist.item_id == item.id)
-        .filter(Wishlist.is_active == 1)
-        .all()
+    change = PriceChange(item.id, ph, old_last_seen_price, old_min_price)
+    if evaluate_alerts:
+        evaluate_alerts_for_price_changes(db, [change])
+    return change
+
+
+# ---------------------------------------------------------
+# 페이지 단위 bulk 적재 (수집 배치 / 검색 저장 공용)
+# - _process_price_update와 같은 규칙을 페이지 전체에 집합 쿼리로 적용한다.
+# ---------------------------------------------------------
+def ingest_search_results(db: Session, items: Sequence[NaverItemRecord]) -> List[int]:
+    """
+    네이버 검색 결과(NaverProduct 목록) 한 페이지를 bulk로 저장/갱신한다 (commit은 호출자가).
+    1. items upsert (IN 조회 1번 + 다중 INSERT ... ON DUPLICATE KEY UPDATE 1번)
+    2. 신규/가격 변동 상품의 price_history 다중 INSERT 1번
+    3. 가격 변동 상품의 last_seen_price/min_price, 변동 없는 상품의 last_checked_at UPDATE
+    4. 가격 변동 상품만 알림 배치 판별
+    return: 입력 순서대로의 item_id 리스트
+    """
+    item_ids, changes = ingest_page_prices(db, items)
+    evaluate_alerts_for_price_changes(db, changes)
+    return item_ids
+
+
+def ingest_page_prices(db: Session, items: Sequence[NaverItemRecord]) -> Tuple[List[int], List[PriceChange]]:
+    """
+    ingest_search_results의 1~3단계만 (알림 판별은 호출자가 나중에, commit도 호출자가).
+    return: (입력 순서대로의 item_id 리스트, 가격 변동 목록)
+    """
+    upserted = bulk_upsert_items_from_naver(db, items)
+    if not upserted:
+        return [], []
+
+    now = _now_naive_utc().replace(microsecond=0)  # DB(DATETIME(0))에 저장되는 값과 같게
+    ph_rows = []
+    changed: List[UpsertedItem] = []
+    unchanged_ids: List[int] = []
+
+    for u in upserted:
+        if u.is_created:
+            # 신규 상품 -> 가격은 upsert에서 넣었으니 히스토리만
+            ph_rows.append((u.item_id, u.price))
+        elif u.old_last_seen_price is not None and int(u.old_last_seen_price) == u.price:
+            unchanged_ids.append(u.item_id)
+        else:
+            ph_rows.append((u.item_id, u.price))
+            changed.append(u)
+
+    new_phs = bulk_insert_price_history(
+        db,
+        ph_rows,
+        checked_at=now,
+        fetch_item_ids=[u.item_id for u in changed],
     )
-    for w in wishlists:
-        evaluate_alerts_for_price_update(
-            db,
-            wishlist_id=w.id,
-            new_ph=ph,
-            old_last_seen_price=old_last_seen_price,
-            old_min_price=old_min_price,
-        )
+
+    # 최저가: 더 낮아졌으면 새 가격, 아니면 최근 7일 최저가(방금 넣은 히스토리 포함)
+    went_up = [
+        u.item_id for u in changed
+        if not (u.old_min_price is None or u.price < int(u.old_min_price))
+    ]
+    window_min = min_prices_last_7d(db, went_up)
+
+    updates: Dict[int, Dict[str, Any]] = {}
+    for u in changed:
+        if u.old_min_price is None or u.price < int(u.old_min_price):
+            min_price = u.price
+        else:
+            min_price = window_min.get(u.item_id, u.old_min_price)
+        updates[u.item_id] = {"last_seen_price": u.price, "min_price": min_price}
+
+    bulk_update_item_prices(db, updates, touched_ids=unchanged_ids, checked_at=now)
+
+    changes = [
+        PriceChange(u.item_id, new_phs[u.item_id], u.old_last_seen_price, u.old_min_price)
+        for u in changed
+    ]
+    ids = {u.external_id: u.item_id for u in upserted}
+    return [ids[data.external_id] for data in items], changes
 
 
 def collect_items_pages(
@@ -82,11 +169,18 @@ def collect_items_pages(
         page_size: int = 50,
         sort: str = "sim",
         strict: bool = False,
+        client: Optional[AsyncNaverShoppingClient] = None,
+        spread_over: Optional[float] = None,
 ) -> int:
     """
     ✅ 배치 수집용(Items 채우기)
     - 네이버 쇼핑 검색을 페이지(start)로 돌려서 total개까지 수집/저장(upsert)한다.
-    - _process_price_update를 통해 가격 변동 및 알림 처리 위임
+    - client(AsyncNaverShoppingClient)를 넘기면 수집 파이프라인(services/collect_pipeline.py)으로
+      fetch/정제/저장/알림 판별을 단계별로 겹쳐서 돌린다. 이때 저장은 db와 같은 DB의 새 세션들로 한다.
+    - spread_over(초)를 주면 페이지 요청을 그 시간 동안 나눠서 보낸다 (job 경계 몰림 방지).
+    - 페이지마다 ingest_search_results로 저장하고, 가격 변동 상품만 알림을 배치로 판별한다
+      (파이프라인 경로는 같은 ingest_page_prices + evaluate_alerts_for_price_changes).
+    - 이미 저장된 상품의 주기적 가격 갱신은 refresh_items가 맡는다.
     """
     if category is None:
         category = KEYBOARD_CATEGORY_ID
@@ -96,12 +190,35 @@ def collect_items_pages(
     if not (1 <= page_size <= 100):
         raise ValueError("page_size must be between 1 and 100")
 
+    if client is not None:
+        # collect_pipeline이 이 모듈(ingest_page_prices)을 쓰므로 여기서 import
+        from services.collect_pipeline import CollectPipeline, record_run
+
+        pipeline = CollectPipeline(client, sessionmaker(bind=db.get_bind(), autoflush=False))
+        result = client.run(
+            pipeline.run(
+                query,
+                category=category,
+                total=total,
+                page_size=page_size,
+                sort=sort,
+                strict=strict,
+                spread_over=spread_over,
+            )
+        )
+        record_run(result)
+        return result.saved
+
     saved_total = 0
     start = 1
+    pause = _spread_pause(len(plan_pages(total, page_size)), spread_over)
 
     while saved_total < total:
         display = min(page_size, total - saved_total)
 
+        if pause and start > 1:
+            time.sleep(pause)
+
         items = search_products(
             query=query,
             category=category,
@@ -109,19 +226,13 @@ def collect_items_pages(
             start=start,
             sort=sort,
             strict=strict,
+            priority=Priority.BACKGROUND,
         )
 
         if not items:
             break
 
-        for data in items:
-            # ✅ 수정된 crud 호출 (tuple 반환 대응)
-            item, is_created = upsert_item_from_naver(db, data)
-
-            # 로직 위임
-            _process_price_update(db, item, int(data["price"]), is_created)
-
-        db.commit()
+        _save_page(db, items)
 
         saved_total += len(items)
         start += display  # 다음 페이지로 이동 (1-base)
@@ -129,60 +240,119 @@ def collect_items_pages(
     return saved_total
 
 
-def save_naver_search_results(db: Session, items: List[Dict[str, Any]]) -> List[int]:
-    """
-    네이버 검색 결과(normalized list)를 DB에 저장/갱신하고,
-    저장된 item_id 리스트 반환
-    """
-    saved_ids: List[int] = []
+def _spread_pause(calls: int, spread_over: Optional[float]) -> float:
+    # 동기 경로에서 호출 사이에 쉴 시간
+    if not spread_over or calls <= 1:
+        return 0.0
+    return spread_over / calls
 
-    for data in items:
-        # ✅ 수정된 crud 호출 (tuple 반환 대응)
-        item, is_created = upsert_item_from_naver(db, data)
 
-        # 로직 위임
-        _process_price_update(db, item, int(data["price"]), is_created)
+def _save_page(db: Session, items: List[Dict[str, Any]]) -> None:
+    # search_products는 캐시/응답용 dict를 돌려주므로 저장 전에 NaverProduct로 바꾼다
+    ingest_search_results(db, [NaverProduct(**data) for data in items])
+    db.commit()
 
-        saved_ids.append(item.id)
 
+def save_naver_search_results(db: Session, items: List[Dict[str, Any]]) -> List[int]:
+    """
+    네이버 검색 결과(normalize_naver_item dict 목록)를 DB에 저장/갱신하고,
+    저장된 item_id 리스트 반환
+    """
+    saved_ids = ingest_search_results(db, [NaverProduct(**data) for data in items])
     db.commit()
     return saved_ids
 
 
-def refresh_wishlist_prices(db: Session) -> int:
+def refresh_wishlist_prices(
+    db: Session,
+    *,
+    client: Optional[AsyncNaverShoppingClient] = None,
+    spread_over: Optional[float] = None,
+) -> int:
     """
     활성화된 wishlist 기반으로 item 가격을 갱신하고
     - 가격이 바뀐 경우에만 price_history 기록
     - 알람 조건을 판별하여 DB에 트리거 상태만 저장
+    - 같은 상품은 wishlist 수와 상관없이 1번만, 같은 검색어는 검색 1번으로 처리한다.
+    - client(AsyncNaverShoppingClient)를 넘기면 검색어별 검색을 동시에 요청한다.
+    - spread_over(초)를 주면 검색 요청을 그 시간 동안 나눠서 보낸다.
     return: 갱신 처리된 item 개수
     """
+    has_active_wishlist = exists().where(
+        Wishlist.item_id == Item.id,
+        Wishlist.is_active == 1,
+    )
     rows = (
         db.query(Item)
-        .join(Wishlist, Wishlist.item_id == Item.id)
-        .filter(Wishlist.is_active == 1)
         .filter(Item.is_active == 1)
+        .filter(has_active_wishlist)
         .all()
     )
 
-    updated_count = 0
+    return refresh_items(db, rows, client=client, spread_over=spread_over)
 
-    for item in rows:
-        try:
-            # 네이버 API로 최신 가격 조회
-            new_price = refresh_product_price(
-                query=item.title,
-                product_url=item.product_url,
-            )
 
-            # 기존 상품이므로 is_created=False
-            _process_price_update(db, item, int(new_price), is_created=False)
+def refresh_items(
+    db: Session,
+    items: List[Item],
+    *,
+    client: Optional[AsyncNaverShoppingClient] = None,
+    spread_over: Optional[float] = None,
+) -> int:
+    """
+    주어진 상품들을 검색어별로 묶어서 가격을 갱신한다.
+    네이버 호출 수 == 서로 다른 검색어 수.
+    """
+    groups = plan_refresh(items)
+
+    if client is not None:
+        results = client.run(
+            client.search_many(
+                [g.search_kwargs() for g in groups],
+                spread_over=spread_over,
+            )
+        )
+    else:
+        results = []
+        pause = _spread_pause(len(groups), spread_over)
+        for i, g in enumerate(groups):
+            if pause and i:
+                time.sleep(pause)
+            try:
+                results.append(search_products(**g.search_kwargs(), priority=Priority.BACKGROUND))
+            except Exception as e:
+                results.append(e)
 
-            updated_count += 1
+    updated_count = 0
+    changes: List[PriceChange] = []
 
-        except Exception as e:
-            # 특정 상품 갱신 실패해도 다른 상품은 계속 진행
-            print(f"Failed to refresh item {item.id}: {e}")
+    for group, result in zip(groups, results):
+        if isinstance(result, BaseException):
+            # 특정 검색 실패해도 다른 검색어는 계속 진행
+            print(f"Failed to refresh query {group.query!r}: {result}")
             continue
 
+        prices = resolve_group_prices(group, result)
+
+        for item in group.items:
+            new_price = prices[item.id]
+            if new_price is None:
+                print(f"Failed to refresh item {item.id}: not found in search results")
+                continue
+
+            try:
+                # 기존 상품이므로 is_created=False, 알림은 아래에서 한 번에 판별
+                change = _process_price_update(
+                    db, item, int(new_price), is_created=False, evaluate_alerts=False
+                )
+                if change is not None:
+                    changes.append(change)
+                updated_count += 1
+            except Exception as e:
+                print(f"Failed to refresh item {item.id}: {e}")
+                continue
+
+    evaluate_alerts_for_price_changes(db, changes)
+
     db.commit()
-    return updated_count
\ No newline at end of file
+    return updated_count
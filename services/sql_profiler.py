@@ -0,0 +1,215 @@
+# services/sql_profiler.py
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import ContextManager, Dict, Iterator, List, NamedTuple, Optional
+
+# ---------------------------------------------------------
+# 요청/job 단위 SQL 프로파일러 (N+1 찾기용)
+# - database.install_query_metrics가 단 커서 이벤트에서 record_query가 불린다
+#   (api / jobs / async 엔진. 다른 엔진은 install_query_metrics를 직접 불러야 잡힌다).
+# - 프로파일 중인 요청/job마다 쿼리 수, DB 시간, 문장 지문(리터럴/파라미터를 지운 SQL)별 횟수를 모은다.
+#   같은 지문이 SQL_PROFILE_REPEAT_THRESHOLD번 이상이면 N+1 의심으로 로그를 남긴다.
+# - SQL_PROFILE
+#     off(기본): 아무것도 안 함
+#     header:    요청 헤더 X-SQL-Profile: 1 이 있는 요청만. 응답 헤더 X-SQL-Profile로 요약을 돌려준다.
+#     all:       모든 요청과 스케줄러 job (N+1 의심일 때만 로그)
+# - 테스트: query_budget(n) 안에서 실행된 쿼리가 n개를 넘으면 QueryBudgetExceeded
+#   (pytest는 tests/conftest.py의 sql_query_budget fixture)
+# ---------------------------------------------------------
+SQL_PROFILE = os.getenv("SQL_PROFILE", "off").strip().lower()
+SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "5"))
+
+if SQL_PROFILE not in ("off", "header", "all"):
+    raise ValueError(f"SQL_PROFILE must be off, header or all (got {SQL_PROFILE!r})")
+
+PROFILE_HEADER = "x-sql-profile"
+
+_WS = re.compile(r"\s+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROW_LIST = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+
+_FINGERPRINT_CACHE_SIZE = 2048
+_fingerprints: Dict[str, "Fingerprint"] = {}
+
+
+class Fingerprint(NamedTuple):
+    key: str       # 정규화한 SQL의 sha1 앞 8자리
+    sql: str       # 정규화한 SQL (로그용, 앞 200자)
+
+
+def fingerprint(statement: str) -> Fingerprint:
+    """
+    리터럴/파라미터를 ?로, IN (...)과 여러 행 VALUES를 한 칸으로 줄인 SQL의 지문.
+    SQLAlchemy는 컴파일된 문장 문자열을 재사용하므로 문장별로 캐시한다.
+    """
+    fp = _fingerprints.get(statement)
+    if fp is not None:
+        return fp
+    sql = _WS.sub(" ", statement).strip()
+    sql = _PARAM.sub("?", _LITERAL.sub("?", sql))
+    sql = _ROW_LIST.sub("(?+)", _PARAM_LIST.sub("(?+)", sql))
+    fp = Fingerprint(hashlib.sha1(sql.encode()).hexdigest()[:8], sql[:200])
+    if len(_fingerprints) >= _FINGERPRINT_CACHE_SIZE:
+        _fingerprints.clear()
+    _fingerprints[statement] = fp
+    return fp
+
+
+class StatementStats(NamedTuple):
+    fingerprint: str
+    count: int
+    seconds: float
+    sql: str
+
+
+class QueryProfile:
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.queries = 0
+        self.seconds = 0.0
+        self._by_fingerprint: Dict[str, List] = {}   # 지문 -> [횟수, 시간, sql]
+        self._lock = threading.Lock()                 # 수집 파이프라인처럼 여러 스레드에서 쿼리하는 job용
+
+    def add(self, statement: str, seconds: float) -> None:
+        fp = fingerprint(statement)
+        with self._lock:
+            self.queries += 1
+            self.seconds += seconds
+            entry = self._by_fingerprint.get(fp.key)
+            if entry is None:
+                self._by_fingerprint[fp.key] = [1, seconds, fp.sql]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+
+    def statements(self) -> List[StatementStats]:
+        """지문별 통계, 많이 실행된 순."""
+        with self._lock:
+            rows = [StatementStats(k, v[0], v[1], v[2]) for k, v in self._by_fingerprint.items()]
+        return sorted(rows, key=lambda s: (-s.count, -s.seconds))
+
+    def repeated(self, threshold: int = SQL_PROFILE_REPEAT_THRESHOLD) -> List[StatementStats]:
+        return [s for s in self.statements() if s.count >= threshold]
+
+    def header_value(self) -> str:
+        # 응답 헤더용 한 줄: queries=14; db_ms=5.21; repeated=3f2a9c1b*10,...
+        parts = [f"queries={self.queries}", f"db_ms={self.seconds * 1000:.2f}"]
+        repeated = self.repeated()
+        if repeated:
+            parts.append("repeated=" + ",".join(f"{s.fingerprint}*{s.count}" for s in repeated[:5]))
+        return "; ".join(parts)
+
+    def summary(self, *, limit: int = 5) -> str:
+        lines = [f"[sql-profile] {self.label}: {self.queries} queries, {self.seconds * 1000:.1f}ms"]
+        for s in self.statements()[:limit]:
+            mark = "  N+1? " if s.count >= SQL_PROFILE_REPEAT_THRESHOLD else "       "
+            lines.append(f"{mark}{s.fingerprint} x{s.count} {s.seconds * 1000:.1f}ms  {s.sql}")
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+_captures: List[QueryProfile] = []   # query_budget: 스레드/contextvar와 관계없이 프로세스의 모든 쿼리
+
+
+def record_query(statement: str, seconds: float) -> None:
+    profile = _current.get()
+    if profile is not None:
+        profile.add(statement, seconds)
+    if _captures:
+        for capture in list(_captures):
+            capture.add(statement, seconds)
+
+
+@contextmanager
+def profiled(label: str, *, log: str = "repeated") -> Iterator[QueryProfile]:
+    """
+    블록 안(같은 context를 물려받는 스레드/태스크 포함)의 쿼리를 모은다.
+    log: repeated(N+1 의심일 때만 출력) | always | never
+    """
+    profile = QueryProfile(label)
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+        if log == "always" or (log == "repeated" and profile.repeated()):
+            print(profile.summary())
+
+
+def job_profile(name: str) -> ContextManager:
+    """SQL_PROFILE=all일 때 스케줄러 job 실행 하나를 프로파일한다 (services/metrics.job_run)."""
+    if SQL_PROFILE != "all":
+        return nullcontext()
+    return profiled(f"job {name}")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, *, label: str = "block") -> Iterator[QueryProfile]:
+    """
+    with query_budget(3):
+        client.get("/wishlist")
+    TestClient처럼 다른 스레드에서 요청을 처리해도 잡히도록 프로세스 전체의 쿼리를 센다.
+    """
+    profile = QueryProfile(label)
+    _captures.append(profile)
+    try:
+        yield profile
+    finally:
+        _captures.remove(profile)
+    if profile.queries > max_queries:
+        raise QueryBudgetExceeded(
+            f"{label}: {profile.queries} queries > budget {max_queries}\n{profile.summary(limit=10)}"
+        )
+
+
+class SqlProfileMiddleware:
+    """
+    SQL_PROFILE=header면 X-SQL-Profile 헤더가 있는 요청만, all이면 모든 요청을 프로파일한다.
+    헤더로 요청한 경우 응답 헤더 X-SQL-Profile에 요약을 붙이고 지문별 SQL을 로그로 남긴다.
+    (응답 시작 뒤에 실행되는 쿼리, 예를 들어 StreamingResponse 안의 쿼리는 로그에만 잡힌다)
+    """
+
+    def __init__(self, app, *, mode: str = SQL_PROFILE) -> None:
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self.mode == "off" or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = any(k == PROFILE_HEADER.encode() for k, _ in scope["headers"])
+        if not requested and self.mode != "all":
+            await self.app(scope, receive, send)
+            return
+
+        with profiled(f"{scope['method']} {scope['path']}", log="never") as profile:
+
+            async def send_with_profile(message) -> None:
+                if message["type"] == "http.response.start" and requested:
+                    headers = list(message.get("headers", []))
+                    headers.append((PROFILE_HEADER.encode(), profile.header_value().encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_profile)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    profile.label = f"{scope['method']} {route}"
+                if requested or profile.repeated():
+                    print(profile.summary())
+
@@ -0,0 +1,67 @@
+# services/user_cache.py
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+from models import User
+from services.cache import MemoryCacheBackend
+
+# ---------------------------------------------------------
+# 인증된 요청의 유저 캐시
+# - JWT의 user id로 users 행을 매번 읽지 않도록 잠깐 들고 있는다.
+# - ORM으로 User를 수정/삭제하면 flush 시점에 바로 지운다.
+#   (query.update() 같은 bulk 문은 이벤트가 안 불리므로 invalidate_user를 직접 호출)
+# - 다른 워커에서 바뀐 건 TTL 안에 맞춰진다.
+# - password_hash는 캐시에 두지 않는다 (로그인은 캐시를 거치지 않고 이메일로 직접 읽는다).
+# ---------------------------------------------------------
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+user_cache = MemoryCacheBackend(max_entries=10000, max_bytes=4 * 1024 * 1024)
+
+
+def _user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def cached_user(user_id: int) -> Optional[User]:
+    """
+    캐시에 있으면 detached 상태의 User를 돌려준다 (password_hash는 로드되지 않은 상태).
+    세션에 붙이려면 db.merge(user, load=False) (SELECT 없이 붙는다).
+    """
+    raw = user_cache.get(_user_key(user_id))
+    if raw is None:
+        return None
+
+    data = json.loads(raw)
+    user = User(
+        id=data["id"],
+        email=data["email"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+    )
+    make_transient_to_detached(user)
+    return user
+
+
+def store_user(user: User) -> None:
+    data = {
+        "id": user.id,
+        "email": user.email,
+        "created_at": user.created_at.isoformat(),
+    }
+    user_cache.set(_user_key(user.id), json.dumps(data).encode(), USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.delete(_user_key(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
@@ -0,0 +1,157 @@
+# services/warmup.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# ---------------------------------------------------------
+# 서버 시작 직후 작업(warm-up)
+# - 단계별로 순서대로 실행하고 상태(pending/running/done/failed)를 남긴다.
+# - 백그라운드 스레드에서 돌리면 lifespan이 바로 끝나서 요청을 먼저 받을 수 있다.
+# - required 단계가 모두 끝나야 ready (GET /health/ready).
+#   실패한 required 단계는 성공할 때까지 간격을 늘려 가며 다시 시도한다.
+# ---------------------------------------------------------
+
+# 실패한 required 단계 재시도 간격 (초): 처음 값에서 두 배씩, 최대값까지
+WARMUP_RETRY_SECONDS = 5.0
+WARMUP_RETRY_MAX_SECONDS = 60.0
+
+
+class _Step:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        required: bool,
+        ready_when: Optional[Callable[[], bool]],
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.required = required
+        self.ready_when = ready_when
+        self.attempts = 0
+        self.status = "pending"
+        self.detail: Optional[str] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def satisfied(self) -> bool:
+        # 단계가 실패했어도 다른 경로(주기 job 등)로 같은 상태가 채워졌으면 ready로 본다
+        return self.status == "done" or (self.ready_when is not None and bool(self.ready_when()))
+
+    def as_dict(self) -> Dict[str, Any]:
+        seconds = None
+        if self.started is not None:
+            seconds = round((self.finished or time.monotonic()) - self.started, 3)
+        return {
+            "name": self.name,
+            "required": self.required,
+            "status": self.status,
+            "attempts": self.attempts,
+            "seconds": seconds,
+            "detail": self.detail,
+        }
+
+
+class Warmup:
+    def __init__(
+        self,
+        *,
+        retry_seconds: float = WARMUP_RETRY_SECONDS,
+        retry_max_seconds: float = WARMUP_RETRY_MAX_SECONDS,
+    ) -> None:
+        self.retry_seconds = retry_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._steps: List[_Step] = []
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        *,
+        required: bool = False,
+        ready_when: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        fn이 문자열을 돌려주면 상태의 detail로 남는다. fn은 실패를 예외로 알려야 한다.
+        ready_when: required 단계가 실패 중이어도 이 값이 True면 ready로 본다.
+        """
+        with self._lock:
+            self._steps.append(_Step(name, fn, required, ready_when))
+
+    def _run_step(self, step: _Step) -> bool:
+        with self._lock:
+            step.status = "running"
+            step.attempts += 1
+            step.started = time.monotonic()
+            step.finished = None
+        try:
+            result = step.fn()
+            status, detail = "done", result if isinstance(result, str) else None
+        except Exception as e:
+            print(f"[warmup] {step.name} failed (attempt {step.attempts}):", repr(e))
+            status, detail = "failed", repr(e)
+        with self._lock:
+            step.status, step.detail = status, detail
+            step.finished = time.monotonic()
+        return status == "done"
+
+    def run(self) -> None:
+        with self._lock:
+            self._started, self._finished = time.monotonic(), None
+            steps = list(self._steps)
+
+        failed = [step for step in steps if not self._run_step(step) and step.required]
+
+        # 실패한 필수 단계는 성공(또는 ready_when)할 때까지 다시 시도. stop()이면 그만둔다
+        delay = self.retry_seconds
+        while failed and not self._stop.wait(delay):
+            failed = [step for step in failed if not step.satisfied() and not self._run_step(step)]
+            delay = min(delay * 2, self.retry_max_seconds)
+
+        with self._lock:
+            self._finished = time.monotonic()
+        print(f"[warmup] finished in {self._finished - self._started:.2f}s")
+
+    def stop(self) -> None:
+        """재시도 대기 중인 run()을 끝낸다 (서버 종료 시)."""
+        self._stop.set()
+
+    def start_background(self) -> threading.Thread:
+        self._thread = threading.Thread(target=self.run, name="startup-warmup", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def ready(self) -> bool:
+        with self._lock:
+            return all(s.satisfied() for s in self._steps if s.required)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            steps = [s.as_dict() for s in self._steps]
+            ready = all(s.satisfied() for s in self._steps if s.required)
+            started, finished = self._started, self._finished
+        elapsed = None
+        if started is not None:
+            elapsed = round((finished or time.monotonic()) - started, 3)
+        return {
+            "ready": ready,
+            "finished": finished is not None,
+            "elapsed_seconds": elapsed,
+            "steps": steps,
+        }
+
+
+startup_warmup = Warmup()
@@ -0,0 +1,154 @@
+# services/wishlist_listing.py
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session, joinedload
+
+from models import Wishlist
+from services.cache import MemoryCacheBackend
+
+# ---------------------------------------------------------
+# 총 개수 캐시
+# - 목록 조회마다 COUNT(*)를 돌리지 않도록 유저별 개수를 잠깐 들고 있는다.
+# - 이 프로세스에서 추가/삭제하면 바로 지우고, 다른 워커에서 바뀐 건 TTL 안에 맞춰진다.
+# ---------------------------------------------------------
+WISHLIST_COUNT_TTL_SECONDS = float(os.getenv("WISHLIST_COUNT_TTL_SECONDS", "60"))
+
+wishlist_count_cache = MemoryCacheBackend(max_entries=10000, max_bytes=1024 * 1024)
+
+
+def _count_key(user_id: int) -> str:
+    return f"wishlist_count:{user_id}"
+
+
+def count_statement(user_id: int):
+    return select(func.count()).select_from(Wishlist).where(Wishlist.user_id == user_id)
+
+
+def cached_count(user_id: int) -> Optional[int]:
+    cached = wishlist_count_cache.get(_count_key(user_id))
+    return int(cached) if cached is not None else None
+
+
+def store_count(user_id: int, total: int) -> None:
+    wishlist_count_cache.set(_count_key(user_id), str(total).encode(), WISHLIST_COUNT_TTL_SECONDS)
+
+
+def count_wishlist(db: Session, user_id: int) -> int:
+    total = cached_count(user_id)
+    if total is None:
+        total = int(db.scalar(count_statement(user_id)) or 0)
+        store_count(user_id, total)
+    return total
+
+
+def invalidate_wishlist_count(user_id: int) -> None:
+    wishlist_count_cache.delete(_count_key(user_id))
+
+
+# ---------------------------------------------------------
+# 목록 조회
+# - Wishlist.item은 JOIN으로 같이 읽는다 (행마다 lazy load 하지 않음)
+# - 정렬별 keyset: date=(created_at, id) 내림차순, asc/dsc=item_id, sim=id
+#   (user_id, item_id)는 UNIQUE라 item_id만으로도 순서가 유일하다.
+# - 커서: "<sort>~<값>~<id>"
+# ---------------------------------------------------------
+def encode_cursor(sort: str, w: Wishlist) -> str:
+    if sort == "date":
+        return f"date~{w.created_at.isoformat()}~{w.id}"
+    if sort in ("asc", "dsc"):
+        return f"{sort}~{w.item_id}~{w.id}"
+    return f"{sort}~{w.id}~{w.id}"
+
+
+def decode_cursor(sort: str, cursor: str) -> Tuple[str, int]:
+    try:
+        cursor_sort, value, row_id = cursor.split("~")
+        int(row_id)
+    except ValueError as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+    if cursor_sort != sort:
+        raise ValueError(f"cursor was issued for sort={cursor_sort!r}, not {sort!r}")
+    return value, int(row_id)
+
+
+def _keyset_filter(sort: str, value: str, row_id: int):
+    if sort == "date":
+        created_at = datetime.fromisoformat(value)
+        return or_(
+            Wishlist.created_at < created_at,
+            and_(Wishlist.created_at == created_at, Wishlist.id < row_id),
+        )
+    if sort == "asc":
+        return Wishlist.item_id > int(value)
+    if sort == "dsc":
+        return Wishlist.item_id < int(value)
+    return Wishlist.id > int(value)
+
+
+def _order_by(sort: str):
+    if sort == "date":
+        return (Wishlist.created_at.desc(), Wishlist.id.desc())
+    if sort == "asc":
+        return (Wishlist.item_id.asc(),)
+    if sort == "dsc":
+        return (Wishlist.item_id.desc(),)
+    return (Wishlist.id.asc(),)
+
+
+def page_statement(
+    *,
+    user_id: int,
+    sort: str,
+    display: int,
+    start: int = 1,
+    cursor: Optional[str] = None,
+):
+    """
+    wishlist 한 페이지(+1행)를 읽는 SELECT.
+    cursor가 있으면 keyset, 없으면 start(1부터) 기준 OFFSET. cursor 값이 잘못되면 ValueError.
+    """
+    stmt = (
+        select(Wishlist)
+        .options(joinedload(Wishlist.item))
+        .where(Wishlist.user_id == user_id)
+        .order_by(*_order_by(sort))
+    )
+    if cursor:
+        value, row_id = decode_cursor(sort, cursor)
+        try:
+            stmt = stmt.where(_keyset_filter(sort, value, row_id))
+        except ValueError as e:
+            raise ValueError(f"invalid cursor: {cursor!r}") from e
+    elif start > 1:
+        stmt = stmt.offset(start - 1)
+
+    # display+1개를 읽어서 다음 페이지가 있는지 판단한다
+    return stmt.limit(display + 1)
+
+
+def split_page(rows, *, sort: str, display: int) -> Tuple[List[Wishlist], Optional[str]]:
+    rows = list(rows)
+    if len(rows) <= display:
+        return rows, None
+    rows = rows[:display]
+    return rows, encode_cursor(sort, rows[-1])
+
+
+def list_wishlist_page(
+    db: Session,
+    *,
+    user_id: int,
+    sort: str,
+    display: int,
+    start: int = 1,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Wishlist], Optional[str]]:
+    """wishlist 한 페이지와 다음 페이지 커서를 돌려준다."""
+    stmt = page_statement(user_id=user_id, sort=sort, display=display, start=start, cursor=cursor)
+    rows = db.execute(stmt).scalars().all()
+    return split_page(rows, sort=sort, display=display)
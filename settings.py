@@ -1,6 +1,8 @@
 # settings.py
 from __future__ import annotations
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,6 +10,48 @@ class Settings(BaseSettings):
     # .env에서 읽을 값들
     NAVER_CLIENT_ID: str
     NAVER_CLIENT_SECRET: str
+    # 로컬 벤치마크/개발용 가짜 서버(benchmarks/fake_naver.py)를 쓰려면 http://127.0.0.1:8089 처럼 바꾼다
+    NAVER_API_BASE_URL: str = "https://openapi.naver.com"
+
+    # 네이버 API 호출 한도 (모든 호출이 공유하는 rate limiter)
+    NAVER_RATE_PER_SECOND: float = 10.0
+    NAVER_DAILY_QUOTA: int = 25000
+    NAVER_INTERACTIVE_DAILY_RESERVE: float = 0.1  # 일일 한도 중 사용자 요청 전용 비율
+    NAVER_MAX_RETRIES: int = 3                    # 429/5xx 재시도 횟수
+    NAVER_JSON_DECODER: str = "auto"              # 응답 JSON 파서: auto(orjson이 설치돼 있으면 orjson) / orjson / json
+
+    # 네이버 검색 결과 캐시 (TTL + LRU)
+    NAVER_CACHE_TTL_SECONDS: float = 30.0
+    NAVER_CACHE_MAX_ENTRIES: int = 1024
+    NAVER_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    NAVER_CACHE_REDIS_URL: Optional[str] = None  # 설정하면 워커 간 공유 캐시(Redis 호환) 사용
+
+    # 동기 DB 커넥션 풀 (요청 핸들러용)
+    # - DB_POOL_PRE_PING: always(체크아웃마다 ping) / idle(DB_POOL_PING_IDLE_SECONDS 넘게 쉰 커넥션만) / never
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: str = "idle"
+    DB_POOL_PING_IDLE_SECONDS: float = 60.0
+
+    # 스케줄러 job 전용 풀 (API 풀과 분리해서 배치가 요청 처리를 굶기지 않게)
+    DB_JOB_POOL_SIZE: int = 3
+    DB_JOB_MAX_OVERFLOW: int = 0
+    DB_JOB_POOL_TIMEOUT: float = 60.0
+
+    # 비동기 DB 엔진 (요청 핸들러용, 선택)
+    # - DB_ASYNC_ENABLED=true면 auth/wishlist/alerts 라우터가 AsyncSession을 쓴다.
+    # - DB_ASYNC_URL을 주면 그대로 쓰고(예: sqlite+aiosqlite:///./local.db),
+    #   없으면 DB_USER/DB_PASS/DB_HOST/DB_PORT/DB_NAME + DB_ASYNC_DRIVER(aiomysql, asyncmy)로 만든다.
+    DB_ASYNC_ENABLED: bool = False
+    DB_ASYNC_DRIVER: str = "aiomysql"
+    DB_ASYNC_URL: Optional[str] = None
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 20
+    DB_ASYNC_POOL_TIMEOUT: float = 30.0   # 커넥션을 얻기까지 기다리는 최대 초
+    DB_ASYNC_POOL_RECYCLE: int = 1800     # MySQL wait_timeout보다 짧게
+    # 비동기 풀도 DB_POOL_PRE_PING / DB_POOL_PING_IDLE_SECONDS를 그대로 따른다
 
     # DB_HOST: str
     # DB_PORT: int
@@ -0,0 +1,109 @@
+# tests/conftest.py
+"""
+pytest 공용 fixture.
+DB는 메모리 SQLite (tests/factories.make_engine), 네이버 호출은 하지 않는다.
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterator
+
+# settings.Settings / routers.auth / database.py가 import 때 요구하는 값이라 앱 모듈보다 먼저 채운다.
+# (테스트는 자기 엔진을 쓰고 DB_* 주소로 접속하지 않는다)
+for _key, _value in (("NAVER_CLIENT_ID", "test"), ("NAVER_CLIENT_SECRET", "test"), ("SECRET_KEY", "test-secret"),
+                     ("DB_USER", "test"), ("DB_PASS", "test"), ("DB_HOST", "127.0.0.1"),
+                     ("DB_PORT", "3306"), ("DB_NAME", "test")):
+    os.environ.setdefault(_key, _value)
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+import database
+import models
+from crud import bulk_upsert_items_from_naver
+from routers.alerts import router as alerts_router
+from routers.auth import create_access_token, router as auth_router
+from routers.wishlist_ref import router as wishlist_router
+from services.sql_profiler import query_budget
+from services.user_cache import user_cache
+from services.wishlist_listing import wishlist_count_cache
+from tests.factories import as_products, make_engine, make_session_factory, synthetic_items
+
+WISHLIST_ROWS = 50
+
+
+@pytest.fixture
+def sql_query_budget():
+    """
+    def test_wishlist_queries(client, sql_query_budget):
+        with sql_query_budget(3, label="GET /wishlist"):
+            client.get("/wishlist", headers=auth)
+    """
+    return query_budget
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = make_engine()
+    database.install_query_metrics(engine, "test")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine: Engine) -> sessionmaker:
+    return make_session_factory(engine)
+
+
+@pytest.fixture
+def seeded(session_factory: sessionmaker) -> Dict[str, int]:
+    """유저 1명, 관심상품 WISHLIST_ROWS개, 첫 관심상품에 목표가 알람 5개."""
+    db = session_factory()
+    try:
+        user = models.User(email="test@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        upserted = bulk_upsert_items_from_naver(db, as_products(synthetic_items(WISHLIST_ROWS)))
+        db.execute(
+            insert(models.Wishlist),
+            [{"user_id": user.id, "item_id": u.item_id, "is_active": 1} for u in upserted],
+        )
+        wishlist_id = db.execute(select(models.Wishlist.id).limit(1)).scalar_one()
+        db.execute(
+            insert(models.Alert),
+            [{"wishlist_id": wishlist_id, "alert_type": "TARGET_PRICE", "target_price": 40000 + i, "is_enabled": 1}
+             for i in range(5)],
+        )
+        db.commit()
+        return {"user_id": user.id, "wishlist_id": wishlist_id}
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(session_factory: sessionmaker, seeded: Dict[str, int]) -> Iterator[TestClient]:
+    """seeded 유저로 인증된 클라이언트. 프로세스 전역 캐시는 테스트마다 비운다."""
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(auth_router)
+    app.include_router(wishlist_router)
+    app.include_router(alerts_router)
+    app.dependency_overrides[database.get_db] = get_db
+
+    user_cache.clear()
+    wishlist_count_cache.clear()
+    headers = {"Authorization": f"Bearer {create_access_token(seeded['user_id'])}"}
+    with TestClient(app, headers=headers) as c:
+        yield c
+    user_cache.clear()
+    wishlist_count_cache.clear()
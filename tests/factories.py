@@ -0,0 +1,58 @@
+# tests/factories.py
+"""
+테스트용 DB 엔진과 가짜 상품 데이터.
+환경 변수 기본값은 conftest.py가 먼저 채운다.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models
+from services.naver_shopping_client import NaverProduct
+
+
+def make_engine(db_url: str = "sqlite://", *, reset: bool = True) -> Engine:
+    """
+    SQLite 엔진. reset이면 스키마를 새로 만든다.
+    메모리 DB는 커넥션마다 따로 생기므로 하나를 공유한다.
+    """
+    if db_url in ("sqlite://", "sqlite:///:memory:"):
+        engine = create_engine(db_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    # MySQL처럼 FK를 검사한다
+    event.listen(engine, "connect", lambda dbapi_conn, _: dbapi_conn.execute("PRAGMA foreign_keys=ON"))
+    if reset:
+        models.Base.metadata.drop_all(engine)
+        models.Base.metadata.create_all(engine)
+    return engine
+
+
+def make_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def synthetic_items(n: int, *, first_id: int = 1, seed: int = 0, base_price: int = 50000) -> List[Dict[str, Any]]:
+    """normalize_naver_item() 결과와 같은 형태의 가짜 상품 목록."""
+    rng = random.Random(seed)
+    return [
+        {
+            "external_id": str(first_id + i),
+            "title": f"기계식 키보드 {first_id + i}",
+            "product_url": f"https://smartstore.naver.com/main/products/{first_id + i}",
+            "image_url": f"https://shopping-phinf.pstatic.net/{first_id + i}.jpg",
+            "mall_name": f"mall-{rng.randint(1, 50)}",
+            "price": base_price + rng.randint(0, 50000),
+        }
+        for i in range(n)
+    ]
+
+
+def as_products(items: List[Dict[str, Any]]) -> List[NaverProduct]:
+    return [NaverProduct(**d) for d in items]
@@ -0,0 +1,172 @@
+# tests/test_alert_evaluation.py
+"""
+배치 알람 판별(evaluate_alerts_for_price_changes)이 건별 판별(evaluate_alerts_for_price_update)과
+같은 알람을 트리거하는지 같은 데이터로 비교한다.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import models
+from services.alert_service import (
+    PriceChange,
+    evaluate_alerts_for_price_changes,
+    evaluate_alerts_for_price_update,
+)
+from tests.factories import make_engine, make_session_factory
+
+T0 = datetime(2026, 1, 1)
+
+# 상품별 (기존 가격 이력, 새 가격)
+PRICES: Dict[str, Tuple[List[int], int]] = {
+    "drop": ([50000, 48000], 45000),      # 직전보다 내림 + 새 최저가
+    "rise": ([40000, 42000], 43000),      # 직전보다 오름
+    "rebound": ([30000, 35000], 32000),   # 직전보다 내렸지만 최저가는 아님
+    "single": ([20000], 19000),           # 이력 1건 -> 새 가격이 2번째 (직전 가격 있음)
+    "first": ([], 10000),                 # 이력 없음 -> 직전 가격도 최저가도 없음
+}
+
+# (상품, 알람 종류, 목표가, 활성 여부, 관심상품 활성 여부)
+ALERTS = [
+    ("drop", "TARGET_PRICE", 46000, 1, 1),
+    ("drop", "TARGET_PRICE", 45000, 1, 1),   # 목표가와 같음 -> 트리거
+    ("drop", "TARGET_PRICE", 44999, 1, 1),
+    ("drop", "DROP_FROM_PREV", None, 1, 1),
+    ("drop", "NEW_LOW", None, 1, 1),
+    ("drop", "TARGET_PRICE", 46000, 0, 1),   # 꺼진 알람
+    ("drop", "NEW_LOW", None, 1, 0),         # 비활성 관심상품
+    ("rise", "TARGET_PRICE", 50000, 1, 1),
+    ("rise", "DROP_FROM_PREV", None, 1, 1),
+    ("rise", "NEW_LOW", None, 1, 1),
+    ("rebound", "DROP_FROM_PREV", None, 1, 1),
+    ("rebound", "NEW_LOW", None, 1, 1),
+    ("rebound", "TARGET_PRICE", None, 1, 1),  # 목표가 없음
+    ("single", "DROP_FROM_PREV", None, 1, 1),
+    ("single", "NEW_LOW", None, 1, 1),
+    ("first", "DROP_FROM_PREV", None, 1, 1),
+    ("first", "NEW_LOW", None, 1, 1),
+    ("first", "TARGET_PRICE", 10000, 1, 0),
+]
+
+
+def _seed(db: Session) -> List[PriceChange]:
+    """PRICES/ALERTS를 넣고 새 가격을 price_history에 쌓는다. return: 상품별 PriceChange"""
+    active_user = models.User(email="active@example.com", password_hash="x")
+    inactive_user = models.User(email="inactive@example.com", password_hash="x")
+    db.add_all([active_user, inactive_user])
+    db.flush()
+
+    items: Dict[str, models.Item] = {}
+    for key, (history, _) in PRICES.items():
+        initial = history[0] if history else 0
+        item = models.Item(
+            external_id=key,
+            title=key,
+            product_url=f"https://example.com/{key}",
+            initial_price=initial,
+            last_seen_price=history[-1] if history else None,
+            min_price=min(history) if history else None,
+        )
+        db.add(item)
+        db.flush()
+        for i, price in enumerate(history):
+            db.add(models.PriceHistory(item_id=item.id, price=price, checked_at=T0 + timedelta(hours=i)))
+        items[key] = item
+
+    wishlists: Dict[Tuple[str, int], models.Wishlist] = {}
+    for key, _, _, _, wishlist_active in ALERTS:
+        if (key, wishlist_active) not in wishlists:
+            user = active_user if wishlist_active else inactive_user
+            wishlist = models.Wishlist(user_id=user.id, item_id=items[key].id, is_active=wishlist_active)
+            db.add(wishlist)
+            db.flush()
+            wishlists[(key, wishlist_active)] = wishlist
+
+    for key, alert_type, target_price, enabled, wishlist_active in ALERTS:
+        db.add(models.Alert(
+            wishlist_id=wishlists[(key, wishlist_active)].id,
+            alert_type=alert_type,
+            target_price=target_price,
+            is_enabled=enabled,
+        ))
+
+    changes = []
+    for key, (_, new_price) in PRICES.items():
+        item = items[key]
+        ph = models.PriceHistory(item_id=item.id, price=new_price, checked_at=T0 + timedelta(days=1))
+        db.add(ph)
+        db.flush()
+        changes.append(PriceChange(item.id, ph, item.last_seen_price, item.min_price))
+    db.commit()
+    return changes
+
+
+def _evaluate_per_row(db: Session, changes: List[PriceChange]) -> int:
+    triggered = 0
+    for change in changes:
+        wishlist_ids = db.execute(
+            select(models.Wishlist.id).where(models.Wishlist.item_id == change.item_id)
+        ).scalars().all()
+        for wishlist_id in wishlist_ids:
+            triggered += evaluate_alerts_for_price_update(
+                db,
+                wishlist_id=wishlist_id,
+                new_ph=change.new_ph,
+                old_last_seen_price=change.old_last_seen_price,
+                old_min_price=change.old_min_price,
+            )
+    return triggered
+
+
+def _triggered(db: Session) -> Set[Tuple[int, int]]:
+    return set(db.execute(
+        select(models.Alert.id, models.Alert.last_triggered_ph_id)
+        .where(models.Alert.last_triggered_ph_id.is_not(None))
+    ).all())
+
+
+@pytest.fixture
+def both_sessions():
+    """같은 데이터를 넣은 DB 두 개 (건별용, 배치용)."""
+    sessions = []
+    for _ in range(2):
+        engine = make_engine()
+        db = make_session_factory(engine)()
+        sessions.append((engine, db, _seed(db)))
+    yield sessions
+    for engine, db, _ in sessions:
+        db.close()
+        engine.dispose()
+
+
+def test_batch_matches_per_row(both_sessions):
+    (_, row_db, row_changes), (_, batch_db, batch_changes) = both_sessions
+
+    row_count = _evaluate_per_row(row_db, row_changes)
+    row_db.commit()
+    batch_count = evaluate_alerts_for_price_changes(batch_db, batch_changes)
+    batch_db.commit()
+
+    assert row_count == batch_count
+    assert _triggered(row_db) == _triggered(batch_db)
+    # 시나리오가 실제로 트리거/비트리거를 모두 포함하는지
+    assert 0 < batch_count < len(ALERTS)
+
+
+def test_repeated_trigger_is_skipped(both_sessions):
+    (_, row_db, row_changes), (_, batch_db, batch_changes) = both_sessions
+
+    _evaluate_per_row(row_db, row_changes)
+    row_db.commit()
+    evaluate_alerts_for_price_changes(batch_db, batch_changes)
+    batch_db.commit()
+    before = _triggered(batch_db)
+
+    # 같은 price_history로 다시 판별하면 둘 다 아무것도 트리거하지 않는다
+    assert _evaluate_per_row(row_db, row_changes) == 0
+    assert evaluate_alerts_for_price_changes(batch_db, batch_changes) == 0
+    batch_db.commit()
+    assert _triggered(batch_db) == before == _triggered(row_db)
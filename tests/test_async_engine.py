@@ -0,0 +1,74 @@
+# tests/test_async_engine.py
+"""비동기 엔진: DB_POOL_PRE_PING 전략을 따르는지, 동시에 처음 불려도 엔진을 하나만 만드는지."""
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+import database
+from settings import settings
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def sqlite_async_url(monkeypatch):
+    monkeypatch.setattr(settings, "DB_ASYNC_URL", "sqlite+aiosqlite:///:memory:")
+
+
+@pytest.mark.parametrize("pre_ping, expected_pings", [("idle", 2), ("always", 0), ("never", 0)])
+def test_async_engine_uses_pre_ping_setting(sqlite_async_url, monkeypatch, pre_ping, expected_pings):
+    counted = []
+    original = database.PoolMetrics.incr
+    monkeypatch.setattr(database.PoolMetrics, "incr", lambda self, f, n=1: (counted.append(f), original(self, f, n)))
+    engine, session_factory = database._build_async_engine(pre_ping=pre_ping, ping_idle_seconds=0)
+
+    async def use_twice():
+        for _ in range(2):
+            async with session_factory() as db:
+                assert (await db.execute(text("SELECT 1"))).scalar() == 1
+        await engine.dispose()
+
+    asyncio.run(use_twice())
+    # always는 SQLAlchemy pool_pre_ping이 맡고, idle만 풀 이벤트에서 직접 ping한다
+    assert engine.sync_engine.pool._pre_ping is (pre_ping == "always")
+    assert counted.count("pings") == expected_pings
+
+
+def test_async_engine_rejects_unknown_pre_ping(sqlite_async_url):
+    with pytest.raises(ValueError):
+        database._build_async_engine(pre_ping="sometimes")
+
+
+def test_get_async_engine_builds_once_under_concurrency(sqlite_async_url, monkeypatch):
+    built = []
+    real_build = database._build_async_engine
+
+    def slow_build():
+        built.append(1)
+        time.sleep(0.05)
+        return real_build()
+
+    monkeypatch.setattr(database, "_build_async_engine", slow_build)
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_AsyncSessionLocal", None)
+
+    barrier = threading.Barrier(8)
+    engines = []
+
+    def first_request():
+        barrier.wait()
+        engines.append(database.get_async_engine())
+
+    threads = [threading.Thread(target=first_request) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert built == [1]
+    assert len({id(e) for e in engines}) == 1
+    asyncio.run(database.dispose_async_engine())
+    assert database._async_engine is None
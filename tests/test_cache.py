@@ -0,0 +1,159 @@
+# tests/test_cache.py
+"""MemoryCacheBackend TTL/LRU, SingleFlight 합치기, 검색 결과 캐시가 호출자마다 따로 결과를 주는지."""
+import asyncio
+import threading
+import time
+from typing import List
+
+import pytest
+
+from services.cache import MemoryCacheBackend, SingleFlight
+from services.naver_shopping_client import SearchResultCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = MemoryCacheBackend(clock=clock)
+    cache.set("a", b"1", ttl=10)
+
+    clock.now = 9.9
+    assert cache.get("a") == b"1"
+    clock.now = 10
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 1, 1, 0)
+
+
+def test_non_positive_ttl_and_oversized_values_are_not_stored():
+    cache = MemoryCacheBackend(max_bytes=4, clock=FakeClock())
+    cache.set("zero", b"1", ttl=0)
+    cache.set("big", b"12345", ttl=10)
+    assert cache.get("zero") is None
+    assert cache.get("big") is None
+
+
+def test_lru_eviction_by_entries_keeps_recently_read():
+    cache = MemoryCacheBackend(max_entries=2, clock=FakeClock())
+    cache.set("a", b"1", ttl=10)
+    cache.set("b", b"2", ttl=10)
+    assert cache.get("a") == b"1"  # a가 최근 사용
+
+    cache.set("c", b"3", ttl=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_eviction_by_bytes():
+    cache = MemoryCacheBackend(max_bytes=6, clock=FakeClock())
+    cache.set("a", b"aaa", ttl=10)
+    cache.set("b", b"bbb", ttl=10)
+    cache.set("a", b"aa", ttl=10)  # 덮어쓰면 크기도 바뀌고 가장 최근이 된다
+    cache.set("c", b"cc", ttl=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aa"
+    assert cache.stats()["bytes"] == 4
+
+
+def _run_concurrently(flight: SingleFlight, fn, callers: int) -> List[object]:
+    """callers개 스레드가 같은 key로 flight.do를 부르고, 모두 합류한 뒤 fn을 끝낸다."""
+    release = threading.Event()
+    results: List[object] = []
+    lock = threading.Lock()
+
+    def blocked():
+        assert release.wait(5)
+        return fn()
+
+    def call():
+        try:
+            value = flight.do("k", blocked)
+        except Exception as e:
+            value = e
+        with lock:
+            results.append(value)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while flight.stats()["coalesced"] < callers - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_singleflight_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+
+    results = _run_concurrently(flight, lambda: calls.append(1) or b"value", callers=5)
+
+    assert calls == [1]
+    assert results == [b"value"] * 5
+    assert flight.stats() == {"inflight": 0, "executed": 1, "coalesced": 4}
+
+
+def test_singleflight_propagates_exception_to_every_caller():
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("naver down")
+
+    results = _run_concurrently(flight, boom, callers=4)
+
+    assert len(results) == 4
+    assert all(isinstance(r, RuntimeError) and str(r) == "naver down" for r in results)
+    # 실패한 결과는 남지 않아 다음 호출은 다시 실행한다
+    assert flight.do("k", lambda: b"retry") == b"retry"
+
+
+def test_singleflight_async_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"value"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", load) for _ in range(3)))
+
+    assert asyncio.run(main()) == [b"value"] * 3
+    assert calls == [1]
+
+
+def test_search_cache_gives_each_caller_its_own_list():
+    search_cache = SearchResultCache(MemoryCacheBackend(), ttl=60)
+    loaded = [{"external_id": "1", "price": 1000}]
+    results = []
+
+    def fetch():
+        results.append(search_cache.fetch("key", lambda: (time.sleep(0.05), loaded)[1]))
+
+    threads = [threading.Thread(target=fetch) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(r == loaded for r in results)
+    # 한 호출자가 결과를 고쳐도 다른 호출자/캐시에 보이지 않는다
+    results[0][0]["price"] = 1
+    assert results[1][0]["price"] == 1000
+    assert search_cache.fetch("key", lambda: pytest.fail("cache miss")) == loaded
+    assert len({id(r) for r in results}) == 3
@@ -0,0 +1,176 @@
+# tests/test_job_lease.py
+"""
+여러 워커가 같은 SQLite 파일 DB를 보며 같은 스케줄로 job을 돌릴 때
+scheduler_lease가 한 곳에서만 실행시키는지, 리더가 죽으면 TTL 뒤에 다른 워커가 이어받는지 본다.
+시각은 가상 시계(JobCoordinator clock)로 움직인다.
+"""
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from services.job_lease import JobCoordinator, try_acquire
+from tests.factories import make_engine, make_session_factory
+
+TTL = 60.0
+TICK = 10.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = datetime(2026, 1, 1)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def db_url(tmp_path) -> Iterator[str]:
+    url = f"sqlite:///{tmp_path / 'lease.db'}"
+    make_engine(url).dispose()
+    yield url
+
+
+@pytest.fixture
+def engines(db_url: str) -> Iterator[List[Engine]]:
+    # 프로세스마다 엔진이 따로 있는 것처럼 워커마다 엔진을 만든다
+    made = [make_engine(db_url, reset=False) for _ in range(4)]
+    yield made
+    for e in made:
+        e.dispose()
+
+
+def _coordinators(engines: List[Engine], clock: FakeClock, **kwargs) -> List[JobCoordinator]:
+    return [
+        JobCoordinator(make_session_factory(e), owner=f"worker-{i}", ttl_seconds=TTL, clock=clock, **kwargs)
+        for i, e in enumerate(engines)
+    ]
+
+
+def test_ticks_run_once_and_survive_leader_kill(engines):
+    rng = random.Random(0)
+    clock = FakeClock()
+    coordinators = _coordinators(engines, clock)
+    workers = range(len(coordinators))
+
+    # 워커마다 heartbeat 시작 시점이 다르다
+    next_heartbeat = {i: rng.uniform(0, coordinators[i].heartbeat_seconds) for i in workers}
+    alive = set(workers)
+    runs: Dict[int, List[str]] = {}
+    kill_at = 300.0
+    killed = None
+
+    def job(tick_no: int, owner: str) -> None:
+        runs[tick_no].append(owner)
+
+    elapsed, tick = 0.0, 0
+    while elapsed < 900:
+        if killed is None and elapsed >= kill_at:
+            leader = next(i for i in alive if coordinators[i].is_leader())
+            alive.discard(leader)  # resign 없이 사라짐 (프로세스 강제 종료)
+            killed = coordinators[leader].owner
+
+        for i in sorted(alive):
+            if elapsed >= next_heartbeat[i]:
+                coordinators[i].heartbeat()
+                next_heartbeat[i] = elapsed + coordinators[i].heartbeat_seconds
+
+        if elapsed >= tick * TICK:
+            runs[tick] = []
+            order = list(alive)
+            rng.shuffle(order)  # 워커마다 tick이 조금씩 다른 순서로 불린다
+            for i in order:
+                coordinators[i].job("sim", job)(tick, coordinators[i].owner)
+            tick += 1
+
+        clock.advance(1)
+        elapsed += 1
+
+    assert killed is not None
+    assert all(len(owners) <= 1 for owners in runs.values()), "a tick ran on more than one worker"
+
+    # 리더가 죽은 뒤 TTL(+heartbeat 한 주기)이 지나면 다른 워커가 매 tick을 실행한다
+    takeover_tick = int((kill_at + TTL + TTL / 3) // TICK) + 1
+    after = [owners for t, owners in runs.items() if t >= takeover_tick]
+    assert after and all(len(owners) == 1 for owners in after)
+    assert killed not in {owners[0] for owners in after}
+    # 죽기 전에는 매 tick이 한 번씩 실행됐다 (첫 heartbeat 전 tick 0은 제외)
+    assert all(len(runs[t]) == 1 for t in range(1, int(kill_at // TICK)))
+
+
+def test_leader_lease_taken_over_only_after_ttl(engines):
+    clock = FakeClock()
+    old, new = _coordinators(engines[:2], clock)
+
+    assert old.heartbeat()
+    assert not new.heartbeat()
+
+    # old가 heartbeat 없이 멈춤: TTL 전에는 여전히 old 것
+    clock.advance(TTL - 1)
+    assert not new.heartbeat()
+    assert not old.is_leader()  # old는 TTL보다 먼저 스스로 내려온다
+
+    clock.advance(1)
+    assert new.heartbeat()
+    assert new.is_leader()
+    assert not old.heartbeat()
+
+
+def test_new_leader_skips_job_still_running_on_old_leader(engines):
+    clock = FakeClock()
+    old, new = _coordinators(engines[:2], clock, job_ttl_seconds=TTL * 10)
+    ran: List[str] = []
+
+    def long_job() -> None:
+        # 이전 리더가 job을 도는 동안 heartbeat가 멈춰서 리더 임대가 만료되고 새 리더가 생긴다
+        ran.append("old")
+        clock.advance(TTL * 2)
+        assert new.heartbeat()
+        new.run_exclusive("long", lambda: ran.append("new"))
+
+    assert old.heartbeat()
+    old.run_exclusive("long", long_job)
+    # 이전 리더가 끝나고 job 임대를 풀었으면 다음 tick에는 새 리더가 실행한다
+    new.run_exclusive("long", lambda: ran.append("new-after"))
+
+    assert ran == ["old", "new-after"]
+    assert new.stats()["skipped_busy"] == 1
+
+
+def test_concurrent_acquire_has_one_winner(db_url):
+    engine = make_engine(db_url, reset=False)
+    SessionLocal = make_session_factory(engine)
+    threads = 6
+    results: Counter = Counter()
+
+    for r in range(5):
+        barrier = threading.Barrier(threads)
+        winners: List[int] = []
+        lock = threading.Lock()
+
+        def contend(n: int) -> None:
+            db = SessionLocal()
+            try:
+                barrier.wait()
+                if try_acquire(db, f"race-{r}", f"thread-{n}", TTL):
+                    with lock:
+                        winners.append(n)
+            finally:
+                db.close()
+
+        ts = [threading.Thread(target=contend, args=(n,)) for n in range(threads)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+        results[len(winners)] += 1
+
+    engine.dispose()
+    assert results == Counter({1: 5})
@@ -0,0 +1,40 @@
+# tests/test_naver_client.py
+"""AsyncNaverShoppingClient.search_pages: 페이지 순서, 빈 페이지, 페이지별 실패 수집."""
+import asyncio
+
+from services.naver_shopping_client import AsyncNaverShoppingClient
+
+
+def _client(fail_starts=(), empty_from=None) -> AsyncNaverShoppingClient:
+    client = AsyncNaverShoppingClient()
+
+    async def fake_search(query, *, start, display, delay=0.0, **kwargs):
+        # 뒤 페이지가 먼저 끝나도 결과는 페이지 순서대로여야 한다
+        await asyncio.sleep(0.001 * (10 - start // 10))
+        if start in fail_starts:
+            raise RuntimeError(f"page {start} failed")
+        if empty_from is not None and start >= empty_from:
+            return []
+        return [{"start": start}] * display
+
+    client.search_products = fake_search
+    return client
+
+
+def test_pages_in_order():
+    result = asyncio.run(_client().search_pages("키보드", total=50, page_size=10))
+    assert [page[0]["start"] for page in result.pages] == [1, 11, 21, 31, 41]
+    assert result.errors == []
+
+
+def test_pages_stop_at_first_empty_page():
+    result = asyncio.run(_client(empty_from=21).search_pages("키보드", total=50, page_size=10))
+    assert [page[0]["start"] for page in result.pages] == [1, 11]
+
+
+def test_failed_pages_are_collected_without_losing_earlier_pages():
+    result = asyncio.run(_client(fail_starts=(21, 41)).search_pages("키보드", total=50, page_size=10))
+
+    assert [page[0]["start"] for page in result.pages] == [1, 11]
+    assert [e.start for e in result.errors] == [21, 41]
+    assert all(isinstance(e.error, RuntimeError) for e in result.errors)
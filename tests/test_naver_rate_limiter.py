@@ -0,0 +1,100 @@
+# tests/test_naver_rate_limiter.py
+"""
+NaverRateLimiter 토큰 버킷 / 우선순위 / 일일 한도.
+시계와 날짜는 주입해서 실제로 기다리지 않는다 (_try_reserve는 기다릴 초를 돌려준다).
+"""
+from datetime import date
+
+import pytest
+
+from services.naver_rate_limiter import NaverRateLimiter, Priority, QuotaExhaustedError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.day = date(2026, 1, 1)
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(clock: FakeClock, **kwargs) -> NaverRateLimiter:
+    kwargs.setdefault("per_second", 2)
+    kwargs.setdefault("per_day", 1000)
+    kwargs.setdefault("burst", 4)
+    return NaverRateLimiter(clock=clock, today=lambda: clock.day, **kwargs)
+
+
+def test_burst_then_refill_at_per_second():
+    clock = FakeClock()
+    limiter = _limiter(clock)
+
+    assert [limiter._try_reserve(Priority.INTERACTIVE) for _ in range(4)] == [0.0] * 4
+    # 버킷이 비면 토큰 1개가 찰 때까지 (1 / per_second초)
+    assert limiter._try_reserve(Priority.INTERACTIVE) == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert limiter._try_reserve(Priority.INTERACTIVE) == 0.0
+
+    # 오래 쉬어도 burst까지만 찬다
+    clock.now += 100
+    assert [limiter._try_reserve(Priority.INTERACTIVE) for _ in range(4)] == [0.0] * 4
+    assert limiter._try_reserve(Priority.INTERACTIVE) > 0
+
+
+def test_background_leaves_floor_for_interactive():
+    clock = FakeClock()
+    limiter = _limiter(clock, per_second=10, burst=10, background_floor=0.2)
+
+    # BACKGROUND는 floor(10 * 0.2 = 2개)를 남기고 멈춘다
+    taken = 0
+    while limiter._try_reserve(Priority.BACKGROUND) == 0.0:
+        taken += 1
+    assert taken == 8
+
+    # 남은 토큰은 INTERACTIVE가 바로 쓴다
+    assert limiter._try_reserve(Priority.INTERACTIVE) == 0.0
+    assert limiter._try_reserve(Priority.INTERACTIVE) == 0.0
+    assert limiter._try_reserve(Priority.INTERACTIVE) > 0
+
+    stats = limiter.stats()
+    assert stats["acquired"] == {"INTERACTIVE": 2, "BACKGROUND": 8}
+    assert stats["throttled"]["BACKGROUND"] == 1
+
+
+def test_background_yields_while_interactive_waits():
+    clock = FakeClock()
+    limiter = _limiter(clock, per_second=10, burst=10)
+    for _ in range(5):
+        assert limiter._try_reserve(Priority.INTERACTIVE) == 0.0
+
+    # floor(2개)보다 토큰이 많아도, 기다리는 INTERACTIVE가 있으면 버킷이 가득 찰 때까지 양보
+    limiter._set_waiting(Priority.INTERACTIVE, 1)
+    assert limiter._try_reserve(Priority.BACKGROUND) == pytest.approx(0.5)
+    assert limiter._try_reserve(Priority.INTERACTIVE) == 0.0
+
+    limiter._set_waiting(Priority.INTERACTIVE, -1)
+    assert limiter._try_reserve(Priority.BACKGROUND) == 0.0
+
+
+def test_daily_quota_reserves_share_for_interactive_and_resets():
+    clock = FakeClock()
+    limiter = _limiter(clock, per_second=100, burst=100, per_day=10, interactive_daily_reserve=0.2)
+
+    for _ in range(8):
+        clock.now += 1
+        assert limiter._try_reserve(Priority.BACKGROUND) == 0.0
+    with pytest.raises(QuotaExhaustedError):
+        limiter._try_reserve(Priority.BACKGROUND)
+
+    assert limiter.remaining_today(Priority.INTERACTIVE) == 2
+    assert limiter._try_reserve(Priority.INTERACTIVE) == 0.0
+    assert limiter._try_reserve(Priority.INTERACTIVE) == 0.0
+    with pytest.raises(QuotaExhaustedError):
+        limiter._try_reserve(Priority.INTERACTIVE)
+
+    # 한국 시간 자정(주입한 today)이 지나면 다시 쓸 수 있다
+    clock.day = date(2026, 1, 2)
+    assert limiter._try_reserve(Priority.BACKGROUND) == 0.0
+    assert limiter.remaining_today(Priority.BACKGROUND) == 7
@@ -0,0 +1,144 @@
+# tests/test_price_history.py
+"""GET /items/{id}/price-history: keyset 커서 인코딩/경계, 스트리밍 도중 실패."""
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+import database
+import models
+import routers.items as items_router
+from services.price_history_reader import decode_cursor, encode_cursor
+
+T0 = datetime(2026, 1, 1, 12, 0)
+RANGE = {"from": "2026-01-01T00:00:00", "to": "2026-01-02T00:00:00", "resolution": "raw"}
+
+
+@pytest.fixture
+def item_id(session_factory: sessionmaker) -> int:
+    """10분 간격 점 5개 + 같은 시각(T0 + 20분)에 점 3개 = 8개."""
+    db = session_factory()
+    try:
+        item = models.Item(external_id="ph-1", title="키보드", product_url="https://example.com/1", initial_price=1000)
+        db.add(item)
+        db.flush()
+        times = [T0 + timedelta(minutes=10 * i) for i in range(5)] + [T0 + timedelta(minutes=20)] * 3
+        db.add_all(
+            models.PriceHistory(item_id=item.id, price=1000 + i, checked_at=ts) for i, ts in enumerate(times)
+        )
+        db.commit()
+        return item.id
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def api(session_factory: sessionmaker, monkeypatch) -> Iterator[TestClient]:
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(items_router.router)
+    app.dependency_overrides[database.get_db] = get_db
+    monkeypatch.setattr(items_router, "SessionLocal", session_factory)
+    with TestClient(app, raise_server_exceptions=False) as c:
+        yield c
+
+
+def _all_pages(api: TestClient, item_id: int, limit: int) -> List[dict]:
+    pages, params = [], {**RANGE, "limit": limit}
+    while True:
+        resp = api.get(f"/items/{item_id}/price-history", params=params)
+        assert resp.status_code == 200
+        pages.append(resp.json())
+        if pages[-1]["next_cursor"] is None:
+            return pages
+        params = {**RANGE, "limit": limit, "cursor": pages[-1]["next_cursor"]}
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("raw", T0, 42)
+    assert decode_cursor(cursor) == ("raw", T0, 42)
+    assert decode_cursor(encode_cursor("daily", T0)) == ("daily", T0, 0)
+
+
+@pytest.mark.parametrize("cursor", ["", "raw", "raw~x~1", "raw~2026-01-01T00:00:00~x", "weekly~2026-01-01T00:00:00~1",
+                                    "raw~2026-01-01T00:00:00~1~2"])
+def test_malformed_cursor(api, item_id, cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+    resp = api.get(f"/items/{item_id}/price-history", params={**RANGE, "cursor": cursor})
+    # 빈 문자열은 커서 없음으로 본다
+    assert resp.status_code == (200 if cursor == "" else 400)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 8, 9])
+def test_pages_cover_every_point_once_across_ties(api, item_id, limit):
+    pages = _all_pages(api, item_id, limit)
+    points = [p for page in pages for p in page["points"]]
+
+    assert len(points) == 8
+    assert len({p["price"] for p in points}) == 8
+    assert [p["t"] for p in points] == sorted(p["t"] for p in points)
+    assert all(page["count"] == len(page["points"]) <= limit for page in pages)
+    # 마지막 페이지가 limit과 딱 맞으면 빈 다음 페이지 없이 끝난다
+    assert len(pages) == -(-8 // limit)
+
+
+def test_empty_range(api, item_id):
+    resp = api.get(
+        f"/items/{item_id}/price-history",
+        params={"from": "2025-01-01T00:00:00", "to": "2025-01-02T00:00:00", "resolution": "raw"},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "item_id": item_id,
+        "resolution": "raw",
+        "from": "2025-01-01T00:00:00",
+        "to": "2025-01-02T00:00:00",
+        "points": [],
+        "count": 0,
+        "next_cursor": None,
+    }
+
+
+def test_unknown_item_and_bad_range(api, item_id):
+    assert api.get("/items/999999/price-history").status_code == 404
+    resp = api.get(f"/items/{item_id}/price-history", params={"from": RANGE["to"], "to": RANGE["from"]})
+    assert resp.status_code == 400
+
+
+def test_error_before_first_point_is_not_a_200(api, item_id, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("db down")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(items_router, "iter_price_points", broken)
+    resp = api.get(f"/items/{item_id}/price-history", params=RANGE)
+    assert resp.status_code == 500
+
+
+def test_error_mid_stream_closes_json_with_error(api, item_id, monkeypatch):
+    real = items_router.iter_price_points
+
+    def fails_after_two(*args, **kwargs):
+        for n, point in enumerate(real(*args, **kwargs)):
+            if n == 2:
+                raise RuntimeError("connection lost")
+            yield point
+
+    monkeypatch.setattr(items_router, "iter_price_points", fails_after_two)
+    resp = api.get(f"/items/{item_id}/price-history", params=RANGE)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["count"] == 2 and len(body["points"]) == 2
+    assert body["next_cursor"] is None
+    assert body["error"]
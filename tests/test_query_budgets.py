@@ -0,0 +1,61 @@
+# tests/test_query_budgets.py
+"""
+주요 경로의 SQL 수 예산 (N+1 회귀 확인). benchmarks/profile_queries.BUDGETS와 같은 값.
+요청 경로는 유저 캐시 / wishlist 개수 캐시가 찬 뒤의 정상 상태를 잰다.
+"""
+import pytest
+
+from tests.factories import as_products, synthetic_items
+
+from crud import upsert_item_from_naver
+from services.shopping_service import ingest_search_results
+from services.sql_profiler import QueryBudgetExceeded
+
+
+def _warm(client):
+    client.get("/auth/me").raise_for_status()
+    client.get("/wishlist?display=20").raise_for_status()
+
+
+def test_auth_me_queries(client, sql_query_budget):
+    _warm(client)
+    with sql_query_budget(1, label="GET /auth/me"):
+        resp = client.get("/auth/me")
+    assert resp.status_code == 200
+
+
+def test_wishlist_queries(client, sql_query_budget):
+    _warm(client)
+    with sql_query_budget(3, label="GET /wishlist"):
+        resp = client.get("/wishlist?display=20")
+    assert resp.status_code == 200
+
+
+def test_alerts_queries(client, seeded, sql_query_budget):
+    _warm(client)
+    with sql_query_budget(1, label="GET /alerts"):
+        resp = client.get(f"/alerts?wishlist_id={seeded['wishlist_id']}")
+    assert resp.status_code == 200
+
+
+def test_ingest_page_queries(session_factory, sql_query_budget):
+    db = session_factory()
+    try:
+        with sql_query_budget(6, label="ingest page (bulk)"):
+            ingest_search_results(db, as_products(synthetic_items(50, first_id=200_000, seed=2)))
+            db.commit()
+    finally:
+        db.close()
+
+
+def test_budget_catches_per_item_ingest(session_factory, sql_query_budget):
+    # 상품마다 upsert하는 이전 방식은 페이지 크기만큼 쿼리가 늘어 예산에 걸린다
+    db = session_factory()
+    try:
+        with pytest.raises(QueryBudgetExceeded):
+            with sql_query_budget(6, label="ingest page (per_item)"):
+                for data in synthetic_items(50, first_id=100_000, seed=1):
+                    upsert_item_from_naver(db, data)
+                db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,98 @@
+# tests/test_wishlist_add.py
+"""POST /wishlist: 토큰만 확인하는 라우트라 삭제된 유저의 토큰도 들어온다 (FK 위반은 500이 아니라 409)."""
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+import crud_async
+import models
+from services.user_cache import _user_key, cached_user, store_user, user_cache
+from tests.factories import make_engine
+
+
+@pytest.fixture
+def new_item_id(session_factory) -> int:
+    db = session_factory()
+    try:
+        item = models.Item(external_id="new-1", title="새 키보드", product_url="https://example.com/new", initial_price=1)
+        db.add(item)
+        db.commit()
+        return item.id
+    finally:
+        db.close()
+
+
+def _delete_user(session_factory, user_id: int) -> None:
+    db = session_factory()
+    try:
+        db.execute(delete(models.User).where(models.User.id == user_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_add_existing_returns_row(client, seeded, new_item_id):
+    first = client.post("/wishlist", json={"item_id": new_item_id})
+    again = client.post("/wishlist", json={"item_id": new_item_id})
+    assert first.status_code == again.status_code == 200
+    assert first.json()["id"] == again.json()["id"]
+
+
+def test_add_for_deleted_user_is_409(client, session_factory, seeded, new_item_id):
+    _delete_user(session_factory, seeded["user_id"])
+
+    resp = client.post("/wishlist", json={"item_id": new_item_id})
+    assert resp.status_code == 409
+    assert client.post("/wishlist", json={"item_id": 999_999}).status_code == 404
+
+
+def test_async_add_for_deleted_user_is_409(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    url = tmp_path / "async.db"
+    sync_engine = make_engine(f"sqlite:///{url}")
+    with sync_engine.begin() as conn:
+        conn.execute(models.User.__table__.insert().values(id=1, email="gone@example.com", password_hash="x"))
+        conn.execute(models.Item.__table__.insert().values(
+            id=1, external_id="1", title="키보드", product_url="https://example.com/1", initial_price=1,
+        ))
+        conn.execute(delete(models.User))
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{url}")
+    event.listen(engine.sync_engine, "connect", lambda dbapi_conn, _: dbapi_conn.execute("PRAGMA foreign_keys=ON"))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def add():
+        async with session_factory() as db:
+            with pytest.raises(HTTPException) as e:
+                await crud_async.add_to_wishlist(db, user_id=1, item_id=1)
+            return e.value.status_code
+
+    try:
+        assert asyncio.run(add()) == 409
+    finally:
+        asyncio.run(engine.dispose())
+
+
+def test_user_cache_does_not_keep_password_hash(session_factory, seeded):
+    db = session_factory()
+    try:
+        user = db.get(models.User, seeded["user_id"])
+        user_cache.clear()
+        store_user(user)
+        assert "password_hash" not in json.loads(user_cache.get(_user_key(user.id)))
+
+        cached = cached_user(user.id)
+        assert (cached.id, cached.email, cached.created_at) == (user.id, user.email, user.created_at)
+        db.expunge_all()
+        merged = db.merge(cached, load=False)
+        assert merged.email == user.email
+    finally:
+        user_cache.clear()
+        db.close()
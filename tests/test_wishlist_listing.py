@@ -0,0 +1,94 @@
+# tests/test_wishlist_listing.py
+"""GET /wishlist keyset 커서: 정렬별 페이지 경계, created_at 동률, 빈 목록, 잘못된 커서."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+import models
+from services.wishlist_listing import decode_cursor, encode_cursor, list_wishlist_page
+from tests.conftest import WISHLIST_ROWS
+
+EXPECTED_ORDER = {
+    "date": lambda rows: sorted(rows, key=lambda w: (w.created_at, w.id), reverse=True),
+    "asc": lambda rows: sorted(rows, key=lambda w: w.item_id),
+    "dsc": lambda rows: sorted(rows, key=lambda w: w.item_id, reverse=True),
+    "sim": lambda rows: sorted(rows, key=lambda w: w.id),
+}
+
+
+@pytest.fixture
+def tied_rows(session_factory, seeded):
+    """created_at을 두 값으로 몰아서 date 정렬에 동률을 만든다. return: 기대 순서 계산용 행 목록"""
+    db = session_factory()
+    try:
+        ids = db.execute(select(models.Wishlist.id).order_by(models.Wishlist.id)).scalars().all()
+        db.execute(update(models.Wishlist).values(created_at=datetime(2026, 1, 1)))
+        db.execute(
+            update(models.Wishlist)
+            .where(models.Wishlist.id.in_(ids[::3]))
+            .values(created_at=datetime(2026, 1, 2))
+        )
+        db.commit()
+        rows = db.execute(select(models.Wishlist)).scalars().all()
+        db.expunge_all()
+        return rows
+    finally:
+        db.close()
+
+
+def _page_through(client, sort, display):
+    pages, params = [], {"sort": sort, "display": display}
+    while True:
+        resp = client.get("/wishlist", params=params)
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        pages.append([w["id"] for w in body["wishlist_items"]])
+        if body["next_cursor"] is None:
+            return pages
+        params = {"sort": sort, "display": display, "cursor": body["next_cursor"]}
+
+
+@pytest.mark.parametrize("sort", ["date", "asc", "dsc", "sim"])
+@pytest.mark.parametrize("display", [1, 7, 25, WISHLIST_ROWS - 1, WISHLIST_ROWS, 100])
+def test_cursor_pages_follow_sort_order(client, tied_rows, sort, display):
+    pages = _page_through(client, sort, display)
+
+    ids = [i for page in pages for i in page]
+    assert ids == [w.id for w in EXPECTED_ORDER[sort](tied_rows)]
+    assert all(len(page) <= display for page in pages)
+    # 마지막 페이지가 display와 딱 맞아도 빈 페이지를 하나 더 주지 않는다
+    assert len(pages) == -(-WISHLIST_ROWS // display)
+
+
+def test_empty_wishlist(session_factory, seeded):
+    db = session_factory()
+    try:
+        for sort in EXPECTED_ORDER:
+            assert list_wishlist_page(db, user_id=seeded["user_id"] + 1, sort=sort, display=10) == ([], None)
+    finally:
+        db.close()
+
+
+def test_cursor_round_trip(tied_rows):
+    w = tied_rows[0]
+    assert decode_cursor("date", encode_cursor("date", w)) == (w.created_at.isoformat(), w.id)
+    assert decode_cursor("asc", encode_cursor("asc", w)) == (str(w.item_id), w.id)
+    assert decode_cursor("sim", encode_cursor("sim", w)) == (str(w.id), w.id)
+
+
+@pytest.mark.parametrize(
+    "sort, cursor",
+    [
+        ("date", "garbage"),
+        ("date", "date~2026-01-01T00:00:00"),
+        ("date", "date~not-a-date~1"),
+        ("date", "date~2026-01-01T00:00:00~x"),
+        ("asc", "asc~x~1"),
+        ("sim", "sim~1~2~3"),
+        ("asc", "date~2026-01-01T00:00:00~1"),  # 다른 정렬로 발급된 커서
+    ],
+)
+def test_malformed_cursor_is_400(client, sort, cursor):
+    resp = client.get("/wishlist", params={"sort": sort, "cursor": cursor})
+    assert resp.status_code == 400